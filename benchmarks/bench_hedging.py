@@ -0,0 +1,83 @@
+"""
+Benchmark hedged chunk calls against plain ones on a heavy-tailed latency model.
+
+    python -m benchmarks.bench_hedging --calls 400 --slow-share 0.02
+
+Each simulated call sleeps for a base latency, and a small share of calls
+stalls for much longer (a slow replica, a queued request). The same seeded
+latency stream is run plainly and through hedged_call; the report gives the
+hedge rate, the extra requests sent and the p50/p95/p99 of both runs.
+Latencies are in milliseconds of real sleep, scaled down from seconds.
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from reading_companion.core.nlp.hedging import LatencyTracker, hedged_call, percentile
+
+
+class LatencyModel:
+    """Thread-safe seeded stream of latencies: mostly base +- jitter, sometimes a stall."""
+
+    def __init__(self, seed: int, base: float, jitter: float, slow_share: float, slow: float):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.base, self.jitter, self.slow_share, self.slow = base, jitter, slow_share, slow
+        self.sent = 0
+
+    def call(self) -> str:
+        with self._lock:
+            self.sent += 1
+            delay = self.base + self._rng.uniform(-self.jitter, self.jitter)
+            if self._rng.random() < self.slow_share:
+                delay += self.slow
+        time.sleep(delay)
+        return "ok"
+
+
+def run(args, hedged: bool):
+    model = LatencyModel(args.seed, args.base, args.jitter, args.slow_share, args.slow)
+    tracker = LatencyTracker(min_samples=10, default_hedge_after=args.slow, min_hedge_after=0.0,
+                             min_deadline=args.slow * 3, max_deadline=args.slow * 10)
+    pool = ThreadPoolExecutor(max_workers=2 * args.concurrency)
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        if hedged:
+            hedged_call(model.call, tracker, pool=pool)
+        else:
+            model.call()
+        latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as callers:
+        list(callers.map(one, range(args.calls)))
+    pool.shutdown(wait=True)
+    return latencies, model.sent, tracker.stats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base", type=float, default=0.02, help="typical call, seconds")
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--slow-share", type=float, default=0.02, help="share of calls that stall")
+    parser.add_argument("--slow", type=float, default=0.3, help="extra seconds for a stalled call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for label, hedged in (("plain", False), ("hedged", True)):
+        latencies, sent, stats = run(args, hedged)
+        p50, p95, p99 = (percentile(latencies, q) * 1000 for q in (50, 95, 99))
+        extra = sent - args.calls
+        line = f"{label:>7}: p50 {p50:7.1f} ms | p95 {p95:7.1f} ms | p99 {p99:7.1f} ms | requests {sent}"
+        if hedged:
+            line += f" (+{extra / args.calls:.1%}) | hedge rate {stats['hedge_rate']:.1%}, hedge wins {stats['hedge_wins']}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark HTML-to-text after readability: BeautifulSoup re-parse vs lxml tree.
+
+    python -m benchmarks.bench_readability_text --pages 20
+    python -m benchmarks.bench_readability_text --corpus path/to/saved/pages
+
+The old path serialized readability's article, re-parsed it with BeautifulSoup's
+html.parser and called get_text; the new one reads the text straight from the
+article tree readability already built. Runs over a directory of saved .html
+pages, or over synthetic large article pages (navigation, sidebars, inline
+scripts and SVG, comments, tables) when no corpus is given. Every page's text
+is compared between the two paths.
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import List
+
+from bs4 import BeautifulSoup
+from readability import Document
+
+from reading_companion.core.scraping.text_from_url import NON_TEXT_TAGS, _clean_text, _tree_text
+
+_WORDS = (
+    "vitamin receptor endometrium tissue lesion inflammation cytokine trial cohort serum "
+    "deficiency supplementation hormone ovary pelvic pain fertility study women evidence dose"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 22))]
+    return " ".join(words).capitalize() + "."
+
+
+def synthetic_page(rng: random.Random, sections: int = 40) -> str:
+    nav = "".join(f'<li><a href="/s/{i}">Section {i}</a></li>' for i in range(60))
+    side = "".join(f'<div class="widget"><a href="/r/{i}">Related {i}</a> <span>ad</span></div>' for i in range(30))
+    body = []
+    for s in range(sections):
+        paras = "".join(
+            f"<p>{' '.join(_sentence(rng) for _ in range(rng.randint(3, 7)))} "
+            f"<em>{_sentence(rng)}</em> <a href='#ref{s}'>[{s}]</a> &amp; &lt;notes&gt;</p>"
+            for _ in range(rng.randint(3, 6))
+        )
+        extras = (
+            f"<!-- section {s} -->"
+            f"<script>window.track && track('s{s}');</script>"
+            f"<svg viewBox='0 0 10 10'><title>icon {s}</title><path d='M0 0h10v10z'/></svg>"
+            f"<table><tr><th>Group</th><th>n</th></tr><tr><td>Cases</td><td>{rng.randint(10, 999)}</td></tr></table>"
+            f"<noscript>Enable JavaScript</noscript>"
+        )
+        body.append(f"<section><h2>Section {s}</h2>{paras}{extras}</section>")
+    return (
+        "<!doctype html><html><head><title>Article</title><style>p{margin:0}</style>"
+        "<script>var x = 1;</script></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<div id='main'><article><h1>{_sentence(rng)}</h1>{''.join(body)}</article>"
+        f"<aside class='sidebar'>{side}</aside></div>"
+        "<footer><p>Copyright, cookies, terms</p></footer></body></html>"
+    )
+
+
+def text_bs4(html: str) -> str:
+    # the previous implementation
+    main_html = Document(html).summary(html_partial=True)
+    soup = BeautifulSoup(main_html, "html.parser")
+    for tag in soup(list(NON_TEXT_TAGS)):
+        tag.decompose()
+    return _clean_text(soup.get_text(separator="\n"))
+
+
+def text_lxml(html: str) -> str:
+    doc = Document(html)
+    doc.summary(html_partial=True)
+    return _clean_text(_tree_text(doc.html))
+
+
+def load_corpus(corpus: str, pages: int, seed: int) -> List[str]:
+    if corpus:
+        return [p.read_text(encoding="utf-8", errors="replace") for p in sorted(Path(corpus).glob("*.htm*"))]
+    rng = random.Random(seed)
+    return [synthetic_page(rng) for _ in range(pages)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default="", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=20, help="synthetic pages when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.pages, args.seed)
+    size = sum(len(p) for p in pages)
+    print(f"{len(pages)} pages, {size / 1e6:.1f} MB of HTML")
+
+    mismatches = sum(text_bs4(p) != text_lxml(p) for p in pages)
+    for label, fn in (("bs4 re-parse", text_bs4), ("lxml tree", text_lxml)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for page in pages:
+                fn(page)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:>13}: {best * 1000:8.1f} ms total | {best * 1000 / len(pages):6.1f} ms/page")
+    print(f"text mismatches: {mismatches}/{len(pages)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark the Selenium fallback: full page load vs the text-only profile.
+
+    python -m benchmarks.bench_selenium_text_only --pages 5 --delay 0.3
+
+Serves heavy fixture articles from a localhost HTTP server: every page pulls
+in large images, web fonts, a video and scripts from ad/analytics hosts, and
+each of those responses is delayed by --delay seconds. The ad hosts are mapped
+to the same server with Chrome's --host-resolver-rules, so nothing leaves the
+machine. Needs a local Chrome/chromedriver.
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+import reading_companion.core.scraping.text_from_url as tfu
+
+AD_HOSTS = ["securepubads.doubleclick.net", "www.google-analytics.com", "www.googletagmanager.com"]
+
+_PARAGRAPH = (
+    "Endometriosis is a medical condition wherein tissue resembling the lining of the uterus "
+    "is located outside the uterus. Environmental exposures and diet are among the risk factors. "
+)
+
+
+def article_html(page: int, images: int) -> str:
+    imgs = "\n".join(f'<img src="/img/{page}-{i}.png" width="600">' for i in range(images))
+    trackers = "\n".join(f'<script src="http://{host}/tag.js?p={page}"></script>' for host in AD_HOSTS)
+    paragraphs = "\n".join(f"<p>{_PARAGRAPH * 4}</p>" for _ in range(20))
+    return f"""<!doctype html>
+<html><head><title>Fixture {page}</title>
+<style>@font-face {{ font-family: Heavy; src: url(/font/heavy-{page}.woff2); }}
+body {{ font-family: Heavy, serif; }}</style>
+</head><body>
+<article><h1>Fixture article {page}</h1>
+{paragraphs}
+{imgs}
+<video src="/media/clip-{page}.mp4" autoplay muted></video>
+</article>
+{trackers}
+</body></html>"""
+
+
+def make_handler(images: int, delay: float, asset_bytes: int):
+    blob = b"\0" * asset_bytes
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/article/"):
+                page = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+                return self._send(article_html(page, images).encode("utf-8"), "text/html; charset=utf-8")
+            time.sleep(delay)
+            if self.path.startswith("/tag.js"):
+                return self._send(b"window.__tracked = (window.__tracked || 0) + 1;", "application/javascript")
+            self._send(blob, "application/octet-stream")
+
+        def _send(self, body: bytes, content_type: str):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def new_driver(port: int, text_only: bool):
+    options = tfu._chrome_options(headless=True, text_only=text_only)
+    rules = ", ".join(f"MAP {host} 127.0.0.1:{port}" for host in AD_HOSTS)
+    options.add_argument(f"--host-resolver-rules={rules}")
+    driver = webdriver.Chrome(service=Service(), options=options)
+    return tfu._configure_driver(driver, text_only)
+
+
+def run(port: int, text_only: bool, pages: int, wait: float) -> tuple:
+    driver = new_driver(port, text_only)
+    try:
+        driver.get(f"http://127.0.0.1:{port}/article/0.html")  # warm-up
+        times, chars = [], 0
+        for page in range(1, pages + 1):
+            start = time.perf_counter()
+            html = tfu._render_html(driver, f"http://127.0.0.1:{port}/article/{page}.html", wait=wait)
+            times.append(time.perf_counter() - start)
+            chars += len(html)
+        return times, chars
+    finally:
+        driver.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--images", type=int, default=30, help="images per fixture page")
+    parser.add_argument("--delay", type=float, default=0.3, help="seconds every subresource is held back")
+    parser.add_argument("--asset-kb", type=int, default=256)
+    parser.add_argument("--wait", type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.images, args.delay, args.asset_kb * 1024))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    print(f"{args.pages} pages, {args.images} images + font + video + {len(AD_HOSTS)} trackers each, "
+          f"{args.delay:.2f}s per subresource")
+    try:
+        for label, text_only in (("full load", False), ("text-only", True)):
+            times, chars = run(port, text_only, args.pages, args.wait)
+            mean = sum(times) / len(times)
+            print(f"{label:>10}: mean {mean * 1000:8.1f} ms | max {max(times) * 1000:8.1f} ms | {chars} html chars")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,28 @@ import os
 import streamlit as st
 from pathlib import Path
 
-from reading_companion.core.nlp.simplify import simplify_text
+from reading_companion.core.nlp.simplify import simplify_text_stream
 from reading_companion.core.scraping.text_from_url import extract_main_text
-from reading_companion.core.nlp.explain_terms import explain_terms
-from reading_companion.core.nlp.question_gen import question_gen, question_answers
+from reading_companion.core.nlp.explain_terms import explain_terms_stream
+from reading_companion.core.nlp.question_gen import question_gen_stream, question_answers
+from reading_companion.core.nlp.study_pack import STUDY_PACK_MAX_INPUT_TOKENS, study_pack
 from reading_companion.core.data.example_text import example_text
-import fitz  
 from st_social_media_links import SocialMediaIcons
-from reading_companion.core.nlp.llm_chunking import token_count, simplify_long_text_with_summary
+from reading_companion.core.nlp.llm_chunking import (
+    exceeds_budget, iter_simplified_parts, reduce_summary, explain_terms_over_parts, question_gen_over_parts,
+    CHUNK_WORKERS,
+)
 from reading_companion.core.utils.pdf_gen import data_for_pdf
-from reading_companion.app.controllers import decide_source_text, simplify_flow
+from reading_companion.core.utils.pdf_text import cached_pdf_text
+from reading_companion.core.utils.memo import get_result_memo, text_hash
+from reading_companion.core.utils.jobs import DONE, FAILED, get_job_runner
+from reading_companion.app.controllers import URL_FETCH_WORKERS, decide_source_documents, simplify_job, stream_simplify_flow
 
 st.set_page_config(layout="centered")
 
+SIMPLIFY_TOKEN_BUDGET = 3000  # longer texts are chunked and simplified as a background job
+JOB_POLL_SECONDS = 1.0        # how often a running job's progress is redrawn
+
 # Streamlit button click reruns script top to bottom, allow for persistance 
 def _ensure_state(section: str):
     st.session_state.setdefault(f"{section}_processed", None)
@@ -23,6 +32,10 @@ def _ensure_state(section: str):
     st.session_state.setdefault(f"{section}_questions", None)
     st.session_state.setdefault(f"{section}_answers", None)
     st.session_state.setdefault(f"{section}_chunked", None)
+    st.session_state.setdefault(f"{section}_documents", [])
+    st.session_state.setdefault(f"{section}_documents_input", None)
+    st.session_state.setdefault(f"{section}_parts", [])
+    st.session_state.setdefault(f"{section}_job", None)
     st.session_state.setdefault("uploaded_file", None)
 
 
@@ -56,79 +69,277 @@ Whether you're a student, curious learner, or just tired of misinformation, the
 
 show_cover_image()
 
+# Results are memoised per session and per process, so reruns cost no API calls
+def _memo_session() -> dict:
+    return st.session_state.setdefault("nlp_memo", {})
+
+
+def _stream_with_memo(section: str, task: str, text: str, stream_fn) -> str:
+    memo = get_result_memo()
+    cached = memo.lookup(_memo_session(), task, section, text)
+    if cached is not None:
+        st.markdown(cached)
+        return cached
+    value = st.write_stream(stream_fn(text))
+    memo.store(_memo_session(), task, section, text, value)
+    return value
+
+
+def _render_simplify_result(result: dict) -> None:
+    if result["chunked"]:
+        st.write("That was a lot of text, so we used intelligent chunking.")
+        for part in result["parts"]:
+            st.markdown(part)
+        st.markdown(f"**Overall Summary** {result['overall']}")
+    else:
+        st.markdown(f"**Simplified:** {result['simplified']}")
+
+
+def _stream_simplify(source_text: str) -> dict:
+    """Stream the answer: deltas for short text, finished parts for chunked text."""
+    result = None
+    simplified_box = None
+    deltas = []
+    parts_shown = 0
+    for kind, payload in stream_simplify_flow(
+        source_text=source_text,
+        exceeds_budget_fn=exceeds_budget,
+        simplify_stream_fn=simplify_text_stream,
+        parts_stream_fn=iter_simplified_parts,
+        reduce_fn=reduce_summary,
+        token_budget=SIMPLIFY_TOKEN_BUDGET,
+        max_workers=CHUNK_WORKERS,
+    ):
+        if kind == "delta":
+            if simplified_box is None:
+                simplified_box = st.empty()
+            deltas.append(payload)
+            simplified_box.markdown(f"**Simplified:** {''.join(deltas)}")
+        elif kind == "part":
+            if not parts_shown:
+                st.write("That was a lot of text, so we used intelligent chunking.")
+            parts_shown += 1
+            st.markdown(payload)
+        elif kind == "overall":
+            st.markdown(f"**Overall Summary** {payload}")
+        elif kind == "done":
+            result = payload
+    return result
+
+
+def _store_simplify_result(section: str, result: dict) -> None:
+    st.session_state[f"{section}_processed"] = result["processed"]
+    st.session_state[f"{section}_simplified"] = result["simplified"]
+    st.session_state[f"{section}_overall"] = result["overall"]
+    st.session_state[f"{section}_chunked"] = result["chunked"]
+    st.session_state[f"{section}_parts"] = result["parts"]
+
+
+def _pdf_download(result: dict) -> None:
+    if result["chunked"]:
+        st.download_button(
+            label="Export All Simplified Chunks (PDF)",
+            data=data_for_pdf(result["simplified"]),
+            file_name="simplified.pdf",
+            mime="application/pdf",
+        )
+
+
+def _submit_simplify_job(section: str, source_text: str) -> None:
+    # the same document is only ever processed by one job, whichever session asks
+    st.session_state[f"{section}_job"] = get_job_runner().submit(
+        simplify_job,
+        source_text,
+        exceeds_budget_fn=exceeds_budget,
+        simplify_stream_fn=simplify_text_stream,
+        parts_stream_fn=iter_simplified_parts,
+        reduce_fn=reduce_summary,
+        token_budget=SIMPLIFY_TOKEN_BUDGET,
+        max_workers=CHUNK_WORKERS,
+        key=f"simplify:{text_hash(source_text)}",
+    )
+    st.session_state[f"{section}_job_text"] = source_text
+
+
+def _job_panel(section: str, job: dict) -> None:
+    """Progress, finished parts and, once done, the result of the section's simplify job."""
+    if job["status"] == FAILED:
+        st.warning(f"⚠️ Error: {job['error']}")
+        return
+    if job["status"] == DONE:
+        result = job["result"]
+        _store_simplify_result(section, result)
+        get_result_memo().store(_memo_session(), "simplify", section, st.session_state.get(f"{section}_job_text", ""), result)
+        _render_simplify_result(result)
+        _pdf_download(result)
+        return
+    total = job["total"]
+    label = f"Simplified {job['completed']} of {total} parts..." if total else "Splitting the text into parts..."
+    st.progress(job["progress"], text=label)
+    if job["parts"]:
+        st.write("That was a lot of text, so we used intelligent chunking.")
+    for part in job["parts"]:
+        st.markdown(part)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _live_job_panel(section: str) -> None:
+    # redrawn on its own while the job runs; the whole page reruns once it ends
+    job = get_job_runner().get(st.session_state.get(f"{section}_job"))
+    if job is None or job["status"] in (DONE, FAILED):
+        st.rerun()
+    _job_panel(section, job)
+
+
+def show_simplify_job(section: str) -> None:
+    """The section's background job, picked up again on every rerun."""
+    job = get_job_runner().get(st.session_state.get(f"{section}_job"))
+    if job is None:
+        st.session_state[f"{section}_job"] = None
+    elif job["status"] in (DONE, FAILED):
+        _job_panel(section, job)
+    else:
+        _live_job_panel(section)
+
+
+def _source_text(user_input: str, section: str):
+    # Raw text, or the documents fetched from any links in it
+    documents, warn = decide_source_documents(
+        user_input=user_input,
+        uploaded_file_used=bool(st.session_state.get("uploaded_file")),
+        fetch_from_url=extract_main_text,
+        max_workers=URL_FETCH_WORKERS,
+    )
+    if warn:
+        st.warning(warn)
+        return None
+    st.session_state[f"{section}_documents"] = documents
+    st.session_state[f"{section}_documents_input"] = user_input
+    return "\n\n".join(text for _, text in documents)
+
+
+def _input_text(user_input: str, section: str) -> str:
+    # The documents fetched for this input on an earlier click, so later tools
+    # read the articles behind a link rather than the link itself
+    documents = st.session_state.get(f"{section}_documents")
+    if documents and st.session_state.get(f"{section}_documents_input") == user_input:
+        return "\n\n".join(text for _, text in documents)
+    return user_input
+
+
+def study_pack_tools(user_input, section):
+    """One structured request fills the simplified, key terms and questions panels."""
+    if not st.button("Build study pack", icon="⚡", use_container_width=True, key=(section + "4")):
+        return
+    with st.spinner("Building your study pack..."):
+        source_text = _source_text(user_input, section)
+        if source_text is None:
+            return
+        if exceeds_budget(source_text, STUDY_PACK_MAX_INPUT_TOKENS):
+            st.warning("This text is too long for a single study pack. Switch the study pack off to use chunking.")
+            return
+        pack = get_result_memo().get_or_compute(_memo_session(), "study_pack", section, source_text, study_pack)
+    if isinstance(pack, str):
+        st.warning(pack)
+        return
+
+    st.session_state[f"{section}_processed"] = pack.simplified
+    st.session_state[f"{section}_simplified"] = pack.simplified
+    st.session_state[f"{section}_overall"] = None
+    st.session_state[f"{section}_chunked"] = False
+    st.session_state[f"{section}_parts"] = []
+    st.session_state[f"{section}_questions"] = pack.questions_markdown()
+    st.session_state[f"{section}_answers"] = pack.answers_markdown()
+
+    st.markdown(f"**Simplified:** {pack.simplified}")
+    st.markdown("**Key terms and Defintions:**")
+    st.markdown(pack.glossary_markdown())
+    st.markdown("**Questions to check your understanding:**")
+    st.markdown(pack.questions_markdown())
+    with st.expander("💡 See Answers"):
+        st.markdown(f"**Answers:** \n {pack.answers_markdown()}")
+
+
 # Tools
 def display_tools(user_input, section): 
     
     _ensure_state(section)
 
+    if st.toggle("Study pack: fill every panel with one request", key=(section + "_pack_mode")):
+        study_pack_tools(user_input, section)
+        return
+
     left, middle, right = st.columns(3)
    
     if left.button("Reading Companion", icon="📘", use_container_width=True, key=(section + "1")):
         with st.spinner("Simplifying..."):
             
             # Decide the source text to simplify (raw text or fetched from URL)
-            source_text, warn = decide_source_text(
-                user_input=user_input,
-                uploaded_file_used=bool(st.session_state.get("uploaded_file")),
-                fetch_from_url=extract_main_text,
-            )
-            if warn:
-                st.warning(warn)
+            source_text = _source_text(user_input, section)
+            if source_text is None:
                 return
-            
-            result = simplify_flow(
-                source_text=source_text,
-                token_count_fn=token_count,
-                simplify_fn=simplify_text,
-                chunked_pipeline_fn=simplify_long_text_with_summary,
-                token_budget=3000,
-            )
 
-            st.session_state[f"{section}_processed"] = result["processed"]
-            st.session_state[f"{section}_simplified"] = result["simplified"]
-            st.session_state[f"{section}_overall"] = result["overall"]
-            st.session_state[f"{section}_chunked"] = result["chunked"]
-            
-            if result["chunked"]:
-                st.write("That was a lot of text, so we used intelligent chunking.")
-                st.markdown(f"**Overall Summary** {result['overall']}")
-                st.download_button(
-                    label="Export All Simplified Chunks (PDF)",
-                    data=data_for_pdf(result["simplified"]),
-                    file_name="simplified.pdf",
-                    mime="application/pdf",
-                )
+            memo = get_result_memo()
+            result = memo.lookup(_memo_session(), "simplify", section, source_text)
+            st.session_state[f"{section}_job"] = None
+            if result is None and exceeds_budget(source_text, SIMPLIFY_TOKEN_BUDGET):
+                # long documents run in the background and survive reruns
+                _submit_simplify_job(section, source_text)
             else:
-                st.markdown(f"**Simplified:** {result['simplified']}")
-                
+                if result is not None:
+                    _render_simplify_result(result)
+                else:
+                    result = _stream_simplify(source_text)
+                    memo.store(_memo_session(), "simplify", section, source_text, result)
+                _store_simplify_result(section, result)
+                _pdf_download(result)
+
+    show_simplify_job(section)
+
 
     if middle.button("Key defintions", icon="🔍", use_container_width=True, key=(section + "2")):
         with st.spinner("Finding key terms..."):
             if st.session_state.get(f"{section}_chunked"):
                 src = st.session_state.get(f"{section}_processed")
             else: 
-                src = user_input
+                src = _input_text(user_input, section)
                 
             if not src or not src.strip():
                 st.warning("Please run 📘 Reading Companion first, or paste text.")
             else:    
-                dictionary = explain_terms(src)
-                st.markdown(f"**Key terms and Defintions:** \n {dictionary}")
+                st.markdown("**Key terms and Defintions:**")
+                parts = st.session_state.get(f"{section}_parts")
+                if st.session_state.get(f"{section}_chunked") and parts:
+                    # one call per simplified part, glossaries merged
+                    st.markdown(get_result_memo().get_or_compute(
+                        _memo_session(), "terms_parts", section, src, lambda _: explain_terms_over_parts(parts)
+                    ))
+                else:
+                    _stream_with_memo(section, "terms", src, explain_terms_stream)
 
 
     if right.button("Generate Questions", icon="📝", use_container_width=True, key=(section + "3")):
        with st.spinner("Generating Questions..."):
-            src = st.session_state.get(f"{section}_processed") or user_input
+            src = st.session_state.get(f"{section}_processed") or _input_text(user_input, section)
             if not src or not src.strip():
                 st.warning("Please run 📘 Reading Companion first, or paste text.")
-            else: 
-                questions = question_gen(src)
-                st.session_state[f"{section}_questions"] = questions
-                st.session_state[f"{section}_answers"] = None  # reset answers
-                st.markdown(f"**Questions to check your understanding:** \n {questions}") 
+                return
+            st.markdown("**Questions to check your understanding:**")
+            parts = st.session_state.get(f"{section}_parts")
+            if st.session_state.get(f"{section}_chunked") and parts:
+                # one call per simplified part, the best questions kept
+                questions = get_result_memo().get_or_compute(
+                    _memo_session(), "questions_parts", section, src, lambda _: question_gen_over_parts(parts)
+                )
+                st.markdown(questions)
+            else:
+                questions = _stream_with_memo(section, "questions", src, question_gen_stream)
+            st.session_state[f"{section}_questions"] = questions
         
        with st.expander("💡 See Answers"):  
-            answers = question_answers(questions)
+            answers = get_result_memo().get_or_compute(
+                _memo_session(), "answers", section, questions, question_answers
+            )
             st.markdown(f"**Answers:** \n {answers}")
             st.session_state[f"{section}_answers"] = answers
 
@@ -156,10 +367,14 @@ with st.expander("🛠️ Use Now"):
     
     if uploaded_file is not None:
         st.session_state["uploaded_file"] = True
-        with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
+        pages = st.text_input("Pages to read (optional, e.g. 1-5, 9):").strip() or None
+        # Extracted once per distinct file and page selection, then served from cache on every rerun.
+        # getbuffer() is a view of the upload, so the file is not copied just to hash it.
+        try:
+            user_input = cached_pdf_text(uploaded_file.getbuffer(), pages)
+        except ValueError as e:
+            st.warning(str(e))
             user_input = ""
-            for page in doc:
-                user_input += page.get_text()
     else: 
         st.session_state["uploaded_file"] = False
     
@@ -1,40 +1,118 @@
 # app/controllers.py
-from typing import Callable, Optional, Tuple, Dict
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Dict
 from urlextract import URLExtract
 
-def decide_source_text(
+URL_FETCH_WORKERS = 4   # pages fetched at once when the app passes a pool size
+URL_TIMEOUT = 45.0      # seconds one URL may take before it is given up on
+FETCH_DEADLINE = 90.0   # seconds for all URLs together
+
+
+@lru_cache(maxsize=1)
+def get_url_extractor() -> URLExtract:
+    """One URLExtract per process; building it loads the TLD list from disk."""
+    return URLExtract()
+
+
+def fetch_url_documents(
+    urls: List[str],
+    fetch_from_url: Callable[[str], Optional[str]],
+    max_workers: int = 1,
+    url_timeout: float = URL_TIMEOUT,
+    deadline: float = FETCH_DEADLINE,
+) -> List[Tuple[str, str]]:
+    """
+    Fetch urls on a bounded thread pool and return (url, text) for every URL that
+    produced text, in the order the URLs were given. A URL still running after
+    url_timeout seconds, or when the overall deadline passes, is dropped (its
+    thread is left to finish in the background). Fetch errors drop the URL too.
+    """
+    if not urls:
+        return []
+    started: Dict[int, float] = {}
+
+    def run(i: int, url: str) -> Optional[str]:
+        started[i] = time.monotonic()
+        return fetch_from_url(url)
+
+    texts: List[Optional[str]] = [None] * len(urls)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    try:
+        futures = {pool.submit(run, i, url): i for i, url in enumerate(urls)}
+        pending = set(futures)
+        end = time.monotonic() + deadline
+        while pending:
+            now = time.monotonic()
+            if now >= end:
+                break
+            # wake up at the next per-URL timeout or the overall deadline
+            wake = min([started[futures[f]] + url_timeout for f in pending if futures[f] in started] + [end])
+            done, pending = wait(pending, timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    texts[futures[fut]] = fut.result()
+                except Exception:
+                    continue
+            now = time.monotonic()
+            expired = {f for f in pending if futures[f] in started and now - started[futures[f]] >= url_timeout}
+            pending -= expired
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return [(url, txt) for url, txt in zip(urls, texts) if txt]
+
+
+def decide_source_documents(
     user_input: str,
     uploaded_file_used: bool,
     url_extractor: Callable[[str], list] = None,
     fetch_from_url: Callable[[str], Optional[str]] = None,
-) -> Tuple[Optional[str], Optional[str]]:
+    max_workers: int = 1,
+    url_timeout: float = URL_TIMEOUT,
+    deadline: float = FETCH_DEADLINE,
+) -> Tuple[List[Tuple[Optional[str], str]], Optional[str]]:
     """
-    Return (source_text, warning_msg). If no usable text, source_text=None and a warning string.
+    Return (documents, warning_msg), one (url, text) document per fetched URL.
+    Typed or uploaded text is a single document with url=None. If there is no
+    usable text, documents=[] and a warning string.
     """
-    url_extractor = url_extractor or (lambda s: URLExtract().find_urls(s))
+    url_extractor = url_extractor or (lambda s: get_url_extractor().find_urls(s))
     fetch_from_url = fetch_from_url or (lambda u: None)
 
     user_input = (user_input or "").strip()
     if uploaded_file_used and user_input:
-        return user_input, None
+        return [(None, user_input)], None
 
     if user_input:
         urls = url_extractor(user_input)
         if urls:
-            fetched = []
-            for url in urls:
-                try:
-                    txt = fetch_from_url(url)
-                    if txt:
-                        fetched.append(txt)
-                except Exception:
-                    continue
+            fetched = fetch_url_documents(urls, fetch_from_url, max_workers, url_timeout, deadline)
             if fetched:
-                return "\n\n".join(fetched), None
+                return fetched, None
         # fall back to typed text
-        return user_input, None
+        return [(None, user_input)], None
 
-    return None, "Please upload a PDF, paste text, or provide a valid link first."
+    return [], "Please upload a PDF, paste text, or provide a valid link first."
+
+
+def decide_source_text(
+    user_input: str,
+    uploaded_file_used: bool,
+    url_extractor: Callable[[str], list] = None,
+    fetch_from_url: Callable[[str], Optional[str]] = None,
+    max_workers: int = 1,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return (source_text, warning_msg). If no usable text, source_text=None and a warning string.
+    Fetched documents are joined in URL order.
+    """
+    documents, warn = decide_source_documents(
+        user_input, uploaded_file_used, url_extractor, fetch_from_url, max_workers=max_workers
+    )
+    if warn:
+        return None, warn
+    return "\n\n".join(text for _, text in documents), None
 
 
 def simplify_flow(
@@ -43,22 +121,127 @@ def simplify_flow(
     simplify_fn: Callable[[str], str],
     chunked_pipeline_fn: Callable[[str], Tuple[str, str, list]],
     token_budget: int = 3000,
+    max_workers: Optional[int] = None,
+    exceeds_budget_fn: Optional[Callable[[str, int], bool]] = None,
 ) -> Dict[str, Optional[str]]:
     """
-    Returns: dict(processed, simplified, overall, chunked: bool)
+    Returns: dict(processed, simplified, overall, chunked: bool, parts)
+    max_workers, when given, is forwarded to chunked_pipeline_fn to simplify chunks concurrently.
+    exceeds_budget_fn(text, budget), when given, replaces the full token_count_fn comparison.
     """
-    if token_count_fn(source_text) <= token_budget:
+    if exceeds_budget_fn is not None:
+        over_budget = exceeds_budget_fn(source_text, token_budget)
+    else:
+        over_budget = token_count_fn(source_text) > token_budget
+
+    if not over_budget:
         simplified = simplify_fn(source_text)
         return {
             "processed": simplified,
             "simplified": simplified,
             "overall": None,
             "chunked": False,
+            "parts": [],
         }
-    overall, combined, _parts = chunked_pipeline_fn(source_text)
+    if max_workers is None:
+        overall, combined, parts = chunked_pipeline_fn(source_text)
+    else:
+        overall, combined, parts = chunked_pipeline_fn(source_text, max_workers=max_workers)
     return {
         "processed": combined,
         "simplified": combined,
         "overall": overall,
         "chunked": True,
+        "parts": parts,
     }
+
+
+def stream_simplify_flow(
+    source_text: str,
+    exceeds_budget_fn: Callable[[str, int], bool],
+    simplify_stream_fn: Callable[[str], Iterable[str]],
+    parts_stream_fn: Callable[[str], Iterable[str]],
+    reduce_fn: Callable[[List[str]], str],
+    token_budget: int = 3000,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, object]]:
+    """
+    Streaming twin of simplify_flow. Yields (kind, payload) events:
+      ("delta", str)   next piece of a direct (unchunked) simplification
+      ("part", str)    one finished "## Part i" chunk, in document order
+      ("overall", str) overall summary of a chunked document
+      ("done", dict)   the same dict simplify_flow returns
+    """
+    if not exceeds_budget_fn(source_text, token_budget):
+        pieces = []
+        for delta in simplify_stream_fn(source_text):
+            pieces.append(delta)
+            yield ("delta", delta)
+        simplified = "".join(pieces).strip()
+        yield ("done", {
+            "processed": simplified,
+            "simplified": simplified,
+            "overall": None,
+            "chunked": False,
+            "parts": [],
+        })
+        return
+
+    if max_workers is None:
+        part_iter = parts_stream_fn(source_text)
+    else:
+        part_iter = parts_stream_fn(source_text, max_workers=max_workers)
+    parts = []
+    for part in part_iter:
+        parts.append(part)
+        yield ("part", part)
+
+    combined = "\n\n".join(parts)
+    overall = reduce_fn(parts) if parts else ""
+    yield ("overall", overall)
+    yield ("done", {
+        "processed": combined,
+        "simplified": combined,
+        "overall": overall,
+        "chunked": True,
+        "parts": parts,
+    })
+
+
+def simplify_job(
+    job,
+    source_text: str,
+    exceeds_budget_fn: Callable[[str, int], bool],
+    simplify_stream_fn: Callable[[str], Iterable[str]],
+    parts_stream_fn: Callable[..., Iterable[str]],
+    reduce_fn: Callable[[List[str]], str],
+    token_budget: int = 3000,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    stream_simplify_flow as a background job (see core.utils.jobs): the chunk
+    count, every finished part and the running text are reported on job as they
+    arrive. parts_stream_fn must accept on_chunks. Returns the simplify_flow dict.
+    """
+    def parts_with_total(text: str, **kwargs) -> Iterable[str]:
+        return parts_stream_fn(text, on_chunks=job.set_total, **kwargs)
+
+    pieces = []
+    result = None
+    for kind, payload in stream_simplify_flow(
+        source_text=source_text,
+        exceeds_budget_fn=exceeds_budget_fn,
+        simplify_stream_fn=simplify_stream_fn,
+        parts_stream_fn=parts_with_total,
+        reduce_fn=reduce_fn,
+        token_budget=token_budget,
+        max_workers=max_workers,
+    ):
+        if kind == "delta":
+            pieces.append(payload)
+            job.set_partial("".join(pieces))
+        elif kind == "part":
+            job.add_part(payload)
+        elif kind == "done":
+            result = payload
+    return result
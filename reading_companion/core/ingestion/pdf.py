@@ -0,0 +1,144 @@
+"""
+PDF ingestion outside the Streamlit script thread.
+
+Large PDFs are split into page ranges that are extracted by a process pool
+(PyMuPDF holds the GIL while extracting, so threads would not help).
+Pages are yielded in document order as soon as they are ready, and callers
+can restrict extraction to a page selection such as "1-3, 7, 10-12".
+
+The pool is created once per process with the "spawn" start method: the
+Streamlit server is multi-threaded, and forking a threaded process can
+leave a child deadlocked on a lock some other thread held.
+"""
+import atexit
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import fitz
+
+PdfBuffer = Union[bytes, bytearray, memoryview]
+PageSelection = Union[str, Sequence[int], None]
+
+PARALLEL_MIN_PAGES = 64   # below this, a pool costs more than it saves
+PAGES_PER_TASK = 16       # pages extracted per worker task
+MAX_WORKERS = os.cpu_count() or 1
+
+_worker_doc: Optional["fitz.Document"] = None
+_worker_path: Optional[str] = None
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def parse_page_selection(selection: PageSelection, page_count: int) -> List[int]:
+    """
+    Turn a selection into sorted, unique 0-based page indices.
+    Strings use 1-based inclusive ranges ("1-3, 7"); sequences are 0-based indices.
+    None selects every page. Pages past the end are ignored.
+    """
+    if selection is None:
+        return list(range(page_count))
+    if isinstance(selection, str):
+        pages = set()
+        for part in selection.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            first, sep, last = part.partition("-")
+            try:
+                lo = int(first) if first.strip() else 1
+                hi = (int(last) if last.strip() else page_count) if sep else lo
+            except ValueError:
+                raise ValueError(f"Invalid page range: {part!r}") from None
+            if lo < 1 or hi < lo:
+                raise ValueError(f"Invalid page range: {part!r}")
+            pages.update(range(lo - 1, min(hi, page_count)))
+        return sorted(pages)
+    return sorted({p for p in selection if 0 <= p < page_count})
+
+
+def _batches(pages: List[int], size: int) -> List[List[int]]:
+    return [pages[i:i + size] for i in range(0, len(pages), size)]
+
+
+def _extract_batch(path: str, pages: List[int]) -> List[str]:
+    # Each worker opens a document once and reuses it for the rest of its tasks
+    global _worker_doc, _worker_path
+    if _worker_path != path:
+        if _worker_doc is not None:
+            _worker_doc.close()
+        _worker_doc, _worker_path = fitz.open(path), path
+    return [_worker_doc[p].get_text() for p in pages]
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process-wide pool per worker count, started once and reused for every upload."""
+    with _pools_lock:
+        if max_workers not in _pools:
+            _pools[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pools[max_workers]
+
+
+def shutdown_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def page_count(data: PdfBuffer) -> int:
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def iter_pdf_pages(
+    data: PdfBuffer,
+    pages: PageSelection = None,
+    max_workers: int = MAX_WORKERS,
+    pages_per_task: int = PAGES_PER_TASK,
+    parallel_min_pages: int = PARALLEL_MIN_PAGES,
+) -> Iterator[str]:
+    """
+    Yield the text of the selected pages in order.
+
+    Small selections (or max_workers <= 1) are extracted in this process from the
+    caller's buffer without copying it. Larger ones are split into batches of
+    pages_per_task pages for the shared process pool; the buffer is written once
+    to a temporary file that each worker opens, rather than sent with every task.
+    """
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        selected = parse_page_selection(pages, doc.page_count)
+        if max_workers <= 1 or len(selected) < parallel_min_pages:
+            for p in selected:
+                yield doc[p].get_text()
+            return
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(data)
+    pool = _get_pool(max_workers)
+    futures = []
+    try:
+        futures = [pool.submit(_extract_batch, f.name, batch) for batch in _batches(selected, pages_per_task)]
+        for fut in futures:
+            yield from fut.result()
+    finally:
+        for fut in futures:
+            fut.cancel()
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass  # still open in a worker on platforms that lock open files
+
+
+def extract_pdf_pages(data: PdfBuffer, pages: PageSelection = None, **kwargs) -> List[str]:
+    return list(iter_pdf_pages(data, pages=pages, **kwargs))
@@ -0,0 +1,67 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+CHARS_PER_TOKEN = 4          # rough English average; budgets do not need an exact count
+REASONING_HEADROOM = 1024    # completion tokens a reasoning model may spend before it answers
+REASONING_EFFORT = "low"     # keeps that reasoning within the headroom; these tasks need little
+REASONING_MODELS = ("gpt-5", "o1", "o3", "o4")
+
+# Visible reply budget per task: (floor, share of the input's tokens, ceiling)
+OUTPUT_BUDGETS: Dict[str, Tuple[int, float, int]] = {
+    "chunk": (200, 0.4, 1200),     # one simplified chunk of a long document
+    "summary": (200, 0.6, 900),    # simplify_text ("less than 500 words") and reduce steps
+    "terms": (200, 0.3, 1000),     # glossary bullets, more for longer texts
+    "questions": (150, 0.0, 300),  # three questions
+    "answers": (200, 0.0, 600),    # answers to three questions
+    "study_pack": (800, 0.8, 2500),  # simplified text + glossary + questions and answers in one reply
+}
+
+TRUNCATION_NOTE = "\n\n⚠️ This answer was cut short because it reached its length limit."
+
+_truncations: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def output_budget(task: str, input_text: str = "", model: str = "gpt-5-nano") -> int:
+    """
+    max_completion_tokens for one call: the task's share of the input size,
+    clamped to its floor and ceiling, plus headroom for reasoning models
+    (whose hidden reasoning counts against the same limit).
+    """
+    floor, share, ceiling = OUTPUT_BUDGETS[task]
+    input_tokens = len(input_text or "") // CHARS_PER_TOKEN
+    visible = min(ceiling, max(floor, int(input_tokens * share)))
+    if model.startswith(REASONING_MODELS):
+        visible += REASONING_HEADROOM
+    return visible
+
+
+def completion_args(task: str, input_text: str = "", model: str = "gpt-5-nano") -> dict:
+    """
+    Limit arguments for chat.completions.create: the task's output_budget and,
+    for reasoning models, a low reasoning_effort so hidden reasoning cannot use
+    up the budget and leave the reply empty or cut short.
+    """
+    args = {"max_completion_tokens": output_budget(task, input_text, model)}
+    if model.startswith(REASONING_MODELS):
+        args["reasoning_effort"] = REASONING_EFFORT
+    return args
+
+
+def note_finish(task: str, finish_reason: Optional[str]) -> bool:
+    """Count a reply that stopped at its token limit; returns True if it did."""
+    if finish_reason != "length":
+        return False
+    with _lock:
+        _truncations[task] = _truncations.get(task, 0) + 1
+    return True
+
+
+def truncation_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_truncations)
+
+
+def reset_truncation_stats() -> None:
+    with _lock:
+        _truncations.clear()
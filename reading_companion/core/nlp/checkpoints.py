@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from reading_companion.core.utils.cache_dir import cache_dir
+
+CHECKPOINT_FILE = "checkpoints.sqlite3"
+CHECKPOINT_TTL_SECONDS = 30 * 24 * 3600  # documents untouched for this long are dropped
+
+_enabled: bool = os.getenv("RC_CHECKPOINTS", "1") != "0"
+_stores: Dict[Path, "CheckpointStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class CheckpointStore:
+    """
+    Simplified chunks and summaries of long documents, saved as each one is done.
+
+    Chunks are keyed by (document hash, version, chunk index) and summaries by
+    (hash of the parts they summarise, version). The version is a hash of the
+    prompt, model and chunking settings, so changing any of them starts afresh
+    instead of mixing old and new output. A document interrupted half way
+    resumes from its first missing chunk; a finished one costs no calls.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float = CHECKPOINT_TTL_SECONDS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.saved = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    doc TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (doc, version, idx)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS summaries (
+                    doc TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (doc, version)
+                )
+                """
+            )
+
+    def get_chunks(self, doc: str, version: str) -> Dict[int, str]:
+        """Every saved chunk of the document, by index."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, content FROM chunks WHERE doc = ? AND version = ? AND created_at >= ?",
+                (doc, version, cutoff),
+            ).fetchall()
+            self.hits += len(rows)
+        return dict(rows)
+
+    def put_chunk(self, doc: str, version: str, index: int, content: str) -> None:
+        with self._lock, self._conn:
+            self.saved += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?)", (doc, version, index, content, time.time())
+            )
+
+    def get_summary(self, doc: str, version: str) -> Optional[str]:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM summaries WHERE doc = ? AND version = ? AND created_at >= ?",
+                (doc, version, cutoff),
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+        return row[0] if row else None
+
+    def put_summary(self, doc: str, version: str, content: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self.saved += 1
+            self._conn.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)", (doc, version, content, now))
+            self._conn.execute("DELETE FROM chunks WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl_seconds,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.execute("DELETE FROM summaries")
+            self.hits = 0
+            self.saved = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            documents, chunks = self._conn.execute(
+                "SELECT COUNT(DISTINCT doc || version), COUNT(*) FROM chunks"
+            ).fetchone()
+            summaries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        return {"hits": self.hits, "saved": self.saved, "documents": documents, "chunks": chunks, "summaries": summaries}
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Process-wide store for the current cache directory."""
+    path = cache_dir() / CHECKPOINT_FILE
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = CheckpointStore(path)
+        return _stores[path]
+
+
+def checkpoints_enabled() -> bool:
+    return _enabled
+
+
+def set_checkpoints_enabled(enabled: bool) -> None:
+    """Bypass switch; also settable at start-up with RC_CHECKPOINTS=0."""
+    global _enabled
+    _enabled = enabled
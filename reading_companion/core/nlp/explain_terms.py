@@ -1,19 +1,55 @@
+from typing import Iterator
 from dotenv import load_dotenv
-from .openai_client import get_client
+from .budgets import completion_args
+from .openai_client import get_async_client, get_client, iter_content_deltas, reply_text
 
 load_dotenv()
 
 
+def _messages(input_text: str) -> list:
+    return [
+        {"role": "system", "content": "You are an assistant that explains academic or technical vocab into simpler, plain English definitions."},
+        {"role": "user", "content": f"Pick out all the scientific words and give a simple defintion for them for a 14-year-old reader, in your response just give the words and definitions in bullet points, no intro text or sentence saying what it is you have done:\n\n{input_text}"}
+    ]
+
+
 def explain_terms(input_text):
     client = get_client()
     try:
         response = client.chat.completions.create(
             model="gpt-5-nano",
-            messages=[
-                {"role": "system", "content": "You are an assistant that explains academic or technical vocab into simpler, plain English definitions."},
-                {"role": "user", "content": f"Pick out all the scientific words and give a simple defintion for them for a 14-year-old reader, in your response just give the words and definitions in bullet points, no intro text or sentence saying what it is you have done:\n\n{input_text}"}
-            ],
+            messages=_messages(input_text),
+            **completion_args("terms", input_text),
+        )
+        return reply_text(response, "terms")
+    except Exception as e:
+        return f"⚠️ Error: {e}"
+
+
+async def explain_terms_async(input_text) -> str:
+    """explain_terms on the async client."""
+    client = get_async_client()
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_messages(input_text),
+            **completion_args("terms", input_text),
+        )
+        return reply_text(response, "terms")
+    except Exception as e:
+        return f"⚠️ Error: {e}"
+
+
+def explain_terms_stream(input_text) -> Iterator[str]:
+    """Like explain_terms, but yields the definitions piece by piece as they are generated."""
+    client = get_client()
+    try:
+        stream = client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_messages(input_text),
+            **completion_args("terms", input_text),
+            stream=True,
         )
-        return response.choices[0].message.content.strip()
+        yield from iter_content_deltas(stream, "terms")
     except Exception as e:
-        return f"⚠️ Error: {e}"
\ No newline at end of file
+        yield f"⚠️ Error: {e}"
@@ -0,0 +1,264 @@
+"""
+Tail-latency control for per-chunk LLM calls.
+
+Each call gets two thresholds from the recent latencies of its task:
+after hedge_after (the p95) an identical duplicate request is sent and
+whichever answer arrives first wins; after the deadline (a multiple of the
+p95) the call is given up with ChunkDeadlineExceeded. Until enough calls
+have been seen, fixed defaults are used.
+
+In hedged_call the losing request is not cancelled (a thread cannot be), its
+answer is simply ignored; ahedged_call, the asyncio twin, cancels it. Stats
+record how often calls were hedged and both the served latency and the
+latency the first request alone would have had, so the tail improvement can
+be read off directly. Answers replayed from the response cache (marked
+.cached by llm_cache) are not latency samples: a few milliseconds per hit
+would otherwise drag the p95 down and hedge every real call.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+HEDGE_PERCENTILE = 95        # hedge once a call is slower than this share of recent calls
+DEADLINE_FACTOR = 3.0        # give up after this many times the p95
+MIN_SAMPLES = 10             # calls seen before the percentiles are trusted
+LATENCY_WINDOW = 200         # recent calls kept per task
+DEFAULT_HEDGE_AFTER = 45.0   # seconds, while there are too few samples
+MIN_HEDGE_AFTER = 2.0        # never hedge sooner than this
+MIN_DEADLINE = 60.0          # seconds
+MAX_DEADLINE = 180.0
+HEDGE_WORKERS = 16           # threads for primary and hedge requests, shared process-wide
+
+T = TypeVar("T")
+
+
+class ChunkDeadlineExceeded(TimeoutError):
+    """Neither the request nor its hedge answered before the deadline."""
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100); 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def _is_sample(result) -> bool:
+    # a cache hit says nothing about how long the API takes
+    return not getattr(result, "cached", False)
+
+
+class LatencyTracker:
+    """Recent latencies of one task and the hedge/deadline thresholds derived from them."""
+
+    def __init__(
+        self,
+        window: int = LATENCY_WINDOW,
+        min_samples: int = MIN_SAMPLES,
+        default_hedge_after: float = DEFAULT_HEDGE_AFTER,
+        min_hedge_after: float = MIN_HEDGE_AFTER,
+        deadline_factor: float = DEADLINE_FACTOR,
+        min_deadline: float = MIN_DEADLINE,
+        max_deadline: float = MAX_DEADLINE,
+    ):
+        self.min_samples = min_samples
+        self.default_hedge_after = default_hedge_after
+        self.min_hedge_after = min_hedge_after
+        self.deadline_factor = deadline_factor
+        self.min_deadline = min_deadline
+        self.max_deadline = max_deadline
+        self._primary: Deque[float] = deque(maxlen=window)  # first request alone
+        self._served: Deque[float] = deque(maxlen=window)   # first answer, hedged or not
+        self._lock = threading.Lock()
+        self._counts = {"calls": 0, "hedged": 0, "hedge_wins": 0, "failed": 0, "timed_out": 0}
+
+    def record_primary(self, seconds: float) -> None:
+        with self._lock:
+            self._primary.append(seconds)
+
+    def record_served(self, seconds: float) -> None:
+        with self._lock:
+            self._served.append(seconds)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def hedge_after(self) -> float:
+        with self._lock:
+            samples = list(self._primary)
+        if len(samples) < self.min_samples:
+            return self.default_hedge_after
+        return max(self.min_hedge_after, percentile(samples, HEDGE_PERCENTILE))
+
+    def deadline(self) -> float:
+        with self._lock:
+            samples = list(self._primary)
+        if len(samples) < self.min_samples:
+            return max(self.min_deadline, 2 * self.default_hedge_after)
+        return min(self.max_deadline, max(self.min_deadline, self.deadline_factor * percentile(samples, HEDGE_PERCENTILE)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+            primary, served = list(self._primary), list(self._served)
+        calls = counts["calls"]
+        counts["hedge_rate"] = round(counts["hedged"] / calls, 3) if calls else 0.0
+        for q in (50, 95, 99):
+            counts[f"p{q}_unhedged"] = round(percentile(primary, q), 3)
+            counts[f"p{q}_served"] = round(percentile(served, q), 3)
+        counts["p99_saved"] = round(counts["p99_unhedged"] - counts["p99_served"], 3)
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self._primary.clear()
+            self._served.clear()
+            for name in self._counts:
+                self._counts[name] = 0
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_pool: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_latency_tracker(task: str) -> LatencyTracker:
+    """Process-wide tracker per task (e.g. "chunk")."""
+    with _lock:
+        if task not in _trackers:
+            _trackers[task] = LatencyTracker()
+        return _trackers[task]
+
+
+def hedge_stats() -> Dict[str, dict]:
+    with _lock:
+        trackers = dict(_trackers)
+    return {task: tracker.stats() for task, tracker in trackers.items()}
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+        return _pool
+
+
+def hedged_call(
+    fn: Callable[[], T],
+    tracker: LatencyTracker,
+    hedge_after: Optional[float] = None,
+    deadline: Optional[float] = None,
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> T:
+    """
+    Run fn, send one duplicate if it is slower than hedge_after, and return
+    the first successful answer. If both fail, the last error is raised; if
+    neither answers by the deadline, ChunkDeadlineExceeded.
+    Thresholds default to the tracker's.
+    """
+    pool = pool or _get_pool()
+    hedge_after = tracker.hedge_after() if hedge_after is None else hedge_after
+    deadline = tracker.deadline() if deadline is None else deadline
+    tracker.count("calls")
+    start = time.monotonic()
+
+    def on_primary_done(fut: Future) -> None:
+        # known even when the hedge won, so the unhedged tail can be reported
+        if not fut.cancelled() and fut.exception() is None and _is_sample(fut.result()):
+            tracker.record_primary(time.monotonic() - start)
+
+    primary = pool.submit(fn)
+    primary.add_done_callback(on_primary_done)
+    pending = {primary}
+    hedge: Optional[Future] = None
+    error: Optional[BaseException] = None
+
+    while pending:
+        now = time.monotonic() - start
+        if hedge is None:
+            timeout = max(0.0, min(hedge_after, deadline) - now)
+        else:
+            timeout = max(0.0, deadline - now)
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None:
+                if _is_sample(fut.result()):
+                    tracker.record_served(time.monotonic() - start)
+                if fut is hedge:
+                    tracker.count("hedge_wins")
+                return fut.result()
+            error = fut.exception()
+        elapsed = time.monotonic() - start
+        if elapsed >= deadline and pending:
+            break
+        if hedge is None and (elapsed >= hedge_after or not pending):
+            # slow or failed first request: send the duplicate
+            tracker.count("hedged")
+            hedge = pool.submit(fn)
+            pending.add(hedge)
+
+    if pending:
+        tracker.count("timed_out")
+        raise ChunkDeadlineExceeded(f"no answer after {deadline:.0f}s")
+    tracker.count("failed")
+    raise error
+
+
+async def ahedged_call(
+    make: Callable[[], Awaitable[T]],
+    tracker: LatencyTracker,
+    hedge_after: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> T:
+    """hedged_call for a coroutine function; the request that loses is cancelled."""
+    hedge_after = tracker.hedge_after() if hedge_after is None else hedge_after
+    deadline = tracker.deadline() if deadline is None else deadline
+    tracker.count("calls")
+    start = time.monotonic()
+
+    def on_primary_done(task: "asyncio.Task") -> None:
+        if not task.cancelled() and task.exception() is None and _is_sample(task.result()):
+            tracker.record_primary(time.monotonic() - start)
+
+    primary = asyncio.ensure_future(make())
+    primary.add_done_callback(on_primary_done)
+    pending = {primary}
+    hedge: Optional["asyncio.Future"] = None
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            now = time.monotonic() - start
+            limit = min(hedge_after, deadline) if hedge is None else deadline
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, limit - now), return_when=FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if _is_sample(task.result()):
+                        tracker.record_served(time.monotonic() - start)
+                    if task is hedge:
+                        tracker.count("hedge_wins")
+                    return task.result()
+                error = task.exception()
+            elapsed = time.monotonic() - start
+            if elapsed >= deadline and pending:
+                break
+            if hedge is None and (elapsed >= hedge_after or not pending):
+                tracker.count("hedged")
+                hedge = asyncio.ensure_future(make())
+                pending.add(hedge)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if pending:
+        tracker.count("timed_out")
+        raise ChunkDeadlineExceeded(f"no answer after {deadline:.0f}s")
+    tracker.count("failed")
+    raise error
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from reading_companion.core.utils.cache_dir import cache_dir
+
+CACHE_FILE = "llm_responses.sqlite3"
+CACHE_MAX_BYTES = 64 * 1024 * 1024    # evict least recently used entries above this
+CACHE_TTL_SECONDS = 30 * 24 * 3600    # entries older than this are treated as misses
+
+_enabled: bool = os.getenv("RC_LLM_CACHE", "1") != "0"
+_caches: Dict[Path, "ResponseCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def cache_key(**params) -> str:
+    """Content address of a request: sha256 over model, messages and every other param."""
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with TTL expiry, size-capped LRU eviction and hit/miss counters."""
+
+    def __init__(self, path: Path, max_bytes: int = CACHE_MAX_BYTES, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    finish_reason TEXT,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, finish_reason, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[2] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return {"content": row[0], "finish_reason": row[1]}
+
+    def set(self, key: str, content: str, finish_reason: Optional[str] = None) -> None:
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, content, finish_reason, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache for the current cache directory."""
+    path = cache_dir() / CACHE_FILE
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ResponseCache(path)
+        return _caches[path]
+
+
+def cache_enabled() -> bool:
+    return _enabled
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Bypass switch; also settable at start-up with RC_LLM_CACHE=0."""
+    global _enabled
+    _enabled = enabled
+
+
+def _cached_response(entry: dict):
+    # Same shape the NLP helpers read from a real response
+    choice = SimpleNamespace(
+        message=SimpleNamespace(role="assistant", content=entry["content"]),
+        finish_reason=entry["finish_reason"],
+        index=0,
+    )
+    return SimpleNamespace(choices=[choice], usage=None, cached=True)
+
+
+def _cached_stream(entry: dict):
+    # A cached answer replayed as a single-chunk stream
+    choice = SimpleNamespace(
+        delta=SimpleNamespace(role="assistant", content=entry["content"]),
+        finish_reason=entry["finish_reason"],
+        index=0,
+    )
+    yield SimpleNamespace(choices=[choice], cached=True)
+
+
+async def _acached_stream(entry: dict):
+    for chunk in _cached_stream(entry):
+        yield chunk
+
+
+def _record_chunk(chunk, pieces: list, finish_reason: Optional[str]) -> Optional[str]:
+    if chunk.choices:
+        choice = chunk.choices[0]
+        if choice.delta.content:
+            pieces.append(choice.delta.content)
+        finish_reason = getattr(choice, "finish_reason", None) or finish_reason
+    return finish_reason
+
+
+def _is_complete(content: Optional[str], finish_reason: Optional[str]) -> bool:
+    # a reply cut off at its limit, or an empty one, would be replayed for as long as it is cached
+    return finish_reason == "stop" and bool(content and content.strip())
+
+
+def _recording_stream(stream, cache: "ResponseCache", key: str):
+    # Pass chunks through and store the full text once the stream finishes normally
+    pieces, finish_reason = [], None
+    for chunk in stream:
+        finish_reason = _record_chunk(chunk, pieces, finish_reason)
+        yield chunk
+    content = "".join(pieces)
+    if _is_complete(content, finish_reason):
+        cache.set(key, content, finish_reason)
+
+
+async def _arecording_stream(stream, cache: "ResponseCache", key: str):
+    pieces, finish_reason = [], None
+    async for chunk in stream:
+        finish_reason = _record_chunk(chunk, pieces, finish_reason)
+        yield chunk
+    content = "".join(pieces)
+    if _is_complete(content, finish_reason):
+        cache.set(key, content, finish_reason)
+
+
+def _store_response(cache: "ResponseCache", key: str, resp) -> None:
+    choice = resp.choices[0]
+    finish_reason = getattr(choice, "finish_reason", None)
+    if _is_complete(choice.message.content, finish_reason):
+        cache.set(key, choice.message.content, finish_reason)
+
+
+def _request_key(kwargs: dict) -> str:
+    # streamed and non-streamed calls share an entry
+    return cache_key(**{k: v for k, v in kwargs.items() if k not in ("stream", "stream_options")})
+
+
+class _CachedCompletions:
+    def __init__(self, completions):
+        self._completions = completions
+
+    def create(self, **kwargs):
+        if not cache_enabled() or kwargs.get("n", 1) != 1:
+            return self._completions.create(**kwargs)
+
+        cache = get_response_cache()
+        key = _request_key(kwargs)
+        entry = cache.get(key)
+        if entry is not None:
+            return _cached_stream(entry) if kwargs.get("stream") else _cached_response(entry)
+
+        if kwargs.get("stream"):
+            return _recording_stream(self._completions.create(**kwargs), cache, key)
+
+        resp = self._completions.create(**kwargs)
+        _store_response(cache, key, resp)
+        return resp
+
+
+class _AsyncCachedCompletions(_CachedCompletions):
+    async def create(self, **kwargs):
+        if not cache_enabled() or kwargs.get("n", 1) != 1:
+            return await self._completions.create(**kwargs)
+
+        cache = get_response_cache()
+        key = _request_key(kwargs)
+        entry = cache.get(key)
+        if entry is not None:
+            return _acached_stream(entry) if kwargs.get("stream") else _cached_response(entry)
+
+        if kwargs.get("stream"):
+            return _arecording_stream(await self._completions.create(**kwargs), cache, key)
+
+        resp = await self._completions.create(**kwargs)
+        _store_response(cache, key, resp)
+        return resp
+
+
+class CachedClient:
+    """
+    Wraps an OpenAI client so chat.completions.create is served from the response
+    cache when the same model/messages/params were seen before. Everything else
+    is delegated to the wrapped client.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = SimpleNamespace(completions=_CachedCompletions(client.chat.completions))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class AsyncCachedClient(CachedClient):
+    """CachedClient for an AsyncOpenAI client; shares entries with the sync one."""
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = SimpleNamespace(completions=_AsyncCachedCompletions(client.chat.completions))
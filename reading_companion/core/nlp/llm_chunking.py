@@ -1,22 +1,45 @@
+import asyncio
+import hashlib
 import re
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, Dict, Generator, Iterator, List, Optional, Tuple, TypeVar
 import tiktoken
 from dotenv import load_dotenv
-from .simplify import simplify_text
-from .openai_client import get_client
+from reading_companion.core.utils.memo import text_hash
+from .simplify import SUMMARY_WORDS, _messages as _summary_messages, simplify_text, simplify_text_async
+from .checkpoints import checkpoints_enabled, get_checkpoint_store
+from .explain_terms import explain_terms
+from .question_gen import question_gen
+from .budgets import TRUNCATION_NOTE, completion_args
+from .hedging import ahedged_call, get_latency_tracker, hedged_call
+from .openai_client import get_async_client, get_client, iter_content_deltas, reply_text
 
 
 MODEL = "gpt-5-nano"
 CHUNK_TOKENS = 3000       # per-chunk input budget (prompt+chunk should fit model context)
 CHUNK_OVERLAP_SENTS = 2   # small sentence overlap to keep continuity
-OUTPUT_TOKENS_PER_CHUNK = 400  # cap responses
-FINAL_SUMMARY_TOKENS = 1500     # cap final summary length
+CHUNK_WORKERS = 4         # parallel simplify_chunk calls when concurrency is enabled
+REDUCE_FAN_IN = 8         # max simplified parts merged into one intermediate summary
+REDUCE_MAX_DEPTH = 3      # max intermediate summary levels before the final call
+REDUCE_WORKERS = 4        # parallel batch summaries per reduce level
+FAILED_PART = "⚠️ This part could not be simplified ({reason}), so it is missing here."
+PART_WORKERS = 4          # parallel per-part terms/questions calls
+QUESTIONS_PER_DOC = 3     # questions kept after merging every part's questions
+QUESTION_OVERLAP = 0.6    # word overlap above which two questions count as the same
+CHECKPOINT_VERSION = 1     # bump to invalidate saved chunks when output changes for other reasons
+BUDGET_WINDOW_CHARS = 4096  # text window encoded per step by exceeds_budget
+ENCODE_THREADS = 4        # tiktoken encode_batch threads used by the chunker
 
 load_dotenv()
 
+T = TypeVar("T")
+R = TypeVar("R")
 
+
+@lru_cache(maxsize=None)
 def enc(model: str):
-    # Falls back to a generic encoding if model lookup fails
+    # Cached per model for the whole process; falls back to a generic encoding if model lookup fails
     try:
         return tiktoken.encoding_for_model(model)
     except Exception:
@@ -26,6 +49,51 @@ def token_count(text: str, model: str = MODEL) -> int:
     return len(enc(model).encode(text))
 
 
+def _is_window_cut(text: str, i: int) -> bool:
+    # a lone space between two non-space characters starts a new pre-token
+    return text[i] == " " and not text[i - 1].isspace() and not text[i + 1:i + 2].isspace()
+
+
+def _budget_window_end(text: str, start: int, end: int) -> int:
+    """Largest safe cut in (start, end], else the next one after end, else len(text)."""
+    n = len(text)
+    if end >= n:
+        return n
+    cut = text.rfind(" ", start + 1, end + 1)
+    while cut > start and not _is_window_cut(text, cut):
+        cut = text.rfind(" ", start + 1, cut)
+    if cut > start:
+        return cut
+    cut = text.find(" ", end)
+    while cut != -1 and not _is_window_cut(text, cut):
+        cut = text.find(" ", cut + 1)
+    return n if cut == -1 else cut
+
+
+def exceeds_budget(text: str, budget: int, model: str = MODEL) -> bool:
+    """
+    True if text has more than budget tokens.
+
+    Encodes window by window and stops as soon as the running count passes the
+    budget, so a huge document costs a few windows instead of a full encode.
+    Windows are cut just before a single space, where BPE pre-tokenization
+    splits anyway, so the running count matches a full encode.
+    """
+    # A token covers at least one byte, so short texts never need encoding.
+    if len(text) <= budget and len(text.encode("utf-8")) <= budget:
+        return False
+
+    e = enc(model)
+    used, start, n = 0, 0, len(text)
+    while start < n:
+        end = _budget_window_end(text, start, start + BUDGET_WINDOW_CHARS)
+        used += len(e.encode(text[start:end]))
+        if used > budget:
+            return True
+        start = end
+    return False
+
+
 _SENT_REGEX = re.compile(
     r"""
     (?<!\b[A-Z])        # don't split after single capital initials
@@ -47,56 +115,99 @@ def split_into_sentences(text: str) -> List[str]:
     # Merge very short “sentences” back to reduce fragments
     merged = []
     buf = []
+    buf_len = -1  # length of " ".join(buf), tracked without rebuilding it
     for s in sents:
         s = s.strip()
         if not s:
             continue
         buf.append(s)
-        if len(" ".join(buf)) > 60:  # ~60 chars heuristic
+        buf_len += len(s) + 1
+        if buf_len > 60:  # ~60 chars heuristic
             merged.append(" ".join(buf))
             buf = []
+            buf_len = -1
     if buf:
         merged.append(" ".join(buf))
     return merged 
 
 
+def _sentence_token_lengths(e, sentences: List[str], num_threads: int = ENCODE_THREADS) -> List[int]:
+    """Token length of every sentence from one batched encode (plain encode for encoders without it)."""
+    encode_batch = getattr(e, "encode_batch", None)
+    if encode_batch is None:
+        return [len(e.encode(s)) for s in sentences]
+    return [len(toks) for toks in encode_batch(sentences, num_threads=num_threads)]
+
+
 def chunk_by_tokens_with_sentence_bounds(
     text: str,
     model: str = MODEL,
     chunk_tokens: int = CHUNK_TOKENS,
-    overlap_sents: int = CHUNK_OVERLAP_SENTS
+    overlap_sents: int = CHUNK_OVERLAP_SENTS,
+    num_threads: int = ENCODE_THREADS
 ) -> List[str]:
+    """
+    Greedy sentence packing: each chunk holds whole sentences up to chunk_tokens
+    and starts with the last overlap_sents sentences of the previous chunk.
+
+    Sentences are encoded once; chunk sizes come from prefix sums of their token
+    lengths and chunk text is sliced from the space-joined sentences by character
+    offset, so nothing is re-encoded or re-joined per chunk.
+    """
     sentences = split_into_sentences(text)
     if not sentences:
         return []
 
-    e = enc(model)
-    chunks, cur_sents = [], []
-    cur_tok_len = 0
+    lengths = _sentence_token_lengths(enc(model), sentences, num_threads)
+    joined = " ".join(sentences)
 
-    for i, s in enumerate(sentences):
-        stoks = e.encode(s)
-        stoks_len = len(stoks)
+    # token prefix sums and character offsets of each sentence inside `joined`
+    tok_prefix = [0]
+    starts, ends = [], []
+    pos = 0
+    for s, n in zip(sentences, lengths):
+        tok_prefix.append(tok_prefix[-1] + n)
+        starts.append(pos)
+        pos += len(s)
+        ends.append(pos)
+        pos += 1
 
-        if cur_tok_len + stoks_len <= chunk_tokens or not cur_sents:
-            cur_sents.append(s)
-            cur_tok_len += stoks_len
-        else:
-            chunks.append(" ".join(cur_sents))
+    chunks = []
+    first = 0  # index of the first sentence in the current chunk
+    for i in range(1, len(sentences)):
+        if tok_prefix[i + 1] - tok_prefix[first] > chunk_tokens:
+            chunks.append(joined[starts[first]:ends[i - 1]])
             # start new chunk with overlap
-            overlap = sentences[max(0, i - overlap_sents):i]
-            cur_sents = overlap + [s]
-            cur_tok_len = len(e.encode(" ".join(cur_sents)))
+            first = max(0, i - overlap_sents)
 
-    if cur_sents:
-        chunks.append(" ".join(cur_sents))
+    chunks.append(joined[starts[first]:])
     return chunks
 
 
-def simplify_chunk(chunk_text: str, audience: str = "10-year-old") -> str:
+def _imap_in_order(fn: Callable[[T], R], items: List[T], max_workers: int = 1) -> Iterator[R]:
+    """
+    Apply fn to every item, optionally on a thread pool. Results are yielded in
+    input order, each as soon as it and every earlier result are ready.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    try:
+        futures = [pool.submit(fn, item) for item in items]
+        for fut in futures:
+            yield fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    client = get_client()
-    """Simplify a single chunk."""
+
+def _map_in_order(fn: Callable[[T], R], items: List[T], max_workers: int = 1) -> List[R]:
+    """Apply fn to every item, optionally on a thread pool; results keep input order."""
+    return list(_imap_in_order(fn, items, max_workers))
+
+
+def _chunk_messages(chunk_text: str, audience: str) -> list:
     sys = (
         "You simplify/rewrite academic or technical text into clear, simpler, plain English while keeping key facts. "
         "Write for a {aud} reader. Keep definitions for jargon, and use short paragraphs or bullet points when helpful."
@@ -107,59 +218,428 @@ def simplify_chunk(chunk_text: str, audience: str = "10-year-old") -> str:
         "Avoid losing nuance. If there are sections, preserve their headings.\n\n"
         f"{chunk_text}"
     )
+    return [
+        {"role": "system", "content": sys},
+        {"role": "user", "content": user},
+    ]
+
+
+def _chunk_response(chunk_text: str, audience: str):
+    return get_client().chat.completions.create(
+        model=MODEL,
+        messages=_chunk_messages(chunk_text, audience),
+        **completion_args("chunk", chunk_text, MODEL))
+
+
+def simplify_chunk(chunk_text: str, audience: str = "10-year-old") -> str:
+    """Simplify a single chunk."""
+    return reply_text(_chunk_response(chunk_text, audience), "chunk")
+
 
-    resp = client.chat.completions.create(
+def simplify_chunk_hedged(chunk_text: str, audience: str = "10-year-old") -> str:
+    """
+    simplify_chunk with tail-latency control (see hedging): a duplicate request
+    once the call is slower than the recent p95, and a deadline. A chunk that
+    still fails comes back as a FAILED_PART marker instead of raising.
+    """
+    try:
+        # hedge the response, not its text, so cache hits can be told apart
+        resp = hedged_call(lambda: _chunk_response(chunk_text, audience), get_latency_tracker("chunk"))
+        return reply_text(resp, "chunk")
+    except Exception as e:
+        return FAILED_PART.format(reason=str(e) or type(e).__name__)
+
+
+async def _chunk_response_async(chunk_text: str, audience: str):
+    return await get_async_client().chat.completions.create(
+        model=MODEL,
+        messages=_chunk_messages(chunk_text, audience),
+        **completion_args("chunk", chunk_text, MODEL))
+
+
+async def simplify_chunk_async(chunk_text: str, audience: str = "10-year-old") -> str:
+    """simplify_chunk on the async client."""
+    return reply_text(await _chunk_response_async(chunk_text, audience), "chunk")
+
+
+async def simplify_chunk_hedged_async(chunk_text: str, audience: str = "10-year-old") -> str:
+    """simplify_chunk_hedged on the async client; the slower of two hedged requests is cancelled."""
+    try:
+        resp = await ahedged_call(lambda: _chunk_response_async(chunk_text, audience), get_latency_tracker("chunk"))
+        return reply_text(resp, "chunk")
+    except Exception as e:
+        return FAILED_PART.format(reason=str(e) or type(e).__name__)
+
+
+def is_failed_part(part: str) -> bool:
+    return _part_body(part).startswith(FAILED_PART.split("{", 1)[0])
+
+
+def _is_complete_part(part: str) -> bool:
+    # only whole answers are checkpointed; a failed or cut-off chunk is sent again next time
+    return not is_failed_part(part) and not part.endswith(TRUNCATION_NOTE)
+
+
+def simplify_chunk_stream(chunk_text: str, audience: str = "10-year-old") -> Iterator[str]:
+    """Like simplify_chunk, but yields the simplified text piece by piece as it is generated."""
+    client = get_client()
+    stream = client.chat.completions.create(
         model=MODEL,
-        messages=[
-            {"role": "system", "content": sys},
-            {"role": "user", "content": user},
-        ])
-    return resp.choices[0].message.content.strip()
-
-
-def reduce_summary(simplified_chunks: List[str], target_words: int = 500) -> str:
-    """Create a short overall summary from the simplified parts."""
-    combined = "\n\n".join(simplified_chunks)
-    # If this combined text is huge, you can re-chunk again here; for most cases it's fine.
-    # sys = (
-    #     "You are a precise summarizer. Produce a concise overview that captures the central question, "
-    #     "methods (if present), key findings, and implications. Write for a 10-year-old reader."
-    # )
-    # user = (
-    #     f"Create a short overall summary of {target_words} words (no less) of the following simplified notes:\n\n{combined}"
-    # )
-    # resp = client.chat.completions.create(
-    #     model=MODEL,
-    #     messages=[
-    #         {"role": "system", "content": sys},
-    #         {"role": "user", "content": user},
-    #     ],
-    #     temperature=0.3,
-    #     max_tokens=FINAL_SUMMARY_TOKENS,
-    # )
-    # return resp.choices[0].message.content.strip()
-
-    return simplify_text(combined)
+        messages=_chunk_messages(chunk_text, audience),
+        **completion_args("chunk", chunk_text, MODEL),
+        stream=True)
+    yield from iter_content_deltas(stream, "chunk")
+
+
+def _version(*settings) -> str:
+    payload = "\x1f".join(str(s) for s in (CHECKPOINT_VERSION,) + settings)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def chunk_version(audience: str, model: str, chunk_tokens: int) -> str:
+    """Checkpoint version of simplified chunks: prompt, model and chunking settings."""
+    return _version("chunk", _chunk_messages("", audience), model, chunk_tokens, CHUNK_OVERLAP_SENTS)
+
+
+def summary_version(model: str, batch_tokens: int, fan_in: int, max_depth: int, target_words: int = SUMMARY_WORDS) -> str:
+    return _version("summary", _summary_messages("", target_words), model, batch_tokens, fan_in, max_depth)
+
+
+def _checkpoint_store():
+    return get_checkpoint_store() if checkpoints_enabled() else None
+
+
+def _group_for_reduce(
+    parts: List[str],
+    model: str = MODEL,
+    batch_tokens: int = CHUNK_TOKENS,
+    fan_in: int = REDUCE_FAN_IN
+) -> List[str]:
+    """Pack parts, in order, into batches of at most batch_tokens tokens and fan_in pieces."""
+    batches, cur, cur_len = [], [], 0
+    for part in parts:
+        n = token_count(part, model)
+        if n <= batch_tokens:
+            pieces = [(part, n)]
+        else:
+            # a single oversized part is split at sentence boundaries
+            pieces = [
+                (p, token_count(p, model))
+                for p in chunk_by_tokens_with_sentence_bounds(
+                    part, model=model, chunk_tokens=batch_tokens, overlap_sents=0
+                )
+            ]
+        for piece, piece_len in pieces:
+            if cur and (cur_len + piece_len > batch_tokens or len(cur) >= fan_in):
+                batches.append("\n\n".join(cur))
+                cur, cur_len = [], 0
+            cur.append(piece)
+            cur_len += piece_len
+    if cur:
+        batches.append("\n\n".join(cur))
+    return batches
+
+
+def _reduce_steps(
+    simplified_chunks: List[str],
+    target_words: int,
+    model: str,
+    batch_tokens: int,
+    fan_in: int,
+    max_depth: int
+) -> Generator[Tuple[List[str], int], List[str], str]:
+    """
+    The tree reduce shared by reduce_summary and reduce_summary_async, without
+    the calls: it yields (texts, target_words) for every round of summaries
+    (the batches of a level, then the one final call), is sent back their
+    summaries in order, and returns the overall summary.
+    """
+    # parts that failed to simplify carry nothing worth summarising
+    parts = [p for p in simplified_chunks if not is_failed_part(p)]
+    if not parts:
+        return ""
+    store = _checkpoint_store()
+    doc = text_hash("\n\n".join(parts))
+    version = summary_version(model, batch_tokens, fan_in, max_depth, target_words)
+    saved = store.get_summary(doc, version) if store else None
+    if saved is not None:
+        return saved
+
+    combined = "\n\n".join(parts)
+    complete = True  # no batch summary was left out
+    depth = 0
+    while depth < max_depth and token_count(combined, model) > batch_tokens:
+        batches = _group_for_reduce(parts, model=model, batch_tokens=batch_tokens, fan_in=max(2, fan_in))
+        if len(batches) <= 1:
+            break
+        summaries = yield batches, SUMMARY_WORDS
+        parts = [p for p in summaries if not _is_error(p)]
+        if not parts:
+            return summaries[0]
+        complete = complete and len(parts) == len(summaries)
+        combined = "\n\n".join(parts)
+        depth += 1
+
+    (summary,) = yield [combined], target_words
+    if store and complete and not _is_error(summary):
+        store.put_summary(doc, version, summary)
+    return summary
+
+
+def reduce_summary(
+    simplified_chunks: List[str],
+    target_words: int = SUMMARY_WORDS,
+    model: str = MODEL,
+    batch_tokens: int = CHUNK_TOKENS,
+    fan_in: int = REDUCE_FAN_IN,
+    max_depth: int = REDUCE_MAX_DEPTH,
+    max_workers: int = REDUCE_WORKERS
+) -> str:
+    """
+    Create a short overall summary from the simplified parts.
+
+    If the joined parts exceed batch_tokens, they are summarised as a tree: parts are
+    packed into token-budgeted batches of at most fan_in pieces, each batch is
+    summarised (in parallel), and the batch summaries are reduced again, for at most
+    max_depth levels, before the final simplify_text call, which asks for at most
+    target_words words. A batch whose summary fails is left out (and the result is
+    not checkpointed); if every batch of a level fails, that error is returned.
+    """
+    steps = _reduce_steps(simplified_chunks, target_words, model, batch_tokens, fan_in, max_depth)
+    try:
+        texts, words = next(steps)
+        while True:
+            texts, words = steps.send(_map_in_order(partial(simplify_text, target_words=words), texts, max_workers))
+    except StopIteration as done:
+        return done.value
+
+
+async def reduce_summary_async(
+    simplified_chunks: List[str],
+    target_words: int = SUMMARY_WORDS,
+    model: str = MODEL,
+    batch_tokens: int = CHUNK_TOKENS,
+    fan_in: int = REDUCE_FAN_IN,
+    max_depth: int = REDUCE_MAX_DEPTH
+) -> str:
+    """reduce_summary on the async client; the batches of each level are summarised concurrently."""
+    steps = _reduce_steps(simplified_chunks, target_words, model, batch_tokens, fan_in, max_depth)
+    try:
+        texts, words = next(steps)
+        while True:
+            summaries = await asyncio.gather(*(simplify_text_async(t, target_words=words) for t in texts))
+            texts, words = steps.send(list(summaries))
+    except StopIteration as done:
+        return done.value
+
+
+def iter_simplified_parts(
+    text: str,
+    audience: str = "10-year-old",
+    model: str = MODEL,
+    chunk_tokens: int = CHUNK_TOKENS,
+    max_workers: int = 1,
+    on_chunks: Optional[Callable[[int], None]] = None
+) -> Iterator[str]:
+    """
+    Yield "## Part i" simplified chunks in document order, each as soon as it
+    (and every earlier part) is done, so callers can render while later chunks run.
+    Slow chunks are hedged and failed ones yield a FAILED_PART marker, so one
+    bad chunk neither stalls nor aborts the document.
+    on_chunks, when given, is called with the number of chunks before any is sent.
+    Every chunk is checkpointed as it is done (see checkpoints), so a document
+    that was interrupted only sends the chunks still missing.
+    """
+    chunks = chunk_by_tokens_with_sentence_bounds(text, model=model, chunk_tokens=chunk_tokens)
+    if on_chunks is not None:
+        on_chunks(len(chunks))
+    store = _checkpoint_store()
+    doc, version = text_hash(text), chunk_version(audience, model, chunk_tokens)
+    saved = store.get_chunks(doc, version) if store else {}
+
+    def simplify(item: Tuple[int, str]) -> str:
+        index, chunk = item
+        if index in saved:
+            return saved[index]
+        result = simplify_chunk_hedged(chunk, audience=audience)
+        if store and _is_complete_part(result):
+            store.put_chunk(doc, version, index, result)
+        return result
+
+    simplified = _imap_in_order(simplify, list(enumerate(chunks)), max_workers)
+    for i, s in enumerate(simplified, 1):
+        yield f"## Part {i}\n{s}"
 
 
 def simplify_long_text_with_summary(
     text: str,
     audience: str = "10-year-old",
     model: str = MODEL,
-    chunk_tokens: int = CHUNK_TOKENS
+    chunk_tokens: int = CHUNK_TOKENS,
+    max_workers: int = 1
 ) -> Tuple[str, str, List[str]]:
     """
     Returns: (final_overall_summary, combined_simplified_text, per_chunk_simplified_list)
+
+    max_workers > 1 simplifies chunks concurrently; parts are still numbered
+    and returned in document order.
+    """
+    simplified_parts = list(iter_simplified_parts(
+        text, audience=audience, model=model, chunk_tokens=chunk_tokens, max_workers=max_workers
+    ))
+    if not simplified_parts:
+        return ("", "", [])
+
+    combined_simplified = "\n\n".join(simplified_parts)
+    overall = reduce_summary(simplified_parts)
+    return (overall, combined_simplified, simplified_parts)
+
+
+async def simplify_long_text_with_summary_async(
+    text: str,
+    audience: str = "10-year-old",
+    model: str = MODEL,
+    chunk_tokens: int = CHUNK_TOKENS
+) -> Tuple[str, str, List[str]]:
+    """
+    simplify_long_text_with_summary on the async client. Every chunk is sent at
+    once and the shared scheduler paces them, so one event loop can gather
+    many documents; parts are still numbered and returned in document order.
     """
     chunks = chunk_by_tokens_with_sentence_bounds(text, model=model, chunk_tokens=chunk_tokens)
     if not chunks:
         return ("", "", [])
+    store = _checkpoint_store()
+    doc, version = text_hash(text), chunk_version(audience, model, chunk_tokens)
+    saved = store.get_chunks(doc, version) if store else {}
+
+    async def simplify(index: int, chunk: str) -> str:
+        if index in saved:
+            return saved[index]
+        result = await simplify_chunk_hedged_async(chunk, audience=audience)
+        if store and _is_complete_part(result):
+            store.put_chunk(doc, version, index, result)
+        return result
 
-    simplified_parts = []
-    for i, ch in enumerate(chunks, 1):
-        simplified = simplify_chunk(ch, audience=audience)
-        simplified_parts.append(f"## Part {i}\n{simplified}")
+    simplified = await asyncio.gather(*(simplify(i, ch) for i, ch in enumerate(chunks)))
+    simplified_parts = [f"## Part {i}\n{s}" for i, s in enumerate(simplified, 1)]
 
     combined_simplified = "\n\n".join(simplified_parts)
-    overall = reduce_summary(simplified_parts, target_words=500)
-    return (overall, combined_simplified, simplified_parts)
\ No newline at end of file
+    overall = await reduce_summary_async(simplified_parts)
+    return (overall, combined_simplified, simplified_parts)
+
+
+## Key terms and questions over the simplified parts
+
+_PART_HEADING = re.compile(r"^## Part \d+\s*")
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_TERM_SPLIT = re.compile(r"\s+[—–-]\s+|:\s+")
+_WORD = re.compile(r"\w+")
+_QUESTION_STOPWORDS = set(
+    "a an and are can could do does did for from how in is it of on or the this that to was were "
+    "what when where which who why will with would you your text".split()
+)
+
+
+def _part_body(part: str) -> str:
+    return _PART_HEADING.sub("", part, count=1)
+
+
+def _is_error(reply: str) -> bool:
+    return reply.startswith("⚠️ Error")
+
+
+def _list_items(reply: str) -> List[str]:
+    """Non-empty lines of a bullet or numbered list, without their markers."""
+    items = []
+    for line in reply.splitlines():
+        line = _LIST_MARKER.sub("", line).strip()
+        if line:
+            items.append(line)
+    return items
+
+
+def _term_key(item: str) -> str:
+    # "**Vitamin D**: ..." and "vitamin d — ..." are the same term
+    term = _TERM_SPLIT.split(item, maxsplit=1)[0]
+    return " ".join(_WORD.findall(term.casefold()))
+
+
+def merge_glossaries(replies: List[str]) -> str:
+    """One bullet list from every part's glossary; a term keeps its first definition."""
+    seen: Dict[str, str] = {}
+    for reply in replies:
+        for item in _list_items(reply):
+            seen.setdefault(_term_key(item) or item, item)
+    return "\n".join(f"- {item}" for item in seen.values())
+
+
+def _spread_order(count: int) -> List[int]:
+    """Part indexes starting from the first, last and middle parts, so picks cover the document."""
+    order, step = [], count
+    while step >= 1 and len(order) < count:
+        for i in range(0, count, step):
+            if i not in order:
+                order.append(i)
+        if count - 1 not in order:
+            order.append(count - 1)
+        step //= 2
+    return order
+
+
+def _overlap(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def pick_questions(replies: List[str], n: int = QUESTIONS_PER_DOC, max_overlap: float = QUESTION_OVERLAP) -> str:
+    """
+    The n questions that best cover the document: each part's questions are
+    taken in the order the model gave them, parts are visited spread across the
+    document, and near-duplicates of an already picked question are skipped.
+    """
+    per_part = [[q for q in _list_items(r) if q.endswith("?")] or _list_items(r) for r in replies]
+    order = _spread_order(len(per_part))
+    picked, picked_words = [], []
+    for rank in range(max((len(qs) for qs in per_part), default=0)):
+        for i in order:
+            if len(picked) >= n:
+                break
+            if rank >= len(per_part[i]):
+                continue
+            question = per_part[i][rank]
+            words = set(_WORD.findall(question.casefold())) - _QUESTION_STOPWORDS
+            if any(_overlap(words, w) > max_overlap for w in picked_words):
+                continue
+            picked.append(question)
+            picked_words.append(words)
+    return "\n".join(f"{i}. {q}" for i, q in enumerate(picked, 1))
+
+
+def _map_parts(fn: Callable[[str], str], parts: List[str], max_workers: int) -> List[str]:
+    replies = _map_in_order(fn, [_part_body(p) for p in parts], max_workers)
+    ok = [r for r in replies if not _is_error(r)]
+    return ok or replies[:1]
+
+
+def explain_terms_over_parts(parts: List[str], max_workers: int = PART_WORKERS) -> str:
+    """
+    Key terms for a chunked document: explain_terms runs on every simplified
+    part (concurrently) and the glossaries are merged without repeated terms.
+    """
+    replies = _map_parts(explain_terms, parts, max_workers)
+    if not replies or _is_error(replies[0]):
+        return replies[0] if replies else ""
+    return merge_glossaries(replies)
+
+
+def question_gen_over_parts(parts: List[str], n: int = QUESTIONS_PER_DOC, max_workers: int = PART_WORKERS) -> str:
+    """
+    Questions for a chunked document: question_gen runs on every simplified
+    part (concurrently) and the n questions that best cover the document are kept.
+    """
+    replies = _map_parts(question_gen, parts, max_workers)
+    if not replies or _is_error(replies[0]):
+        return replies[0] if replies else ""
+    return pick_questions(replies, n)
@@ -1,19 +1,37 @@
+import asyncio
 import os
-from typing import Optional
-from openai import OpenAI
+import threading
+import weakref
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
+from .budgets import TRUNCATION_NOTE, note_finish
+from .llm_cache import AsyncCachedClient, CachedClient
+from .rate_limit import AsyncScheduledClient, ScheduledClient
+
+ASYNC_MAX_CONNECTIONS = 64       # open connections per event loop
+ASYNC_MAX_KEEPALIVE = 32         # idle connections kept open for reuse
+ASYNC_KEEPALIVE_EXPIRY = 60.0    # seconds an idle connection stays in the pool
+ASYNC_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
 
 _client: Optional[OpenAI] = None
+_async_override: Optional[AsyncOpenAI] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
 
 def get_client() -> OpenAI:
     """
     Lazily create and cache an OpenAI client.
     In CI/tests where we mock calls, it's fine if OPENAI_API_KEY isn't set.
     We default to 'test' to avoid import-time crashes.
+    Completions go through the persistent response cache (see llm_cache), and
+    cache misses through the process-wide rate-limit scheduler (see rate_limit),
+    which owns retries, so the SDK's own are switched off.
     """
     global _client
     if _client is None:
         api_key = os.getenv("OPENAI_API_KEY", "test")
-        _client = OpenAI(api_key=api_key)
+        _client = CachedClient(ScheduledClient(OpenAI(api_key=api_key, max_retries=0)))
     return _client
 
 def set_client(c: OpenAI) -> None:
@@ -22,3 +40,83 @@ def set_client(c: OpenAI) -> None:
     """
     global _client
     _client = c
+
+def _new_async_client() -> AsyncOpenAI:
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=ASYNC_MAX_KEEPALIVE,
+            keepalive_expiry=ASYNC_KEEPALIVE_EXPIRY,
+        ),
+        timeout=ASYNC_TIMEOUT,
+    )
+    api_key = os.getenv("OPENAI_API_KEY", "test")
+    return AsyncCachedClient(AsyncScheduledClient(
+        AsyncOpenAI(api_key=api_key, max_retries=0, http_client=http_client)
+    ))
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    Async twin of get_client, for use inside a running event loop.
+    An httpx connection pool belongs to the loop it was opened on, so one
+    client is cached per loop; it shares the response cache and the
+    rate-limit scheduler with the sync client.
+    """
+    if _async_override is not None:
+        return _async_override
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = _new_async_client()
+        return client
+
+def set_async_client(c: Optional[AsyncOpenAI]) -> None:
+    """Inject a fake async client for every loop (None goes back to the per-loop clients)."""
+    global _async_override
+    _async_override = c
+
+class EmptyReplyError(RuntimeError):
+    """The model answered with no text (e.g. it spent the whole limit reasoning)."""
+
+
+def reply_text(response, task: Optional[str] = None) -> str:
+    """
+    Stripped text of a chat completion. With a task, a reply cut off at its
+    token limit is counted and ends with TRUNCATION_NOTE, as in iter_content_deltas.
+    An empty reply raises EmptyReplyError instead of passing for an answer.
+    """
+    choice = response.choices[0]
+    text = (choice.message.content or "").strip()
+    if not text:
+        if task is not None:
+            note_finish(task, getattr(choice, "finish_reason", None))
+        raise EmptyReplyError("the model returned an empty reply")
+    if task is not None and note_finish(task, getattr(choice, "finish_reason", None)):
+        text += TRUNCATION_NOTE
+    return text
+
+def iter_content_deltas(stream: Iterable, task: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the text pieces of a chat completion created with stream=True.
+    With a task, a reply cut off at its token limit is counted and ends with TRUNCATION_NOTE.
+    """
+    finish_reason = None
+    for chunk in stream:
+        if chunk.choices:
+            finish_reason = getattr(chunk.choices[0], "finish_reason", None) or finish_reason
+            if chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    if task is not None and note_finish(task, finish_reason):
+        yield TRUNCATION_NOTE
+
+async def aiter_content_deltas(stream: AsyncIterable, task: Optional[str] = None) -> AsyncIterator[str]:
+    """iter_content_deltas for a stream from the async client."""
+    finish_reason = None
+    async for chunk in stream:
+        if chunk.choices:
+            finish_reason = getattr(chunk.choices[0], "finish_reason", None) or finish_reason
+            if chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    if task is not None and note_finish(task, finish_reason):
+        yield TRUNCATION_NOTE
@@ -1,33 +1,91 @@
+from typing import Iterator
 from dotenv import load_dotenv
-from .openai_client import get_client
+from .budgets import completion_args
+from .openai_client import get_async_client, get_client, iter_content_deltas, reply_text
 
 load_dotenv()
 
+_SYSTEM = "You are a teacher that checks a student's understanding of academic text."
+
+
+def _question_messages(input_text: str) -> list:
+    return [
+        {"role": "system", "content": _SYSTEM},
+        {"role": "user", "content": f"Generate 3 comprehension questions based on the text for a 14 year old learner (dont mention the age of the target auidence in your respons):\n\n{input_text}"}
+    ]
+
+
+def _answer_messages(input_text: str) -> list:
+    return [
+        {"role": "system", "content": _SYSTEM},
+        {"role": "user", "content": f"You gave the students the 3 questions provided, now give them the answers in language that a 10 year old would understand (don't mention the age of the target audience in your response) :\n\n{input_text}"}
+    ]
+
 
 def question_gen(input_text):
     client = get_client()
     try:
         response = client.chat.completions.create(
             model="gpt-5-nano",
-            messages=[
-                {"role": "system", "content": "You are a teacher that checks a student's understanding of academic text."},
-                {"role": "user", "content": f"Generate 3 comprehension questions based on the text for a 14 year old learner (dont mention the age of the target auidence in your respons):\n\n{input_text}"}
-            ],
+            messages=_question_messages(input_text),
+            **completion_args("questions", input_text),
+        )
+        return reply_text(response, "questions")
+    except Exception as e:
+        return f"⚠️ Error: {e}"
+
+
+async def question_gen_async(input_text) -> str:
+    """question_gen on the async client."""
+    client = get_async_client()
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_question_messages(input_text),
+            **completion_args("questions", input_text),
         )
-        return response.choices[0].message.content.strip()
+        return reply_text(response, "questions")
     except Exception as e:
         return f"⚠️ Error: {e}"
+
+
+def question_gen_stream(input_text) -> Iterator[str]:
+    """Like question_gen, but yields the questions piece by piece as they are generated."""
+    client = get_client()
+    try:
+        stream = client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_question_messages(input_text),
+            **completion_args("questions", input_text),
+            stream=True,
+        )
+        yield from iter_content_deltas(stream, "questions")
+    except Exception as e:
+        yield f"⚠️ Error: {e}"
+
     
 def question_answers(input_text):
     client = get_client()
     try:
         response = client.chat.completions.create(
             model="gpt-5-nano",
-            messages=[
-                {"role": "system", "content": "You are a teacher that checks a student's understanding of academic text."},
-                {"role": "user", "content": f"You gave the students the 3 questions provided, now give them the answers in language that a 10 year old would understand (don't mention the age of the target audience in your response) :\n\n{input_text}"}
-            ],
+            messages=_answer_messages(input_text),
+            **completion_args("answers", input_text),
+        )
+        return reply_text(response, "answers")
+    except Exception as e:
+        return f"⚠️ Error: {e}"
+
+
+async def question_answers_async(input_text) -> str:
+    """question_answers on the async client."""
+    client = get_async_client()
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_answer_messages(input_text),
+            **completion_args("answers", input_text),
         )
-        return response.choices[0].message.content.strip()
+        return reply_text(response, "answers")
     except Exception as e:
-        return f"⚠️ Error: {e}"   
\ No newline at end of file
+        return f"⚠️ Error: {e}"
@@ -0,0 +1,455 @@
+"""
+Process-wide scheduling of OpenAI requests.
+
+Every completion that misses the response cache passes through one shared
+RateLimitScheduler, whichever Streamlit session it comes from:
+
+- two token buckets hold requests per minute and (estimated) tokens per
+  minute under the provider limits;
+- an AIMD limiter caps requests in flight: the limit grows by about one per
+  window of successful calls and halves on a 429;
+- 429s, timeouts, connection errors and 5xx responses are retried with
+  exponential backoff and full jitter. A Retry-After header overrides the
+  backoff and pauses every other request for as long.
+
+When the retries run out, the last error is raised as before, so callers keep
+their own error handling. AsyncScheduledClient admits async requests against
+the same buckets and limits, waiting with asyncio.sleep instead of blocking.
+"""
+import asyncio
+import email.utils
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+from tenacity import AsyncRetrying, RetryCallState, Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from .budgets import CHARS_PER_TOKEN
+
+REQUESTS_PER_MINUTE = int(os.getenv("RC_OPENAI_RPM", "500"))
+TOKENS_PER_MINUTE = int(os.getenv("RC_OPENAI_TPM", "200000"))
+MAX_CONCURRENCY = int(os.getenv("RC_OPENAI_MAX_CONCURRENCY", "8"))
+MIN_CONCURRENCY = 1
+MAX_ATTEMPTS = 6             # first try plus retries
+BACKOFF_BASE = 0.5           # seconds; jittered exponential backoff starts around here
+BACKOFF_MAX = 20.0           # longest backoff between attempts
+MAX_RETRY_AFTER = 60.0       # longer Retry-After values are capped
+RETRY_STATUSES = (408, 409, 429)  # plus every 5xx
+ASYNC_ACQUIRE_POLL = 0.02    # seconds between checks for a free slot from async code
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Refills at rate_per_minute up to capacity; acquire blocks until enough is available."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount (at most capacity) and return how long to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self.rate) if self.rate > 0 else 0.0
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until amount is available; returns the seconds waited."""
+        wait = self.reserve(amount)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit that adapts like TCP congestion control: each success
+    adds 1/limit (about +1 per window of calls), a throttle halves it. Throttles
+    within one cooldown count once, so a burst of 429s does not collapse the limit.
+    """
+
+    def __init__(
+        self,
+        initial: float = MAX_CONCURRENCY,
+        minimum: float = MIN_CONCURRENCY,
+        maximum: float = MAX_CONCURRENCY,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        clock=time.monotonic,
+    ):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def aacquire(self, poll: float = ASYNC_ACQUIRE_POLL) -> None:
+        # slots are shared with threads, so a free one is polled for rather than awaited
+        while not self.try_acquire():
+            await asyncio.sleep(poll)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            now = self._clock()
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._last_decrease = now
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    return getattr(exc, "status_code", None)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+    status = _status_code(exc)
+    return status is not None and (status in RETRY_STATUSES or status >= 500)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds from a Retry-After(-ms) header on the error's response, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms is not None:
+            return min(MAX_RETRY_AFTER, max(0.0, float(ms) / 1000.0))
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        return min(MAX_RETRY_AFTER, max(0.0, seconds))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(kwargs: dict) -> int:
+    """Prompt characters / CHARS_PER_TOKEN plus the completion limit, as the provider counts TPM."""
+    chars = 0
+    for message in kwargs.get("messages") or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        chars += len(content) if isinstance(content, str) else 0
+    return chars // CHARS_PER_TOKEN + int(kwargs.get("max_completion_tokens") or kwargs.get("max_tokens") or 0)
+
+
+class RateLimitScheduler:
+    """Admission (buckets, pause, concurrency) and retries for one provider account."""
+
+    def __init__(
+        self,
+        requests_per_minute: float = REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = TOKENS_PER_MINUTE,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_attempts: int = MAX_ATTEMPTS,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock, sleep=sleep)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock, sleep=sleep)
+        self.concurrency = AIMDLimiter(initial=max_concurrency, maximum=max_concurrency, clock=clock)
+        self.max_attempts = max_attempts
+        self._backoff = wait_random_exponential(multiplier=backoff_base, max=backoff_max)
+        self._clock = clock
+        self._sleep = sleep
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "throttled": 0, "failed": 0, "waited_seconds": 0.0}
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def pause(self, seconds: float) -> None:
+        """Hold every new request for seconds (the provider asked us to back off)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _admit(self, est_tokens: int) -> None:
+        waited = 0.0
+        while True:
+            with self._lock:
+                pause = self._paused_until - self._clock()
+            if pause <= 0:
+                break
+            self._sleep(pause)
+            waited += pause
+        waited += self.requests.acquire(1)
+        waited += self.tokens.acquire(est_tokens)
+        if waited:
+            self._count("waited_seconds", waited)
+        self.concurrency.acquire()
+
+    async def _aadmit(self, est_tokens: int) -> None:
+        waited = 0.0
+        while True:
+            with self._lock:
+                pause = self._paused_until - self._clock()
+            if pause <= 0:
+                break
+            await asyncio.sleep(pause)
+            waited += pause
+        for bucket, amount in ((self.requests, 1), (self.tokens, est_tokens)):
+            wait = bucket.reserve(amount)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+        if waited:
+            self._count("waited_seconds", waited)
+        await self.concurrency.aacquire()
+
+    def _wait(self, state: RetryCallState) -> float:
+        exc = state.outcome.exception()
+        seconds = retry_after(exc)
+        return seconds if seconds is not None else self._backoff(state)
+
+    def _before_sleep(self, state: RetryCallState) -> None:
+        exc = state.outcome.exception()
+        self._count("retries")
+        if _status_code(exc) == 429:
+            seconds = retry_after(exc)
+            if seconds:
+                self.pause(seconds)
+
+    def attempt(self, fn: Callable[[], T], est_tokens: int = 0, hold: bool = False) -> T:
+        """
+        One admitted call of fn. With hold=True the concurrency slot is kept
+        and must be handed back with release() (used for streams).
+        """
+        self._admit(est_tokens)
+        self._count("requests")
+        try:
+            result = fn()
+        except BaseException as exc:
+            self.concurrency.release()
+            if _status_code(exc) == 429:
+                self._count("throttled")
+                self.concurrency.on_throttle()
+            raise
+        self.concurrency.on_success()
+        if not hold:
+            self.concurrency.release()
+        return result
+
+    async def aattempt(self, fn: Callable[[], Awaitable[T]], est_tokens: int = 0, hold: bool = False) -> T:
+        """attempt for a coroutine function."""
+        await self._aadmit(est_tokens)
+        self._count("requests")
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self.concurrency.release()
+            if _status_code(exc) == 429:
+                self._count("throttled")
+                self.concurrency.on_throttle()
+            raise
+        self.concurrency.on_success()
+        if not hold:
+            self.concurrency.release()
+        return result
+
+    def release(self) -> None:
+        self.concurrency.release()
+
+    def call(self, fn: Callable[[], T], est_tokens: int = 0, hold: bool = False) -> T:
+        """Run fn through admission, retrying transient failures; the last error is re-raised."""
+        retrying = Retrying(
+            retry=retry_if_exception(is_retryable),
+            stop=stop_after_attempt(self.max_attempts),
+            wait=self._wait,
+            before_sleep=self._before_sleep,
+            sleep=self._sleep,
+            reraise=True,
+        )
+        try:
+            return retrying(self.attempt, fn, est_tokens, hold)
+        except BaseException:
+            self._count("failed")
+            raise
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], est_tokens: int = 0, hold: bool = False) -> T:
+        """call for a coroutine function; waits never block the event loop."""
+        retrying = AsyncRetrying(
+            retry=retry_if_exception(is_retryable),
+            stop=stop_after_attempt(self.max_attempts),
+            wait=self._wait,
+            before_sleep=self._before_sleep,
+            reraise=True,
+        )
+        try:
+            return await retrying(self.aattempt, fn, est_tokens, hold)
+        except BaseException:
+            self._count("failed")
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["concurrency_limit"] = round(self.concurrency.limit, 2)
+        stats["in_flight"] = self.concurrency.in_flight
+        return stats
+
+
+class _ScheduledStream:
+    # Keeps the concurrency slot until the stream is read to the end, closed or dropped
+    def __init__(self, stream, scheduler: RateLimitScheduler):
+        self._stream = stream
+        self._scheduler = scheduler
+        self._released = False
+        self._lock = threading.Lock()
+
+    def _release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._scheduler.release()
+
+    def __iter__(self):
+        try:
+            yield from self._stream
+        finally:
+            self._release()
+
+    def close(self) -> None:
+        close = getattr(self._stream, "close", None)
+        if close:
+            close()
+        self._release()
+
+    def __del__(self):
+        self._release()
+
+
+class _AsyncScheduledStream(_ScheduledStream):
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        finally:
+            self._release()
+
+    async def aclose(self) -> None:
+        close = getattr(self._stream, "close", None)
+        if close:
+            await close()
+        self._release()
+
+
+class _ScheduledCompletions:
+    def __init__(self, completions, scheduler: Callable[[], RateLimitScheduler]):
+        self._completions = completions
+        self._scheduler = scheduler
+
+    def create(self, **kwargs):
+        scheduler = self._scheduler()
+        est = estimate_tokens(kwargs)
+        if kwargs.get("stream"):
+            stream = scheduler.call(lambda: self._completions.create(**kwargs), est, hold=True)
+            return _ScheduledStream(stream, scheduler)
+        return scheduler.call(lambda: self._completions.create(**kwargs), est)
+
+
+class ScheduledClient:
+    """
+    Wraps an OpenAI client so chat.completions.create goes through the shared
+    scheduler. Everything else is delegated to the wrapped client.
+    """
+
+    def __init__(self, client, scheduler: Optional[RateLimitScheduler] = None):
+        self._client = client
+        scheduler_fn = (lambda: scheduler) if scheduler is not None else get_scheduler
+        self.chat = SimpleNamespace(completions=_ScheduledCompletions(client.chat.completions, scheduler_fn))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class _AsyncScheduledCompletions(_ScheduledCompletions):
+    async def create(self, **kwargs):
+        scheduler = self._scheduler()
+        est = estimate_tokens(kwargs)
+        if kwargs.get("stream"):
+            stream = await scheduler.acall(lambda: self._completions.create(**kwargs), est, hold=True)
+            return _AsyncScheduledStream(stream, scheduler)
+        return await scheduler.acall(lambda: self._completions.create(**kwargs), est)
+
+
+class AsyncScheduledClient(ScheduledClient):
+    """ScheduledClient for an AsyncOpenAI client; create must be awaited."""
+
+    def __init__(self, client, scheduler: Optional[RateLimitScheduler] = None):
+        self._client = client
+        scheduler_fn = (lambda: scheduler) if scheduler is not None else get_scheduler
+        self.chat = SimpleNamespace(completions=_AsyncScheduledCompletions(client.chat.completions, scheduler_fn))
+
+
+_scheduler: Optional[RateLimitScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """The process-wide scheduler shared by every session."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RateLimitScheduler()
+        return _scheduler
+
+
+def set_scheduler(scheduler: Optional[RateLimitScheduler]) -> None:
+    """Swap the shared scheduler (tests, or different limits); None recreates it from the defaults."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
@@ -1,19 +1,58 @@
+from typing import Iterator
 from dotenv import load_dotenv
-from .openai_client import get_client
+from .budgets import completion_args
+from .openai_client import get_async_client, get_client, iter_content_deltas, reply_text
 
 
 load_dotenv()
 
+SUMMARY_WORDS = 500  # length the simplified text is asked to stay under
 
-def simplify_text(input_text: str) -> str:
+
+def _messages(input_text: str, target_words: int = SUMMARY_WORDS) -> list:
+    return [
+        {"role": "system", "content": "You are an assistant that rewrites academic or technical text into simpler, plain English."},
+        {"role": "user", "content": f"Simplify the following text for a 10-year-old reader in less than {target_words} words:\n\n{input_text}"}
+    ]
+
+
+def simplify_text(input_text: str, target_words: int = SUMMARY_WORDS) -> str:
     client = get_client()
     try:
         response = client.chat.completions.create(
             model="gpt-5-nano",
-            messages=[
-                {"role": "system", "content": "You are an assistant that rewrites academic or technical text into simpler, plain English."},
-                {"role": "user", "content": f"Simplify the following text for a 10-year-old reader in less than 500 words:\n\n{input_text}"}
-            ],        )
-        return response.choices[0].message.content.strip()
+            messages=_messages(input_text, target_words),
+            **completion_args("summary", input_text),
+        )
+        return reply_text(response, "summary")
     except Exception as e:
         return f"⚠️ Error: {e}"
+
+
+async def simplify_text_async(input_text: str, target_words: int = SUMMARY_WORDS) -> str:
+    """simplify_text on the async client."""
+    client = get_async_client()
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_messages(input_text, target_words),
+            **completion_args("summary", input_text),
+        )
+        return reply_text(response, "summary")
+    except Exception as e:
+        return f"⚠️ Error: {e}"
+
+
+def simplify_text_stream(input_text: str) -> Iterator[str]:
+    """Like simplify_text, but yields the answer piece by piece as it is generated."""
+    client = get_client()
+    try:
+        stream = client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_messages(input_text),
+            **completion_args("summary", input_text),
+            stream=True,
+        )
+        yield from iter_content_deltas(stream, "summary")
+    except Exception as e:
+        yield f"⚠️ Error: {e}"
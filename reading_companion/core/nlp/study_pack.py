@@ -0,0 +1,89 @@
+from typing import List, Union
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from .budgets import completion_args, note_finish
+from .openai_client import get_client
+
+load_dotenv()
+
+STUDY_PACK_MAX_INPUT_TOKENS = 6000  # longer texts go through the chunked tools instead
+
+
+class GlossaryEntry(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    term: str
+    definition: str
+
+
+class QuestionAnswer(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    question: str
+    answer: str
+
+
+class StudyPack(BaseModel):
+    """Everything the three tool panels show, produced by one structured-output call."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    simplified: str = Field(description="The text rewritten for a 10-year-old reader, under 500 words.")
+    glossary: List[GlossaryEntry] = Field(description="Every scientific word in the text with a simple definition.")
+    questions: List[QuestionAnswer] = Field(description="Exactly 3 comprehension questions with their answers.")
+
+    def glossary_markdown(self) -> str:
+        return "\n".join(f"- **{g.term}**: {g.definition}" for g in self.glossary)
+
+    def questions_markdown(self) -> str:
+        return "\n".join(f"{i}. {qa.question}" for i, qa in enumerate(self.questions, 1))
+
+    def answers_markdown(self) -> str:
+        return "\n".join(f"{i}. {qa.answer}" for i, qa in enumerate(self.questions, 1))
+
+
+def _messages(input_text: str) -> list:
+    return [
+        {"role": "system", "content": "You are a teacher who turns academic or technical text into a study pack in simple, plain English."},
+        {"role": "user", "content": (
+            "From the text below, produce:\n"
+            "1. simplified: the text simplified for a 10-year-old reader in less than 500 words.\n"
+            "2. glossary: all the scientific words, each with a simple definition for a 14-year-old reader.\n"
+            "3. questions: 3 comprehension questions for a 14 year old learner, each with an answer in language "
+            "a 10 year old would understand.\n"
+            "Don't mention the age of the target audience anywhere.\n\n"
+            f"{input_text}"
+        )},
+    ]
+
+
+def _response_format() -> dict:
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "study_pack", "schema": StudyPack.model_json_schema(), "strict": True},
+    }
+
+
+def study_pack(input_text: str) -> Union[StudyPack, str]:
+    """
+    Simplified text, glossary, questions and answers in a single request.
+    Returns a validated StudyPack, or a "⚠️ Error: ..." string like the other NLP helpers.
+    """
+    client = get_client()
+    try:
+        response = client.chat.completions.create(
+            model="gpt-5-nano",
+            messages=_messages(input_text),
+            response_format=_response_format(),
+            **completion_args("study_pack", input_text),
+        )
+        choice = response.choices[0]
+        if note_finish("study_pack", getattr(choice, "finish_reason", None)):
+            return "⚠️ Error: the study pack was cut short at its length limit."
+        return StudyPack.model_validate_json(choice.message.content)
+    except ValidationError as e:
+        return f"⚠️ Error: the study pack did not match its schema ({e.error_count()} problems)."
+    except Exception as e:
+        return f"⚠️ Error: {e}"
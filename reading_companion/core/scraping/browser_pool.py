@@ -0,0 +1,150 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+POOL_SIZE = 2              # max live browsers per pool
+MAX_PAGES_PER_DRIVER = 25  # recycle a browser after this many pages
+ACQUIRE_TIMEOUT = 60.0     # seconds to wait for a free browser
+
+
+class DriverPool:
+    """
+    Bounded pool of reusable WebDriver instances.
+
+    A driver is health-checked before it is handed out, has its cookies and
+    storage wiped when it comes back, and is quit and replaced after
+    max_pages pages or after any error while it was checked out.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        max_size: int = POOL_SIZE,
+        max_pages: int = MAX_PAGES_PER_DRIVER,
+        acquire_timeout: float = ACQUIRE_TIMEOUT,
+    ):
+        self._factory = factory
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+        self._idle: List[object] = []
+        self._pages: Dict[int, int] = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    @contextmanager
+    def driver(self) -> Iterator[object]:
+        drv = self._acquire()
+        healthy = False
+        try:
+            yield drv
+            healthy = True
+        finally:
+            self._release(drv, healthy)
+
+    def _acquire(self):
+        # WebDriver calls (health checks, quit) are made outside the lock so a
+        # slow browser never holds up threads waiting for another one
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is closed")
+                    if self._idle:
+                        drv = self._idle.pop()
+                        break
+                    if self._live < self.max_size:
+                        self._live += 1
+                        drv = None
+                        break
+                    if not self._cond.wait(timeout=self.acquire_timeout):
+                        raise TimeoutError("No browser became free in time")
+            if drv is None:
+                break
+            if _is_alive(drv):
+                with self._cond:
+                    self.reused += 1
+                return drv
+            self._discard(drv)
+        try:
+            drv = self._factory()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._pages[id(drv)] = 0
+            self.created += 1
+        return drv
+
+    def _release(self, drv, healthy: bool) -> None:
+        with self._cond:
+            self._pages[id(drv)] = self._pages.get(id(drv), 0) + 1
+            worn_out = self._pages[id(drv)] >= self.max_pages
+        keep = healthy and not worn_out and _reset(drv)
+        with self._cond:
+            # a driver coming back after close() is quit, not pooled
+            keep = keep and not self._closed
+            if keep:
+                self._idle.append(drv)
+                self._cond.notify()
+            else:
+                self.recycled += 1
+        if not keep:
+            self._discard(drv)
+
+    def _discard(self, drv) -> None:
+        with self._cond:
+            self._pages.pop(id(drv), None)
+            self._live -= 1
+            self._cond.notify()
+        try:
+            drv.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Quit every idle browser; checked-out ones are quit when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for drv in idle:
+            self._discard(drv)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "live": self._live,
+                "idle": len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "recycled": self.recycled,
+            }
+
+
+def _is_alive(drv) -> bool:
+    try:
+        drv.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def _reset(drv) -> bool:
+    """Wipe per-page state so the next URL starts clean; False means the driver should be dropped."""
+    try:
+        drv.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        if hasattr(drv, "execute_cdp_cmd"):
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            drv.delete_all_cookies()
+        drv.get("about:blank")
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from reading_companion.core.utils.cache_dir import cache_dir
+
+MEMORY_FILE = "domain_strategies.sqlite3"
+HALF_LIFE_SECONDS = 7 * 24 * 3600  # outcomes lose half their weight after this
+MIN_EVIDENCE = 1.5                 # decayed failures needed before a strategy is skipped
+DURATION_SMOOTHING = 0.3           # weight of the newest duration in the running average
+
+FAST = "fast"        # plain HTTP fetch + trafilatura
+BROWSER = "browser"  # Selenium + readability
+BLOCKED = "blocked"  # known to block automated access; do not try
+
+_memories: Dict[Path, "DomainMemory"] = {}
+_memories_lock = threading.Lock()
+
+
+def domain_of(url: str) -> str:
+    host = (urlsplit(url.strip()).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainMemory:
+    """
+    Persistent per-domain record of how each extraction strategy went.
+
+    Every attempt adds 1 to the domain's ok, fail or blocked score for that
+    strategy, and all scores halve every half_life seconds, so a domain that
+    changes its behaviour is re-probed after a while. route() turns the scores
+    into a decision; the counters behind stats() show how often the memory
+    changed the default route and roughly how much time that saved.
+    """
+
+    def __init__(self, path: Path, half_life: float = HALF_LIFE_SECONDS, min_evidence: float = MIN_EVIDENCE):
+        self.path = Path(path)
+        self.half_life = half_life
+        self.min_evidence = min_evidence
+        self.lookups = 0
+        self.skipped_fast = 0
+        self.failed_fast = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS strategies (
+                    domain TEXT NOT NULL,
+                    strategy TEXT NOT NULL,
+                    ok REAL NOT NULL,
+                    fail REAL NOT NULL,
+                    blocked REAL NOT NULL,
+                    seconds REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (domain, strategy)
+                )
+                """
+            )
+
+    def _scores(self, domain: str, strategy: str, now: float) -> Optional[dict]:
+        # caller holds the lock
+        row = self._conn.execute(
+            "SELECT ok, fail, blocked, seconds, updated_at FROM strategies WHERE domain = ? AND strategy = ?",
+            (domain, strategy),
+        ).fetchone()
+        if row is None:
+            return None
+        factor = 0.5 ** (max(0.0, now - row[4]) / self.half_life)
+        return {"ok": row[0] * factor, "fail": row[1] * factor, "blocked": row[2] * factor, "seconds": row[3]}
+
+    def _bad(self, scores: Optional[dict], *outcomes: str) -> bool:
+        if scores is None:
+            return False
+        bad = sum(scores[o] for o in outcomes)
+        return bad >= self.min_evidence and bad > 2 * scores["ok"]
+
+    def route(self, domain: str) -> str:
+        """
+        FAST (the default: trafilatura, then the browser if it fails), BROWSER
+        when trafilatura keeps failing here, or BLOCKED when the browser keeps
+        hitting bot checks as well.
+        """
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            fast = self._scores(domain, FAST, now)
+            if not self._bad(fast, "fail", "blocked"):
+                return FAST
+            browser = self._scores(domain, BROWSER, now)
+            self.seconds_saved += fast["seconds"]
+            if self._bad(browser, "blocked", "fail"):
+                self.failed_fast += 1
+                self.seconds_saved += browser["seconds"]
+                return BLOCKED
+            self.skipped_fast += 1
+            return BROWSER
+
+    def record(self, domain: str, strategy: str, outcome: str, seconds: float) -> None:
+        """outcome is "ok", "fail" or "blocked"; seconds is how long the attempt took."""
+        now = time.time()
+        with self._lock, self._conn:
+            scores = self._scores(domain, strategy, now) or {"ok": 0.0, "fail": 0.0, "blocked": 0.0, "seconds": seconds}
+            scores[outcome] += 1.0
+            avg = (1 - DURATION_SMOOTHING) * scores["seconds"] + DURATION_SMOOTHING * seconds
+            self._conn.execute(
+                "INSERT OR REPLACE INTO strategies VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (domain, strategy, scores["ok"], scores["fail"], scores["blocked"], avg, now),
+            )
+
+    def forget(self, domain: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM strategies WHERE domain = ?", (domain,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            domains = self._conn.execute("SELECT COUNT(DISTINCT domain) FROM strategies").fetchone()[0]
+            routed = self.skipped_fast + self.failed_fast
+            return {
+                "lookups": self.lookups,
+                "skipped_fast": self.skipped_fast,
+                "failed_fast": self.failed_fast,
+                "hit_rate": routed / self.lookups if self.lookups else 0.0,
+                "seconds_saved": round(self.seconds_saved, 3),
+                "domains": domains,
+            }
+
+
+def get_domain_memory() -> DomainMemory:
+    """Process-wide strategy memory for the current cache directory."""
+    path = cache_dir() / MEMORY_FILE
+    with _memories_lock:
+        if path not in _memories:
+            _memories[path] = DomainMemory(path)
+        return _memories[path]
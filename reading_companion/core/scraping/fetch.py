@@ -0,0 +1,146 @@
+"""
+Plain HTTP fetching for the fast extraction path.
+
+All requests share one keep-alive session. Bodies are streamed (and
+transparently decompressed) in chunks and cut off at max_bytes, every socket
+read has a timeout and the whole download has a deadline (checked between
+chunks), so one huge page or slow server cannot hold a worker or its memory
+for long. The body is decoded with the detected charset and handed back as
+UTF-8 bytes, which is what trafilatura.extract reads most reliably.
+"""
+import codecs
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+import requests
+from charset_normalizer import from_bytes
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+CONNECT_TIMEOUT = 5.0          # seconds to open a connection
+READ_TIMEOUT = 15.0            # seconds between received bytes
+TOTAL_DEADLINE = 30.0          # seconds for the whole download
+MAX_BYTES = 5 * 1024 * 1024    # decompressed bytes kept; the rest is not downloaded
+CHUNK_BYTES = 64 * 1024
+POOL_HOSTS = 16                # hosts with pooled connections
+POOL_PER_HOST = 8              # keep-alive connections per host
+SNIFF_BYTES = 64 * 1024        # bytes looked at when guessing the charset
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+TEXT_TYPES = ("text/", "application/xhtml", "application/xml", "application/rss", "application/atom")
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class FetchDeadlineExceeded(requests.Timeout):
+    """The download took longer than its overall deadline."""
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Encoding": ACCEPT_ENCODING,  # includes br when brotli is installed
+            })
+            _session = session
+        return _session
+
+
+def close_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _known(encoding: Optional[str]) -> Optional[str]:
+    if not encoding:
+        return None
+    try:
+        return codecs.lookup(encoding.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def detect_charset(body: bytes, content_type: str = "") -> str:
+    """Charset from the Content-Type header, then a <meta> tag, then a statistical guess."""
+    header = re.search(r"charset\s*=\s*([^\s;]+)", content_type or "", re.IGNORECASE)
+    encoding = _known(header.group(1)) if header else None
+    if encoding:
+        return encoding
+    meta = _META_CHARSET.search(body[:4096])
+    encoding = _known(meta.group(1).decode("ascii", "ignore")) if meta else None
+    if encoding:
+        return encoding
+    best = from_bytes(body[:SNIFF_BYTES]).best()
+    return _known(best.encoding if best else None) or "utf-8"
+
+
+def fetch(
+    url: str,
+    headers: Optional[dict] = None,
+    max_bytes: int = MAX_BYTES,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    read_timeout: float = READ_TIMEOUT,
+    deadline: float = TOTAL_DEADLINE,
+    content_types: Tuple[str, ...] = TEXT_TYPES,
+) -> dict:
+    """
+    GET url and return dict(status, url, headers, body, encoding, truncated).
+    body is filled for a 200 whose content type starts with one of content_types,
+    else b"". Text bodies come back as UTF-8 bytes, anything else (e.g. a PDF
+    with content_types=("application/pdf",)) as downloaded.
+    Network errors, read timeouts and FetchDeadlineExceeded raise
+    requests.RequestException subclasses.
+    """
+    end = time.monotonic() + deadline
+    with get_session().get(
+        url, headers=headers, stream=True, timeout=(connect_timeout, read_timeout)
+    ) as resp:
+        result = {
+            "status": resp.status_code,
+            "url": resp.url,
+            "headers": resp.headers,
+            "body": b"",
+            "encoding": None,
+            "truncated": False,
+        }
+        content_type = resp.headers.get("Content-Type", "text/html")
+        if resp.status_code != 200 or not content_type.lower().startswith(content_types):
+            return result
+
+        chunks, size = [], 0
+        for chunk in resp.iter_content(CHUNK_BYTES):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_bytes:
+                result["truncated"] = True
+                break
+            if time.monotonic() > end:
+                raise FetchDeadlineExceeded(f"Download of {url} exceeded {deadline:.0f}s")
+
+    raw = b"".join(chunks)[:max_bytes]
+    if not content_type.lower().startswith(TEXT_TYPES):
+        result["body"] = raw
+        return result
+    encoding = detect_charset(raw, content_type)
+    result["encoding"] = encoding
+    result["body"] = raw.decode(encoding, errors="replace").encode("utf-8")
+    return result
@@ -0,0 +1,181 @@
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from reading_companion.core.utils.cache_dir import cache_dir
+
+CACHE_FILE = "http_pages.sqlite3"
+HTTP_CACHE_MAX_BYTES = 128 * 1024 * 1024  # evict least recently used pages above this
+HTTP_CACHE_FRESH_SECONDS = 6 * 3600       # served without touching the network
+HTTP_CACHE_TTL_SECONDS = 14 * 24 * 3600   # after this an entry is dropped, even if it revalidates
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ref_src", "_ga")
+
+_caches: Dict[Path, "PageCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Cache key for a URL: lower-case scheme and host, default ports and fragments
+    dropped, tracking parameters removed and the remaining query sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class PageCache:
+    """
+    SQLite store of downloaded pages: compressed HTML bytes, the text extracted from
+    it and the ETag/Last-Modified validators needed to revalidate it.
+
+    An entry younger than fresh_seconds is served as is. An older one is
+    revalidated with a conditional GET (see conditional_headers); a 304 makes it
+    fresh again via touch(). Entries older than ttl_seconds are dropped, and the
+    least recently used ones go first once the store is above max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        fresh_seconds: float = HTTP_CACHE_FRESH_SECONDS,
+        ttl_seconds: float = HTTP_CACHE_TTL_SECONDS,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    html BLOB NOT NULL,
+                    text TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    validated_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_lru ON pages (accessed_at)")
+
+    def get(self, url: str) -> Optional[dict]:
+        """Entry for url (fresh or stale) with a "fresh" flag, or None."""
+        now = time.time()
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html, text, etag, last_modified, created_at, validated_at FROM pages WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or now - row[4] > self.ttl_seconds:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+        return {
+            "html": zlib.decompress(row[0]),
+            "text": row[1],
+            "etag": row[2],
+            "last_modified": row[3],
+            "fresh": now - row[5] <= self.fresh_seconds,
+        }
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: "hits", "revalidated" or "misses"."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def set(
+        self,
+        url: str,
+        html: Union[bytes, str],
+        text: Optional[str],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        now = time.time()
+        blob = zlib.compress(html if isinstance(html, bytes) else html.encode("utf-8"))
+        size = len(blob) + len((text or "").encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), url, blob, text, etag, last_modified, size, now, now, now),
+            )
+            self._evict(now)
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as just revalidated (the server answered 304)."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pages SET validated_at = ? WHERE key = ?", (time.time(), normalize_url(url)))
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM pages WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM pages ORDER BY accessed_at ASC").fetchall():
+            self._conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+            self.hits = self.revalidated = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+def conditional_headers(entry: Optional[dict]) -> dict:
+    """If-None-Match / If-Modified-Since for a stale entry."""
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def get_page_cache() -> PageCache:
+    """Process-wide page cache for the current cache directory."""
+    path = cache_dir() / CACHE_FILE
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = PageCache(path)
+        return _caches[path]
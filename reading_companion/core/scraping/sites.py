@@ -0,0 +1,225 @@
+"""
+Site-specific extractors for the research hosts most links point at.
+
+Each extractor is registered against a URL pattern and receives the regex
+match. Instead of rendering the article page it reads the site's structured
+representation: the arXiv API and PDF, PubMed/PMC XML from NCBI E-utilities,
+and the article body of Springer/BMC pages. An extractor returns None when it
+cannot produce text, and the caller falls back to the generic path.
+"""
+import re
+from typing import Callable, List, Optional, Tuple
+
+import requests
+from lxml import etree, html as lxml_html
+
+from reading_companion.core.ingestion.pdf import extract_pdf_pages
+
+from .fetch import fetch
+
+PDF_MAX_BYTES = 40 * 1024 * 1024  # larger PDFs are left to the generic path
+MIN_FULL_TEXT_CHARS = 2000         # shorter "full text" is usually a landing page or stub
+
+ARXIV_API = "https://export.arxiv.org/api/query?id_list={id}"
+ARXIV_PDF = "https://arxiv.org/pdf/{id}"
+EUTILS_EFETCH = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?db={db}&id={id}&retmode=xml"
+
+# Springer/BMC sections that are not part of the article text
+SKIPPED_SECTIONS = {
+    "references", "acknowledgements", "acknowledgments", "author information", "authors' contributions",
+    "ethics declarations", "additional information", "rights and permissions", "about this article",
+    "funding", "availability of data and materials", "data availability", "supplementary information",
+    "electronic supplementary material", "notes", "change history", "abbreviations",
+}
+
+SiteExtractor = Callable[["re.Match"], Optional[str]]
+_registry: List[Tuple["re.Pattern", SiteExtractor]] = []
+
+_XML_PARSER = etree.XMLParser(encoding="utf-8", recover=True, resolve_entities=False, no_network=True)
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def register_site_extractor(pattern: str) -> Callable[[SiteExtractor], SiteExtractor]:
+    """Decorator: use the function for URLs matching pattern (case-insensitive)."""
+    def decorator(fn: SiteExtractor) -> SiteExtractor:
+        _registry.append((re.compile(pattern, re.IGNORECASE), fn))
+        return fn
+    return decorator
+
+
+def find_site_extractor(url: str) -> Optional[Tuple[SiteExtractor, "re.Match"]]:
+    for pattern, fn in _registry:
+        match = pattern.match(url.strip())
+        if match:
+            return fn, match
+    return None
+
+
+def extract_site_text(url: str) -> Optional[str]:
+    """Text from a registered site extractor, or None for unknown hosts and failures."""
+    found = find_site_extractor(url)
+    if found is None:
+        return None
+    fn, match = found
+    try:
+        return fn(match) or None
+    except (requests.RequestException, etree.LxmlError, RuntimeError, ValueError):
+        return None
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def _text_of(node: Optional["etree._Element"]) -> str:
+    return _norm("".join(node.itertext())) if node is not None else ""
+
+
+def _join(blocks: List[str]) -> str:
+    return "\n\n".join(b for b in blocks if b)
+
+
+def _get_xml(url: str) -> Optional["etree._Element"]:
+    resp = fetch(url)
+    if not resp["body"]:
+        return None
+    return etree.fromstring(resp["body"], _XML_PARSER)
+
+
+def _pdf_text(url: str) -> Optional[str]:
+    resp = fetch(url, max_bytes=PDF_MAX_BYTES, content_types=("application/pdf", "application/octet-stream"))
+    if not resp["body"] or resp["truncated"] or not resp["body"].startswith(b"%PDF"):
+        return None
+    text = "\n".join(extract_pdf_pages(resp["body"])).strip()
+    return text if len(text) >= MIN_FULL_TEXT_CHARS else None
+
+
+## arXiv
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def parse_arxiv_entry(root: "etree._Element") -> Optional[str]:
+    """Title and abstract from an arXiv API (Atom) response."""
+    entry = root.find(f"{ATOM}entry")
+    if entry is None or entry.find(f"{ATOM}summary") is None:
+        return None
+    title = _norm(entry.findtext(f"{ATOM}title"))
+    abstract = _norm(entry.findtext(f"{ATOM}summary"))
+    return _join([title, "Abstract", abstract]) if abstract else None
+
+
+@register_site_extractor(
+    r"^https?://(?:www\.|export\.)?arxiv\.org/(?:abs|pdf|html)/"
+    r"(?P<id>\d{4}\.\d{4,5}(?:v\d+)?|[a-z.\-]+/\d{7}(?:v\d+)?)(?:\.pdf)?/?(?:[?#].*)?$"
+)
+def arxiv(match: "re.Match") -> Optional[str]:
+    # Full text straight from the PDF; the API abstract if the PDF is unusable
+    arxiv_id = match.group("id")
+    text = _pdf_text(ARXIV_PDF.format(id=arxiv_id))
+    if text:
+        return text
+    root = _get_xml(ARXIV_API.format(id=arxiv_id))
+    return parse_arxiv_entry(root) if root is not None else None
+
+
+## PubMed / PMC
+
+def _jats_sections(parent: "etree._Element") -> List[str]:
+    blocks = []
+    for node in parent:
+        tag = node.tag if isinstance(node.tag, str) else ""
+        if tag in ("title", "p"):
+            blocks.append(_text_of(node))
+        elif tag == "sec":
+            blocks.extend(_jats_sections(node))
+    return blocks
+
+
+def parse_pmc_article(root: "etree._Element") -> Optional[str]:
+    """Title, abstract and body sections from PMC (JATS) XML."""
+    article = root if root.tag == "article" else root.find(".//article")
+    if article is None:
+        return None
+    blocks = [_text_of(article.find("front//article-title"))]
+    abstract = article.find("front//abstract")
+    if abstract is not None:
+        blocks += ["Abstract"] + _jats_sections(abstract)
+    body = article.find("body")
+    if body is not None:
+        blocks += _jats_sections(body)
+    return _join(blocks) if body is not None or abstract is not None else None
+
+
+def parse_pubmed_article(root: "etree._Element") -> Tuple[Optional[str], Optional[str]]:
+    """(title and abstract text, PMC id if the article has a free full text) from PubMed XML."""
+    article = root.find(".//PubmedArticle")
+    if article is None:
+        return None, None
+    blocks = [_text_of(article.find(".//ArticleTitle"))]
+    parts = article.findall(".//Abstract/AbstractText")
+    if parts:
+        blocks.append("Abstract")
+    for part in parts:
+        label = part.get("Label")
+        text = _text_of(part)
+        blocks.append(f"{label.capitalize()}: {text}" if label else text)
+    pmc = article.findtext(".//ArticleIdList/ArticleId[@IdType='pmc']")
+    return (_join(blocks) if parts else None), (pmc.strip() if pmc else None)
+
+
+@register_site_extractor(
+    r"^https?://(?:pmc\.ncbi\.nlm\.nih\.gov/articles|(?:www\.)?ncbi\.nlm\.nih\.gov/pmc/articles)/"
+    r"(?:PMC)?(?P<pmc>\d+)/?(?:[?#].*)?$"
+)
+def pmc(match: "re.Match") -> Optional[str]:
+    root = _get_xml(EUTILS_EFETCH.format(db="pmc", id=match.group("pmc")))
+    return parse_pmc_article(root) if root is not None else None
+
+
+@register_site_extractor(r"^https?://(?:www\.)?pubmed\.ncbi\.nlm\.nih\.gov/(?P<pmid>\d+)/?(?:[?#].*)?$")
+def pubmed(match: "re.Match") -> Optional[str]:
+    root = _get_xml(EUTILS_EFETCH.format(db="pubmed", id=match.group("pmid")))
+    if root is None:
+        return None
+    abstract, pmc_id = parse_pubmed_article(root)
+    if pmc_id:
+        full = _get_xml(EUTILS_EFETCH.format(db="pmc", id=pmc_id.removeprefix("PMC")))
+        full_text = parse_pmc_article(full) if full is not None else None
+        if full_text and len(full_text) >= MIN_FULL_TEXT_CHARS:
+            return full_text
+    return abstract
+
+
+## Springer / BMC
+
+def parse_springer_article(page: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """(article text, citation PDF url) from a Springer or BMC article page."""
+    doc = lxml_html.document_fromstring(page, parser=_HTML_PARSER)
+    meta = {m.get("name"): m.get("content") for m in doc.iter("meta") if m.get("name")}
+    blocks = [_norm(meta.get("citation_title") or meta.get("dc.title") or "")]
+    for section in doc.xpath("//div[contains(@class, 'c-article-body')]//section[@data-title][not(ancestor::section[@data-title])]"):
+        heading = _norm(section.get("data-title"))
+        if heading.lower() in SKIPPED_SECTIONS:
+            continue
+        paragraphs = [_norm(p.text_content()) for p in section.xpath(".//p")]
+        if any(paragraphs):
+            blocks.append(heading)
+            blocks.extend(paragraphs)
+    text = _join(blocks) if len(blocks) > 1 else None
+    return text, meta.get("citation_pdf_url")
+
+
+@register_site_extractor(
+    r"^https?://(?:link\.springer\.com/(?:article|chapter)|[a-z0-9\-]+\.biomedcentral\.com/articles)/"
+    r"(?P<doi>10\.\d{4,9}/[^?#]+?)/?(?:[?#].*)?$"
+)
+def springer(match: "re.Match") -> Optional[str]:
+    resp = fetch(match.group(0))
+    if not resp["body"]:
+        return None
+    text, pdf_url = parse_springer_article(resp["body"])
+    if text and len(text) >= MIN_FULL_TEXT_CHARS:
+        return text
+    # Paywalled pages only carry the abstract; the citation PDF is worth a try
+    return (_pdf_text(pdf_url) if pdf_url else None) or text
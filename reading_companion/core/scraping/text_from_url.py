@@ -1,5 +1,8 @@
 import trafilatura
 import re
+import requests
+import atexit
+import threading
 import time
 
 from selenium import webdriver
@@ -7,10 +10,16 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 
-from bs4 import BeautifulSoup
 from readability import Document
 
+from .browser_pool import DriverPool
+from .domain_memory import BLOCKED, BROWSER, FAST, domain_of, get_domain_memory
+from .fetch import fetch
+from .sites import extract_site_text
+from .http_cache import conditional_headers, get_page_cache
+
 COOKIE_XPATHS = [
     "//button[contains(translate(., 'ACEPT', 'acept'), 'accept')]",
     "//button[contains(translate(., 'ALLOW', 'allow'), 'allow')]",
@@ -21,23 +30,85 @@ COOKIE_XPATHS = [
     "//button[@id='onetrust-accept-btn-handler']",
 ]
 
+PAGE_TIME_BUDGET = 20.0  # seconds one page may take in Chrome, load and settle steps included
+
+# Requests the text-only profile never makes: media, fonts and common ad/analytics hosts
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m4v", "*.mp3", "*.m4a", "*.ogg", "*.wav",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*googletagservices.com*",
+    "*adnxs.com*", "*amazon-adsystem.com*", "*criteo.com*", "*taboola.com*", "*outbrain.com*",
+    "*scorecardresearch.com*", "*quantserve.com*", "*chartbeat.com*", "*hotjar.com*",
+    "*connect.facebook.net*", "*segment.io*", "*newrelic.com*", "*nr-data.net*",
+]
+
+# Dropped from the readability output before its text is read
+NON_TEXT_TAGS = ("script", "style", "noscript", "svg")
+
+# Chrome content settings: 2 = block
+TEXT_ONLY_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+}
+
 def _clean_text(text: str) -> str:
         text = re.sub(r"\n{3,}", "\n\n", text)
         return text.strip()
 
-def extract_main_text_trafilatura(url: str) -> str | None:
-    downloaded = trafilatura.fetch_url(url)
-    if not downloaded:
-        return None
+def _download(url: str, headers: dict) -> tuple:
+    """GET url; returns (status, UTF-8 html bytes or None, response headers)."""
+    resp = fetch(url, headers=headers)
+    return resp["status"], resp["body"] or None, resp["headers"]
+
+
+def _extract(html: bytes) -> str | None:
     text = trafilatura.extract(
-        downloaded,
+        html,
         include_comments=False,
         include_tables=False,
         favor_recall=True,  # better at not missing content
     )
-    
     return _clean_text(text or "") or None
 
+
+def extract_main_text_trafilatura(url: str) -> str | None:
+    """
+    Download url and extract its main text, going through the page cache:
+    a fresh entry skips the network and the extraction, a stale one is
+    revalidated with ETag/Last-Modified and reused on 304 (or when the
+    server cannot be reached).
+    """
+    cache = get_page_cache()
+    entry = cache.get(url)
+    if entry is not None and entry["fresh"]:
+        cache.record("hits")
+        return entry["text"] or None
+
+    try:
+        status, downloaded, headers = _download(url, conditional_headers(entry))
+    except requests.RequestException:
+        if entry is None:
+            return None
+        status, downloaded, headers = None, None, {}
+    if entry is not None and (status == 304 or status is None):
+        cache.record("revalidated")
+        if status == 304:
+            cache.touch(url)
+        return entry["text"] or None
+
+    cache.record("misses")
+    if not downloaded:
+        return None
+    text = _extract(downloaded)
+    # a bot-check interstitial is not the page; caching it would serve it again
+    if "no-store" not in headers.get("Cache-Control", "") and not (text and looks_like_bot_check(text)):
+        cache.set(url, downloaded, text, headers.get("ETag"), headers.get("Last-Modified"))
+    return text
+
 def looks_like_bot_check(text: str) -> bool:
     needles = [
         "checking your browser", 
@@ -51,8 +122,7 @@ def looks_like_bot_check(text: str) -> bool:
     return any(n in t for n in needles)
 
 
-def extract_main_text_selenium(url: str, headless: bool = True, wait: float = 2.0) -> str | None:
-    service = Service()
+def _chrome_options(headless: bool = True, text_only: bool = True) -> webdriver.ChromeOptions:
     options = webdriver.ChromeOptions()
     if headless:
         options.add_argument("--headless=new")
@@ -66,63 +136,214 @@ def extract_main_text_selenium(url: str, headless: bool = True, wait: float = 2.
     options.add_argument("--no-sandbox")
     options.add_argument("--window-size=1280,1024")
     options.add_argument("--disable-dev-shm-usage")
-    driver = webdriver.Chrome(service=service, options=options)
+
+    if text_only:
+        # Hand the page over at DOMContentLoaded; subresources are not waited for
+        options.page_load_strategy = "eager"
+        options.add_experimental_option("prefs", TEXT_ONLY_PREFS)
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+    return options
+
+
+def _configure_driver(driver, text_only: bool = True, time_budget: float = PAGE_TIME_BUDGET):
+    driver.set_page_load_timeout(time_budget)
+    if text_only and hasattr(driver, "execute_cdp_cmd"):
+        # Prefs cover images; fonts, media and trackers are cut at the network layer
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+def _new_driver(headless: bool = True, text_only: bool = True):
+    driver = webdriver.Chrome(service=Service(), options=_chrome_options(headless, text_only))
+    return _configure_driver(driver, text_only)
+
+
+_pools: dict = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(headless: bool = True, text_only: bool = True) -> DriverPool:
+    """Process-wide pool of warm Chrome instances (one pool per headless/text_only setting)."""
+    key = (headless, text_only)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = DriverPool(lambda: _new_driver(headless, text_only))
+        return _pools[key]
+
+
+def shutdown_driver_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(shutdown_driver_pools)
+
+
+def _wait_until(driver, timeout: float, condition) -> bool:
+    """WebDriverWait that reports a timeout instead of raising it."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+        return True
+    except TimeoutException:
+        return False
+
+
+def _gone(element) -> bool:
+    # A consent banner is done once its button is hidden or detached from the page
+    try:
+        return not element.is_displayed()
+    except StaleElementReferenceException:
+        return True
+
+
+def _height_settled(driver, timeout: float) -> bool:
+    # Lazy-loaded content is in once the page height stops changing between polls
+    last = [None]
+
+    def settled(d):
+        height = d.execute_script("return document.body.scrollHeight")
+        same = height == last[0]
+        last[0] = height
+        return same
+
+    return _wait_until(driver, timeout, settled)
+
+
+def _render_html(driver, url: str, wait: float = 2.0, time_budget: float = PAGE_TIME_BUDGET) -> str:
+    """
+    Load url, settle it and return the page source, all within time_budget seconds.
+    When the budget runs out the page is stopped and whatever has rendered is used.
+    """
+    deadline = time.monotonic() + time_budget
+
+    def left(cap: float) -> float:
+        return max(0.0, min(cap, deadline - time.monotonic()))
 
     try:
         driver.get(url)
-        
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-        time.sleep(1)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight*2/3);")
-        time.sleep(1)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        
-        # Try clicking a cookie/consent button
-        for xp in COOKIE_XPATHS:
-            try:
-                btn = driver.find_element(By.XPATH, xp)
-                btn.click()
-                time.sleep(1.0)
-                break
-            except Exception:
-                continue
-
-        # Page source after consent
-        html = driver.page_source
-
-        # Use readability to isolate the article body
-        doc = Document(html)
-        main_html = doc.summary(html_partial=True)
-        soup = BeautifulSoup(main_html, "html.parser")
-
-        for tag in soup(["script", "style", "noscript", "svg"]):
-            tag.decompose()
-
-        text = soup.get_text(separator="\n")
-        return _clean_text(text) or None
-    finally:
-        driver.quit()
+    except TimeoutException:
+        driver.execute_script("window.stop();")
+
+    _wait_until(driver, left(15), EC.presence_of_element_located((By.TAG_NAME, "body")))
+    _wait_until(driver, left(wait), lambda d: d.execute_script("return document.readyState") != "loading")
+
+    for fraction in ("1/3", "2/3", "1"):
+        if not left(wait):
+            break
+        driver.execute_script(f"window.scrollTo(0, document.body.scrollHeight*{fraction});")
+        _height_settled(driver, left(wait))
+    
+    # Try clicking a cookie/consent button
+    for xp in COOKIE_XPATHS:
+        if not left(wait):
+            break
+        try:
+            btn = driver.find_element(By.XPATH, xp)
+            btn.click()
+        except Exception:
+            continue
+        _wait_until(driver, left(wait), lambda d: _gone(btn))
+        break
+
+    # Page source after consent
+    return driver.page_source
+
+
+def extract_main_text_selenium(
+    url: str,
+    headless: bool = True,
+    wait: float = 2.0,
+    text_only: bool = True,
+    time_budget: float = PAGE_TIME_BUDGET,
+) -> str | None:
+    """
+    Render url in a pooled Chrome and pull out the article text.
+    wait bounds each settle step (load, every scroll, cookie banner); steps
+    finish as soon as their condition holds, and the whole page gets at most
+    time_budget seconds. The text-only profile skips images, media, fonts and
+    trackers, and starts settling at DOMContentLoaded instead of the load event.
+    """
+    with get_driver_pool(headless, text_only).driver() as driver:
+        html = _render_html(driver, url, wait, time_budget)
+
+    # Use readability to isolate the article body
+    return _readable_text(html)
+
+
+def _tree_text(root) -> str:
+    """
+    Text of an lxml tree, one line per text node (the same output as
+    BeautifulSoup's get_text(separator="\n") on its serialized HTML).
+    """
+    for el in list(root.iter(*NON_TEXT_TAGS)):
+        # empty the element but keep its tail, which is text of the parent
+        el.text = None
+        del el[:]
+    return "\n".join(root.itertext())
+
+
+def _readable_text(html: str) -> str | None:
+    # summary() leaves the cleaned article tree on doc.html, so the text is read
+    # from that tree instead of parsing the returned HTML string a second time
+    doc = Document(html)
+    doc.summary(html_partial=True)
+    return _clean_text(_tree_text(doc.html)) or None
+
+
+BLOCKED_MESSAGE = "Sorry — this site is blocking automated access, text could not be extracted. Try uploading a PDF of the article, or paste text."
 
 
 def extract_main_text(url: str) -> str:
     """
     High-level function: try fast (trafilatura), fallback to Selenium (+readability) for cookie/JS pages.
     Returns main article text or a friendly message.
+    Hosts with a registered site extractor (arXiv, PubMed/PMC, Springer/BMC) are
+    read from their structured sources first. Otherwise the per-domain strategy
+    memory can skip the fast path on domains where it keeps failing, or answer
+    straight away for domains known to block.
     """
-    # Fast path
-    text = extract_main_text_trafilatura(url)
+    text = extract_site_text(url)
     if text:
-        print("fast")
         return text
 
+    memory = get_domain_memory()
+    domain = domain_of(url)
+    route = memory.route(domain)
+    if route == BLOCKED:
+        return BLOCKED_MESSAGE
+
+    # Fast path
+    if route == FAST:
+        start = time.monotonic()
+        text = extract_main_text_trafilatura(url)
+        if not text:
+            outcome = "fail"
+        elif looks_like_bot_check(text):
+            outcome = "blocked"  # an interstitial, not the article: let the browser try
+        else:
+            outcome = "ok"
+        memory.record(domain, FAST, outcome, time.monotonic() - start)
+        if outcome == "ok":
+            print("fast")
+            return text
+
     # Fallback
+    start = time.monotonic()
     text = extract_main_text_selenium(url)
-    if not text or looks_like_bot_check(text):
-        return "Sorry — this site is blocking automated access, text could not be extracted. Try uploading a PDF of the article, or paste text."
+    if not text:
+        outcome = "fail"
+    elif looks_like_bot_check(text):
+        outcome = "blocked"
     else:
-        return text
\ No newline at end of file
+        outcome = "ok"
+    memory.record(domain, BROWSER, outcome, time.monotonic() - start)
+    if outcome != "ok":
+        return BLOCKED_MESSAGE
+    else:
+        return text
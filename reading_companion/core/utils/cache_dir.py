@@ -0,0 +1,12 @@
+import os
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Directory for on-disk caches. Override with RC_CACHE_DIR
+    (tests point it at a temp dir so runs never share state).
+    """
+    path = Path(os.getenv("RC_CACHE_DIR") or Path.home() / ".cache" / "reading_companion")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
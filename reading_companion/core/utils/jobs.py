@@ -0,0 +1,143 @@
+"""
+Background jobs that outlive a Streamlit rerun.
+
+A widget interaction stops the running script, and with it any work done
+inside the script thread. Jobs run instead on one process-wide executor:
+the script submits a job, keeps its id in st.session_state and, on every
+rerun, reads a snapshot of its progress, partial parts and final result.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+JOB_WORKERS = 2            # documents processed at the same time across all sessions
+JOB_TTL_SECONDS = 3600     # finished jobs are forgotten after this long
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    """Progress of one job; the job function reports through it from the worker thread."""
+
+    def __init__(self, job_id: str, key: Optional[str] = None):
+        self.id = job_id
+        self.key = key
+        self.status = QUEUED
+        self.total: Optional[int] = None
+        self.parts: List[str] = []
+        self.partial = ""
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def set_total(self, total: int) -> None:
+        with self._lock:
+            self.total = total
+
+    def add_part(self, part: str) -> None:
+        with self._lock:
+            self.parts.append(part)
+
+    def set_partial(self, text: str) -> None:
+        # running text of a job that is not split into parts
+        with self._lock:
+            self.partial = text
+
+    def _start(self) -> None:
+        with self._lock:
+            self.status = RUNNING
+
+    def _finish(self, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+
+    def snapshot(self) -> dict:
+        """Consistent copy of the job's state, safe to read from the script thread."""
+        with self._lock:
+            done = len(self.parts)
+            return {
+                "id": self.id,
+                "status": self.status,
+                "total": self.total,
+                "completed": done,
+                "progress": (done / self.total) if self.total else (1.0 if self.status == DONE else 0.0),
+                "parts": list(self.parts),
+                "partial": self.partial,
+                "result": self.result,
+                "error": self.error,
+                "elapsed": (self.finished_at or time.time()) - self.created_at,
+            }
+
+
+class JobRunner:
+    """
+    Runs fn(job, *args, **kwargs) on a shared executor. Submitting the same key
+    while that job is queued, running or finished returns the existing job id,
+    so a rerun never starts a document twice.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, ttl_seconds: float = JOB_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args, key: Optional[str] = None, **kwargs) -> str:
+        with self._lock:
+            self._prune()
+            if key is not None and key in self._by_key:
+                existing = self._jobs[self._by_key[key]]
+                if existing.status != FAILED:
+                    return existing.id
+            job = Job(uuid.uuid4().hex, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[key] = job.id
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    @staticmethod
+    def _run(job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        job._start()
+        try:
+            job._finish(DONE, result=fn(job, *args, **kwargs))
+        except Exception as e:
+            job._finish(FAILED, error=str(e) or type(e).__name__)
+
+    def get(self, job_id: Optional[str]) -> Optional[dict]:
+        """Snapshot of the job, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id) if job_id else None
+        return job.snapshot() if job else None
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[job_id]
+                if job.key is not None and self._by_key.get(job.key) == job_id:
+                    del self._by_key[job.key]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Process-wide runner shared by every session."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -0,0 +1,85 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, MutableMapping, Optional
+
+MEMO_MAX_ENTRIES = 512  # process-wide results kept (least recently used dropped first)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class ResultMemo:
+    """
+    Two-level memo for NLP results shown in the app.
+
+    Results are keyed by (task, section, sha256(source text)). The first level is a
+    per-session mapping (a dict kept in st.session_state), so reruns of the same
+    session never leave the session. The second level is this process-wide LRU,
+    shared by every session, so e.g. the built-in example is only processed once.
+    """
+
+    def __init__(self, max_entries: int = MEMO_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.session_hits = 0
+        self.process_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(task: str, section: str, text: str) -> str:
+        return f"{task}:{section}:{text_hash(text)}"
+
+    def lookup(self, session: MutableMapping, task: str, section: str, text: str) -> Optional[Any]:
+        key = self.key(task, section, text)
+        with self._lock:
+            if key in session:
+                self.session_hits += 1
+                return session[key]
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.process_hits += 1
+                session[key] = self._entries[key]
+                return session[key]
+            self.misses += 1
+            return None
+
+    def store(self, session: MutableMapping, task: str, section: str, text: str, value: Any) -> None:
+        # Error strings from the NLP helpers are shown once but never memoised
+        if value is None or (isinstance(value, str) and value.startswith("⚠️ Error")):
+            return
+        key = self.key(task, section, text)
+        with self._lock:
+            session[key] = value
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self, session: MutableMapping, task: str, section: str, text: str, compute: Callable[[str], Any]
+    ) -> Any:
+        value = self.lookup(session, task, section, text)
+        if value is None:
+            value = compute(text)
+            self.store(session, task, section, text, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "session_hits": self.session_hits,
+                "process_hits": self.process_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+
+_memo = ResultMemo()
+
+
+def get_result_memo() -> ResultMemo:
+    """Process-wide memo shared by every Streamlit session."""
+    return _memo
@@ -0,0 +1,65 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from reading_companion.core.ingestion.pdf import PageSelection, PdfBuffer, iter_pdf_pages
+
+PDF_TEXT_CACHE_MAX_CHARS = 20_000_000  # total extracted text kept in memory across sessions
+
+
+def extract_pdf_text(data: PdfBuffer, pages: PageSelection = None) -> str:
+    """Extract the text of the selected pages (all by default), joined once at the end."""
+    return "".join(iter_pdf_pages(data, pages=pages))
+
+
+class PdfTextCache:
+    """
+    Process-wide LRU of extracted PDF text keyed by sha256 of the file bytes,
+    capped by the total number of cached characters.
+    """
+
+    def __init__(self, max_chars: int = PDF_TEXT_CACHE_MAX_CHARS):
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_extract(self, data: PdfBuffer, pages: PageSelection = None) -> str:
+        key = hashlib.sha256(data).hexdigest()
+        if pages is not None:
+            key += f":{pages if isinstance(pages, str) else sorted(pages)}"
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        text = extract_pdf_text(data, pages)
+
+        with self._lock:
+            if key not in self._entries and len(text) <= self.max_chars:
+                self._entries[key] = text
+                self._chars += len(text)
+                while self._chars > self.max_chars:
+                    _, old = self._entries.popitem(last=False)
+                    self._chars -= len(old)
+        return text
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "chars": self._chars}
+
+
+_cache = PdfTextCache()
+
+
+def cached_pdf_text(data: PdfBuffer, pages: PageSelection = None) -> str:
+    """Text of an uploaded PDF, extracted at most once per distinct file and page selection in this process."""
+    return _cache.get_or_extract(data, pages)
+
+
+def get_pdf_text_cache() -> PdfTextCache:
+    return _cache
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep every on-disk cache inside the test's temp dir."""
+    monkeypatch.setenv("RC_CACHE_DIR", str(tmp_path / "cache"))
@@ -0,0 +1,178 @@
+import asyncio
+import time
+import types
+
+import pytest
+
+import reading_companion.core.nlp.llm_chunking as lc
+from reading_companion.core.nlp import hedging as h
+from reading_companion.core.nlp import openai_client as oc
+from reading_companion.core.nlp.explain_terms import explain_terms_async
+from reading_companion.core.nlp.llm_cache import AsyncCachedClient, get_response_cache
+from reading_companion.core.nlp.question_gen import question_answers_async, question_gen_async
+from reading_companion.core.nlp.simplify import simplify_text_async
+
+
+def response(content):
+    choice = types.SimpleNamespace(message=types.SimpleNamespace(content=content), finish_reason="stop")
+    return types.SimpleNamespace(choices=[choice])
+
+
+class FakeAsyncCompletions:
+    def __init__(self, delay=0.0, reply=lambda kwargs: "DUMMY"):
+        self.delay, self.reply, self.calls, self.in_flight, self.max_in_flight = delay, reply, [], 0, 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return response(self.reply(kwargs))
+        finally:
+            self.in_flight -= 1
+
+
+def fake_client(completions):
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+
+
+@pytest.fixture
+def fake_async(monkeypatch):
+    completions = FakeAsyncCompletions()
+    oc.set_async_client(fake_client(completions))
+    yield completions
+    oc.set_async_client(None)
+
+
+def test_async_client_is_cached_per_loop_with_pool_limits():
+    async def two():
+        return oc.get_async_client(), oc.get_async_client()
+
+    a, b = asyncio.run(two())
+    c, _ = asyncio.run(two())
+    assert a is b and a is not c
+
+    http = a._client._client._client  # cache -> scheduler -> AsyncOpenAI -> httpx
+    pool = http._transport._pool
+    assert pool._max_connections == oc.ASYNC_MAX_CONNECTIONS
+    assert pool._max_keepalive_connections == oc.ASYNC_MAX_KEEPALIVE
+    assert pool._keepalive_expiry == oc.ASYNC_KEEPALIVE_EXPIRY
+    assert a._client._client.max_retries == 0  # the scheduler retries
+
+
+def test_async_helpers_share_prompts_and_budgets(fake_async):
+    async def run_all():
+        return await asyncio.gather(
+            simplify_text_async("text"), explain_terms_async("text"),
+            question_gen_async("text"), question_answers_async("Q1?"),
+        )
+
+    assert asyncio.run(run_all()) == ["DUMMY"] * 4
+    prompts = [c["messages"][1]["content"] for c in fake_async.calls]
+    assert "Simplify the following text" in prompts[0]
+    assert "Pick out all the scientific words" in prompts[1]
+    assert "Generate 3 comprehension questions" in prompts[2]
+    assert all(c["max_completion_tokens"] > 0 for c in fake_async.calls)
+
+
+def test_async_helpers_turn_errors_into_messages():
+    class Boom:
+        async def create(self, **kwargs):
+            raise RuntimeError("API down")
+    oc.set_async_client(fake_client(Boom()))
+    try:
+        assert asyncio.run(simplify_text_async("x")) == "⚠️ Error: API down"
+    finally:
+        oc.set_async_client(None)
+
+
+def test_async_pipeline_runs_chunks_and_documents_concurrently(monkeypatch):
+    completions = FakeAsyncCompletions(delay=0.1, reply=lambda k: "S:" + k["messages"][1]["content"][-6:])
+    oc.set_async_client(fake_client(completions))
+    monkeypatch.setattr(lc, "chunk_by_tokens_with_sentence_bounds",
+                        lambda text, **kw: [f"{text}-c{i}" for i in range(4)])
+    monkeypatch.setattr(lc, "token_count", lambda text, model=None: 1)
+    try:
+        async def three_documents():
+            return await asyncio.gather(*(lc.simplify_long_text_with_summary_async(d) for d in ("doc1", "doc2", "doc3")))
+
+        start = time.monotonic()
+        results = asyncio.run(three_documents())
+        elapsed = time.monotonic() - start
+    finally:
+        oc.set_async_client(None)
+
+    # 12 chunk calls then 3 summaries, in two rounds rather than fifteen
+    assert elapsed < 0.6
+    assert completions.max_in_flight == 12
+    overall, combined, parts = results[1]
+    assert parts == [f"## Part {i + 1}\nS:oc2-c{i}" for i in range(4)]
+    assert combined == "\n\n".join(parts)
+    assert overall.startswith("S:")
+
+
+def test_async_cache_shares_entries_with_sync_calls():
+    completions = FakeAsyncCompletions()
+    client = AsyncCachedClient(fake_client(completions))
+
+    async def twice():
+        kwargs = dict(model="m", messages=[{"role": "user", "content": "hi"}])
+        first = await client.chat.completions.create(**kwargs)
+        second = await client.chat.completions.create(**kwargs)
+        return first, second
+
+    first, second = asyncio.run(twice())
+    assert len(completions.calls) == 1
+    assert second.choices[0].message.content == "DUMMY" and getattr(second, "cached", False)
+    assert get_response_cache().stats()["hits"] == 1
+
+
+def test_async_hedge_cancels_the_slower_request():
+    started, cancelled = [], []
+
+    async def make():
+        started.append(1)
+        try:
+            await asyncio.sleep(1.0 if len(started) == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return len(started)
+
+    tracker = h.LatencyTracker()
+    result = asyncio.run(h.ahedged_call(make, tracker, hedge_after=0.05, deadline=2))
+    assert result == 2 and cancelled == [1]
+    assert tracker.stats()["hedge_wins"] == 1
+
+
+def test_async_pipeline_uses_checkpoints(monkeypatch):
+    completions = FakeAsyncCompletions(reply=lambda k: "simple")
+    oc.set_async_client(fake_client(completions))
+    monkeypatch.setattr(lc, "chunk_by_tokens_with_sentence_bounds", lambda text, **kw: ["a", "b"])
+    monkeypatch.setattr(lc, "token_count", lambda text, model=None: 1)
+    try:
+        first = asyncio.run(lc.simplify_long_text_with_summary_async("doc"))
+        sent = len(completions.calls)
+        second = asyncio.run(lc.simplify_long_text_with_summary_async("doc"))
+    finally:
+        oc.set_async_client(None)
+    assert sent == 3 and len(completions.calls) == 3  # two chunks and a summary, once
+    assert first == second
+
+
+def test_async_reduce_matches_the_sync_tree(monkeypatch):
+    def fake_summary(text, target_words=500):
+        if "## Part" not in text:
+            return f"overall({text}, {target_words})"
+        return "⚠️ Error: down" if "## Part 1" in text else "batch ok"
+    async def fake_summary_async(text, target_words=500):
+        return fake_summary(text, target_words)
+    monkeypatch.setattr(lc, "simplify_text", fake_summary)
+    monkeypatch.setattr(lc, "simplify_text_async", fake_summary_async)
+    monkeypatch.setattr(lc, "token_count", lambda text, model=None: len(text.split()))
+    parts = [f"## Part {i}\n" + ("word " * 40) for i in range(1, 5)]
+    kw = dict(target_words=200, batch_tokens=100, fan_in=2)
+
+    sync = lc.reduce_summary(parts, **kw)
+    assert asyncio.run(lc.reduce_summary_async(parts, **kw)) == sync == "overall(batch ok, 200)"
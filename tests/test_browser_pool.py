@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+from reading_companion.core.scraping.browser_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.alive = True
+        self.quit_called = False
+        self.urls = []
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _pool(**kwargs):
+    created = []
+    def factory():
+        drv = FakeDriver(len(created))
+        created.append(drv)
+        return drv
+    return DriverPool(factory, **kwargs), created
+
+
+def test_reuses_and_resets_driver():
+    pool, created = _pool(max_size=2)
+    with pool.driver() as d1:
+        d1.get("http://a")
+    with pool.driver() as d2:
+        pass
+    assert d1 is d2 and len(created) == 1
+    assert d1.urls[-1] == "about:blank"
+    assert pool.stats()["reused"] == 1
+
+
+def test_recycles_after_max_pages():
+    pool, created = _pool(max_pages=2)
+    for _ in range(3):
+        with pool.driver():
+            pass
+    assert len(created) == 2
+    assert created[0].quit_called is True
+
+
+def test_unhealthy_and_failed_drivers_are_replaced():
+    pool, created = _pool()
+    with pool.driver():
+        pass
+    created[0].alive = False      # dies while idle
+    with pool.driver() as d:
+        assert d is created[1]
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("page blew up")
+    assert created[1].quit_called is True
+    assert pool.stats()["live"] == 0
+
+
+def test_pool_is_bounded():
+    pool, created = _pool(max_size=1, acquire_timeout=0.05)
+    with pool.driver():
+        with pytest.raises(TimeoutError):
+            with pool.driver():
+                pass
+    released = threading.Event()
+    def worker():
+        with pool.driver():
+            released.set()
+    with pool.driver():
+        pool.acquire_timeout = 5
+        t = threading.Thread(target=worker)
+        t.start()
+    t.join(timeout=5)
+    assert released.is_set() and len(created) == 1
+
+
+def test_driver_released_after_close_is_quit():
+    pool, created = _pool()
+    with pool.driver():
+        pass
+    with pool.driver() as busy:
+        pool.close()
+        assert created[0].quit_called is False  # still in use
+    assert busy.quit_called is True
+    assert pool.stats() == {"live": 0, "idle": 0, "created": 1, "reused": 1, "recycled": 1}
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            pass
+
+
+def test_slow_quit_does_not_block_other_threads():
+    pool, created = _pool(max_size=1)
+    quitting, done = threading.Event(), threading.Event()
+    def slow_quit():
+        quitting.set()
+        done.wait(5)
+    def worker():
+        try:
+            with pool.driver() as drv:
+                drv.quit = slow_quit
+                raise ValueError("page blew up")  # the driver is dropped
+        except ValueError:
+            pass
+    t = threading.Thread(target=worker)
+    t.start()
+    assert quitting.wait(5)
+    start = time.monotonic()
+    with pool.driver() as other:  # the slot is free while the old browser is still quitting
+        assert other is created[1]
+    assert time.monotonic() - start < 1
+    done.set()
+    t.join(5)
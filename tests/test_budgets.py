@@ -0,0 +1,94 @@
+import types
+
+import pytest
+
+import reading_companion.core.nlp.budgets as b
+import reading_companion.core.nlp.explain_terms as et_mod
+import reading_companion.core.nlp.llm_chunking as lc
+import reading_companion.core.nlp.question_gen as qg_mod
+import reading_companion.core.nlp.simplify as sim_mod
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    b.reset_truncation_stats()
+    yield
+    b.reset_truncation_stats()
+
+
+def test_output_budget_scales_and_clamps():
+    floor, share, ceiling = b.OUTPUT_BUDGETS["chunk"]
+    assert b.output_budget("chunk", "", model="plain") == floor
+    mid = "x" * b.CHARS_PER_TOKEN * 1000
+    assert b.output_budget("chunk", mid, model="plain") == max(floor, int(1000 * share))
+    huge = "x" * b.CHARS_PER_TOKEN * 100_000
+    assert b.output_budget("chunk", huge, model="plain") == ceiling
+
+
+def test_output_budget_leaves_room_for_reasoning():
+    assert b.output_budget("questions", "q", model="gpt-5-nano") == (
+        b.output_budget("questions", "q", model="plain") + b.REASONING_HEADROOM
+    )
+
+
+def test_reasoning_models_get_a_low_effort():
+    assert b.completion_args("chunk", "text") == {
+        "max_completion_tokens": b.output_budget("chunk", "text"), "reasoning_effort": b.REASONING_EFFORT,
+    }
+    assert b.completion_args("chunk", "text", model="plain") == {"max_completion_tokens": b.output_budget("chunk", "text", model="plain")}
+
+
+def _client(record, finish_reason="stop", content="OUT"):
+    def create(**kwargs):
+        record.append(kwargs)
+        if kwargs.get("stream"):
+            return iter([
+                types.SimpleNamespace(choices=[types.SimpleNamespace(
+                    delta=types.SimpleNamespace(content=content), finish_reason=None)]),
+                types.SimpleNamespace(choices=[types.SimpleNamespace(
+                    delta=types.SimpleNamespace(content=None), finish_reason=finish_reason)]),
+            ])
+        choice = types.SimpleNamespace(message=types.SimpleNamespace(content=content), finish_reason=finish_reason)
+        return types.SimpleNamespace(choices=[choice])
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+
+
+@pytest.mark.parametrize("module, fn, task", [
+    (sim_mod, "simplify_text", "summary"),
+    (sim_mod, "simplify_text_stream", "summary"),
+    (et_mod, "explain_terms", "terms"),
+    (et_mod, "explain_terms_stream", "terms"),
+    (qg_mod, "question_gen", "questions"),
+    (qg_mod, "question_gen_stream", "questions"),
+    (qg_mod, "question_answers", "answers"),
+    (lc, "simplify_chunk", "chunk"),
+    (lc, "simplify_chunk_stream", "chunk"),
+])
+def test_every_call_passes_its_budget(monkeypatch, module, fn, task):
+    calls = []
+    monkeypatch.setattr(module, "get_client", lambda: _client(calls))
+    out = getattr(module, fn)("Some input text. " * 50)
+    if not isinstance(out, str):
+        out = "".join(out)
+    assert out == "OUT"
+    assert calls[0]["max_completion_tokens"] == b.output_budget(task, "Some input text. " * 50)
+    assert calls[0]["reasoning_effort"] == b.REASONING_EFFORT
+    assert b.truncation_stats() == {}
+
+
+def test_truncated_reply_is_counted_and_ends_with_note(monkeypatch):
+    monkeypatch.setattr(et_mod, "get_client", lambda: _client([], finish_reason="length"))
+    assert et_mod.explain_terms("text") == "OUT" + b.TRUNCATION_NOTE
+    assert b.truncation_stats() == {"terms": 1}
+
+
+def test_empty_reply_is_an_error(monkeypatch):
+    monkeypatch.setattr(et_mod, "get_client", lambda: _client([], finish_reason="length", content=""))
+    assert et_mod.explain_terms("text").startswith("⚠️ Error: the model returned an empty reply")
+    assert b.truncation_stats() == {"terms": 1}
+
+
+def test_truncated_stream_ends_with_note(monkeypatch):
+    monkeypatch.setattr(qg_mod, "get_client", lambda: _client([], finish_reason="length"))
+    assert "".join(qg_mod.question_gen_stream("text")) == "OUT" + b.TRUNCATION_NOTE
+    assert b.truncation_stats() == {"questions": 1}
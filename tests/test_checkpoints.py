@@ -0,0 +1,43 @@
+import time
+
+from reading_companion.core.nlp.checkpoints import CheckpointStore, get_checkpoint_store
+
+
+def test_chunks_are_kept_per_document_and_version(tmp_path):
+    store = CheckpointStore(tmp_path / "c.sqlite3")
+    store.put_chunk("doc", "v1", 0, "zero")
+    store.put_chunk("doc", "v1", 2, "two")
+    store.put_chunk("doc", "v2", 0, "other prompt")
+    store.put_chunk("other", "v1", 0, "other doc")
+
+    assert store.get_chunks("doc", "v1") == {0: "zero", 2: "two"}
+    assert store.get_chunks("doc", "v3") == {}
+    stats = store.stats()
+    assert stats["documents"] == 3 and stats["chunks"] == 4 and stats["hits"] == 2 and stats["saved"] == 4
+
+
+def test_summaries_round_trip_and_survive_reopen(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    store = CheckpointStore(path)
+    assert store.get_summary("parts", "v1") is None
+    store.put_summary("parts", "v1", "overall")
+    store.put_chunk("doc", "v1", 0, "zero")
+
+    reopened = CheckpointStore(path)  # e.g. after a restart
+    assert reopened.get_summary("parts", "v1") == "overall"
+    assert reopened.get_chunks("doc", "v1") == {0: "zero"}
+
+
+def test_expired_checkpoints_are_ignored_and_dropped(tmp_path):
+    store = CheckpointStore(tmp_path / "c.sqlite3", ttl_seconds=0.05)
+    store.put_chunk("doc", "v1", 0, "zero")
+    time.sleep(0.1)
+    assert store.get_chunks("doc", "v1") == {}
+    store.put_summary("parts", "v1", "overall")  # writing a summary prunes old rows
+    assert store.stats()["chunks"] == 0
+
+
+def test_store_is_shared_per_cache_dir():
+    assert get_checkpoint_store() is get_checkpoint_store()
+    get_checkpoint_store().clear()
+    assert get_checkpoint_store().stats()["chunks"] == 0
@@ -52,3 +52,147 @@ def test_simplify_flow_chunked_path():
     assert out["chunked"] is True
     assert out["processed"] == "COMBINED"
     assert out["overall"] == "OVERALL"
+
+def test_simplify_flow_forwards_max_workers():
+    seen = {}
+    def pipeline(s, max_workers=1):
+        seen["max_workers"] = max_workers
+        return ("OVERALL", "COMBINED", [])
+    out = c.simplify_flow(
+        source_text="long",
+        token_count_fn=lambda s: 999999,
+        simplify_fn=lambda s: "SHOULD_NOT_BE_CALLED",
+        chunked_pipeline_fn=pipeline,
+        max_workers=4,
+    )
+    assert out["chunked"] is True
+    assert seen["max_workers"] == 4
+
+def test_simplify_flow_prefers_exceeds_budget_fn():
+    out = c.simplify_flow(
+        source_text="long",
+        token_count_fn=lambda s: (_ for _ in ()).throw(AssertionError("full count not needed")),
+        simplify_fn=lambda s: "SHOULD_NOT_BE_CALLED",
+        chunked_pipeline_fn=lambda s: ("OVERALL", "COMBINED", []),
+        token_budget=3000,
+        exceeds_budget_fn=lambda s, budget: budget == 3000,
+    )
+    assert out["chunked"] is True
+
+def test_stream_simplify_flow_direct_path_yields_deltas():
+    events = list(c.stream_simplify_flow(
+        source_text="short",
+        exceeds_budget_fn=lambda s, budget: False,
+        simplify_stream_fn=lambda s: iter(["SIMP", "LIFIED"]),
+        parts_stream_fn=lambda s: iter(["SHOULD_NOT_BE_CALLED"]),
+        reduce_fn=lambda parts: "SHOULD_NOT_BE_CALLED",
+    ))
+    assert events[:2] == [("delta", "SIMP"), ("delta", "LIFIED")]
+    kind, result = events[-1]
+    assert kind == "done"
+    assert result == {"processed": "SIMPLIFIED", "simplified": "SIMPLIFIED", "overall": None, "chunked": False, "parts": []}
+
+def test_stream_simplify_flow_chunked_path_yields_parts_then_overall():
+    seen = {}
+    def reduce_fn(parts):
+        seen["parts"] = parts
+        return "OVERALL"
+    events = list(c.stream_simplify_flow(
+        source_text="long",
+        exceeds_budget_fn=lambda s, budget: True,
+        simplify_stream_fn=lambda s: iter(["SHOULD_NOT_BE_CALLED"]),
+        parts_stream_fn=lambda s, max_workers=1: iter(["## Part 1\nA", "## Part 2\nB"]),
+        reduce_fn=reduce_fn,
+        max_workers=2,
+    ))
+    assert [k for k, _ in events] == ["part", "part", "overall", "done"]
+    assert seen["parts"] == ["## Part 1\nA", "## Part 2\nB"]
+    result = events[-1][1]
+    assert result["chunked"] is True
+    assert result["processed"] == "## Part 1\nA\n\n## Part 2\nB"
+    assert result["overall"] == "OVERALL"
+
+def test_decide_source_documents_keeps_order_with_pool():
+    import time
+
+    def fetch(u):
+        time.sleep(0.05 if u == "http://a" else 0.0)  # first URL finishes last
+        return f"TEXT({u})"
+
+    docs, warn = c.decide_source_documents(
+        user_input="http://a http://b http://c",
+        uploaded_file_used=False,
+        url_extractor=lambda s: ["http://a", "http://b", "http://c"],
+        fetch_from_url=fetch,
+        max_workers=3,
+    )
+    assert warn is None
+    assert docs == [("http://a", "TEXT(http://a)"), ("http://b", "TEXT(http://b)"), ("http://c", "TEXT(http://c)")]
+
+def test_fetch_url_documents_drops_failures_and_slow_urls():
+    import threading
+    release = threading.Event()
+
+    def fetch(u):
+        if u == "http://slow":
+            release.wait(5)
+            return "TOO LATE"
+        if u == "http://boom":
+            raise RuntimeError("boom")
+        return f"TEXT({u})"
+
+    try:
+        docs = c.fetch_url_documents(
+            ["http://slow", "http://boom", "http://ok"], fetch, max_workers=3, url_timeout=0.1, deadline=5
+        )
+    finally:
+        release.set()
+    assert docs == [("http://ok", "TEXT(http://ok)")]
+
+def test_fetch_url_documents_total_deadline():
+    import threading
+    release = threading.Event()
+    docs = c.fetch_url_documents(
+        ["http://a", "http://b"], lambda u: release.wait(5) and u, max_workers=2, url_timeout=10, deadline=0.1
+    )
+    release.set()
+    assert docs == []
+
+def test_url_extractor_is_cached():
+    assert c.get_url_extractor() is c.get_url_extractor()
+
+
+def test_simplify_job_reports_total_and_parts():
+    from reading_companion.core.utils.jobs import Job
+
+    def parts(text, on_chunks=None, max_workers=None):
+        on_chunks(2)
+        yield "## Part 1\na"
+        yield "## Part 2\nb"
+
+    job = Job("j1")
+    result = c.simplify_job(
+        job, "long text",
+        exceeds_budget_fn=lambda t, b: True,
+        simplify_stream_fn=lambda t: iter(()),
+        parts_stream_fn=parts,
+        reduce_fn=lambda ps: "overall",
+        max_workers=2,
+    )
+    snap = job.snapshot()
+    assert snap["total"] == 2 and snap["completed"] == 2 and snap["progress"] == 1.0
+    assert result["chunked"] and result["overall"] == "overall" and result["parts"] == snap["parts"]
+
+
+def test_simplify_job_direct_path_keeps_running_text():
+    from reading_companion.core.utils.jobs import Job
+
+    job = Job("j2")
+    result = c.simplify_job(
+        job, "short",
+        exceeds_budget_fn=lambda t, b: False,
+        simplify_stream_fn=lambda t: iter(["Hel", "lo"]),
+        parts_stream_fn=None,
+        reduce_fn=None,
+    )
+    assert job.snapshot()["partial"] == "Hello" and result["simplified"] == "Hello"
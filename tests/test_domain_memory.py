@@ -0,0 +1,77 @@
+import reading_companion.core.scraping.text_from_url as tfu
+from reading_companion.core.scraping.domain_memory import (
+    BLOCKED, BROWSER, FAST, DomainMemory, domain_of, get_domain_memory,
+)
+
+
+def test_domain_of_strips_www():
+    assert domain_of("https://WWW.Example.com/a?b") == "example.com"
+    assert domain_of("http://news.example.com") == "news.example.com"
+
+
+def test_route_defaults_to_fast(tmp_path):
+    mem = DomainMemory(tmp_path / "d.sqlite3")
+    assert mem.route("example.com") == FAST
+    mem.record("example.com", FAST, "fail", 1.0)
+    assert mem.route("example.com") == FAST  # one failure is not enough evidence
+
+
+def test_route_skips_failing_fast_path_and_counts_savings(tmp_path):
+    mem = DomainMemory(tmp_path / "d.sqlite3")
+    for _ in range(2):
+        mem.record("spa.com", FAST, "fail", 2.0)
+        mem.record("spa.com", BROWSER, "ok", 5.0)
+    assert mem.route("spa.com") == BROWSER
+    stats = mem.stats()
+    assert stats["skipped_fast"] == 1 and stats["hit_rate"] == 1.0
+    assert stats["seconds_saved"] == 2.0
+
+
+def test_route_fails_fast_on_blocking_domain(tmp_path):
+    mem = DomainMemory(tmp_path / "d.sqlite3")
+    for _ in range(2):
+        mem.record("walled.com", FAST, "fail", 1.0)
+        mem.record("walled.com", BROWSER, "blocked", 9.0)
+    assert mem.route("walled.com") == BLOCKED
+    assert mem.stats()["failed_fast"] == 1
+
+
+def test_scores_decay_so_domains_are_retried(tmp_path):
+    mem = DomainMemory(tmp_path / "d.sqlite3", half_life=1e-3)
+    for _ in range(3):
+        mem.record("flaky.com", FAST, "fail", 1.0)
+    import time
+    time.sleep(0.02)
+    assert mem.route("flaky.com") == FAST
+
+
+def test_memory_persists_across_instances(tmp_path):
+    path = tmp_path / "d.sqlite3"
+    mem = DomainMemory(path)
+    for _ in range(2):
+        mem.record("spa.com", FAST, "fail", 1.0)
+    assert DomainMemory(path).route("spa.com") == BROWSER
+
+
+def test_extract_main_text_learns_routes(monkeypatch):
+    calls = {"fast": 0, "browser": 0}
+
+    def fast(url):
+        calls["fast"] += 1
+        return None
+
+    def browser(url):
+        calls["browser"] += 1
+        return "Just a moment... checking your browser"
+
+    monkeypatch.setattr(tfu, "extract_main_text_trafilatura", fast)
+    monkeypatch.setattr(tfu, "extract_main_text_selenium", browser)
+
+    for _ in range(2):
+        assert tfu.extract_main_text("https://walled.com/a") == tfu.BLOCKED_MESSAGE
+    assert calls == {"fast": 2, "browser": 2}
+
+    # known to block: answered without trying either extractor
+    assert tfu.extract_main_text("https://www.walled.com/b") == tfu.BLOCKED_MESSAGE
+    assert calls == {"fast": 2, "browser": 2}
+    assert get_domain_memory().stats()["failed_fast"] == 1
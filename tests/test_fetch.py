@@ -0,0 +1,96 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from reading_companion.core.scraping import fetch as f
+
+LATIN1_PAGE = '<html><head><meta charset="iso-8859-1"></head><body><p>Café crème</p></body></html>'.encode("latin-1")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    peers = set()
+
+    def do_GET(self):
+        Handler.peers.add(self.client_address)
+        if self.path == "/gzip":
+            body = gzip.compress(b"<html><body><p>" + b"compressed " * 1000 + b"</p></body></html>")
+            return self._send(body, "text/html; charset=utf-8", {"Content-Encoding": "gzip"})
+        if self.path == "/latin1":
+            return self._send(LATIN1_PAGE, "text/html")
+        if self.path == "/huge":
+            return self._send(b"<p>" + b"x" * 500_000 + b"</p>", "text/html")
+        if self.path == "/slow":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            for _ in range(10):
+                self.wfile.write(b"<p>drip</p>"[:10])
+                self.wfile.flush()
+                time.sleep(0.1)
+            return
+        if self.path == "/pdf":
+            return self._send(b"%PDF-1.7", "application/pdf")
+        self._send(b"missing", "text/plain", status=404)
+
+    def _send(self, body, content_type, extra=None, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (extra or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    f.close_session()
+
+
+def test_fetch_decompresses_and_reuses_connections(server):
+    Handler.peers.clear()
+    for _ in range(3):
+        resp = f.fetch(server + "/gzip")
+        assert resp["status"] == 200
+        assert resp["body"].count(b"compressed") == 1000
+    assert len(Handler.peers) == 1  # one keep-alive connection served all three
+
+
+def test_fetch_detects_charset_and_returns_utf8(server):
+    resp = f.fetch(server + "/latin1")
+    assert resp["encoding"] == "iso8859-1"
+    assert "Café crème" in resp["body"].decode("utf-8")
+
+
+def test_fetch_caps_body_size(server):
+    resp = f.fetch(server + "/huge", max_bytes=100_000)
+    assert resp["truncated"] is True
+    assert len(resp["body"]) == 100_000
+
+
+def test_fetch_deadline(server):
+    with pytest.raises(f.FetchDeadlineExceeded):
+        f.fetch(server + "/slow", deadline=0.2)
+
+
+def test_fetch_skips_non_text_and_errors(server):
+    assert f.fetch(server + "/pdf")["body"] == b""
+    resp = f.fetch(server + "/nope")
+    assert resp["status"] == 404 and resp["body"] == b""
+
+
+def test_detect_charset_prefers_header():
+    assert f.detect_charset(LATIN1_PAGE, "text/html; charset=UTF-8") == "utf-8"
+    assert f.detect_charset(b"<html>plain ascii</html>") in ("ascii", "utf-8")
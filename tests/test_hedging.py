@@ -0,0 +1,101 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from reading_companion.core.nlp import hedging as h
+
+
+def tracker(**kw):
+    kw.setdefault("min_samples", 3)
+    return h.LatencyTracker(**kw)
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert h.percentile(values, 50) == 50
+    assert h.percentile(values, 95) == 95
+    assert h.percentile(values, 99) == 99
+    assert h.percentile([], 95) == 0.0
+
+
+def test_thresholds_follow_recent_p95():
+    t = tracker(default_hedge_after=45, min_hedge_after=0.5, deadline_factor=3, min_deadline=1, max_deadline=100)
+    assert t.hedge_after() == 45  # cold start
+    for s in (1.0, 2.0, 10.0):
+        t.record_primary(s)
+    assert t.hedge_after() == 10.0
+    assert t.deadline() == 30.0
+
+
+def test_fast_call_is_not_hedged():
+    t = tracker()
+    assert h.hedged_call(lambda: "ok", t, hedge_after=1, deadline=5) == "ok"
+    stats = t.stats()
+    assert stats["calls"] == 1 and stats["hedged"] == 0 and stats["hedge_rate"] == 0.0
+
+
+def test_slow_call_is_hedged_and_first_answer_wins():
+    calls = []
+    release = threading.Event()
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(2)  # the first request stalls
+            return "slow"
+        return "fast"
+
+    t = tracker()
+    start = time.monotonic()
+    assert h.hedged_call(fn, t, hedge_after=0.05, deadline=2) == "fast"
+    assert time.monotonic() - start < 1
+    release.set()
+    stats = t.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1 and stats["hedge_rate"] == 1.0
+
+
+def test_failed_call_is_retried_by_the_hedge():
+    calls = []
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return "ok"
+    assert h.hedged_call(fn, tracker(), hedge_after=10, deadline=20) == "ok"
+
+
+def test_both_failing_raise_the_last_error():
+    t = tracker()
+    with pytest.raises(RuntimeError):
+        h.hedged_call(lambda: (_ for _ in ()).throw(RuntimeError("down")), t, hedge_after=10, deadline=20)
+    assert t.stats()["failed"] == 1
+
+
+def test_deadline_gives_up():
+    release = threading.Event()
+    t = tracker()
+    with pytest.raises(h.ChunkDeadlineExceeded):
+        h.hedged_call(lambda: release.wait(2), t, hedge_after=0.02, deadline=0.1)
+    release.set()
+    assert t.stats()["timed_out"] == 1
+
+
+def test_stats_report_tail_saved():
+    t = tracker()
+    for s in (1.0,) * 98 + (9.0, 9.0):
+        t.record_primary(s)
+    for s in (1.0,) * 98 + (2.0, 2.0):
+        t.record_served(s)
+    stats = t.stats()
+    assert stats["p99_unhedged"] == 9.0 and stats["p99_served"] == 2.0 and stats["p99_saved"] == 7.0
+
+
+def test_cached_answers_do_not_move_the_thresholds():
+    t = tracker(min_hedge_after=0.5)
+    for s in (5.0, 6.0, 10.0):
+        t.record_primary(s)
+    for _ in range(20):  # replayed from the response cache in microseconds
+        h.hedged_call(lambda: SimpleNamespace(cached=True), t, hedge_after=1, deadline=5)
+    assert t.hedge_after() == 10.0
+    assert t.stats()["p50_served"] == 0.0
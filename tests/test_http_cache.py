@@ -0,0 +1,92 @@
+import reading_companion.core.scraping.text_from_url as tfu
+from reading_companion.core.scraping.http_cache import PageCache, get_page_cache, normalize_url
+
+
+def test_normalize_url_drops_noise():
+    a = normalize_url("HTTPS://Example.COM:443/article?b=2&utm_source=x&a=1#section")
+    b = normalize_url("https://example.com/article?a=1&b=2")
+    assert a == b == "https://example.com/article?a=1&b=2"
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+
+def test_page_cache_roundtrip_and_freshness(tmp_path):
+    cache = PageCache(tmp_path / "pages.sqlite3", fresh_seconds=60)
+    cache.set("http://x.com/a", "<html>a</html>", "A", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    entry = cache.get("http://x.com/a#top")
+    assert entry["html"] == b"<html>a</html>" and entry["text"] == "A" and entry["fresh"] is True
+    assert cache.get("http://x.com/b") is None
+
+    cache.fresh_seconds = 0
+    assert cache.get("http://x.com/a")["fresh"] is False
+
+    cache.ttl_seconds = -1
+    assert cache.get("http://x.com/a") is None
+
+
+def test_page_cache_evicts_lru_over_budget(tmp_path):
+    cache = PageCache(tmp_path / "pages.sqlite3")
+    cache.set("http://x.com/a", "<html>a</html>", "A")
+    cache.max_bytes = cache.stats()["bytes"] + 1  # room for one page
+    cache.set("http://x.com/b", "<html>b</html>", "B")
+    assert cache.stats()["entries"] == 1
+    assert cache.get("http://x.com/a") is None
+    assert cache.get("http://x.com/b") is not None
+
+
+def _count_calls(monkeypatch, responses):
+    calls = {"download": [], "extract": 0}
+
+    def fake_download(url, headers):
+        calls["download"].append(headers)
+        return responses.pop(0)
+
+    def fake_extract(html, **kwargs):
+        calls["extract"] += 1
+        return f"TEXT of {html}"
+
+    monkeypatch.setattr(tfu, "_download", fake_download)
+    monkeypatch.setattr(tfu.trafilatura, "extract", fake_extract)
+    return calls
+
+
+def test_fresh_hit_skips_network_and_extract(monkeypatch):
+    calls = _count_calls(monkeypatch, [(200, "<p>v1</p>", {"ETag": '"v1"'})])
+    assert tfu.extract_main_text_trafilatura("http://example.com/a") == "TEXT of <p>v1</p>"
+    assert tfu.extract_main_text_trafilatura("http://example.com/a?utm_medium=mail") == "TEXT of <p>v1</p>"
+    assert len(calls["download"]) == 1 and calls["extract"] == 1
+    assert get_page_cache().stats()["hits"] == 1
+
+
+def test_stale_entry_revalidates_with_validators(monkeypatch):
+    calls = _count_calls(monkeypatch, [
+        (200, "<p>v1</p>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        (304, None, {}),
+        (200, "<p>v2</p>", {"ETag": '"v2"'}),
+    ])
+    cache = get_page_cache()
+    cache.fresh_seconds = 0  # every entry is stale (the cache dir is per test)
+
+    tfu.extract_main_text_trafilatura("http://example.com/a")
+    # 304: reuse the stored text without extracting again
+    assert tfu.extract_main_text_trafilatura("http://example.com/a") == "TEXT of <p>v1</p>"
+    assert calls["download"][1] == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert calls["extract"] == 1
+    # 200: page changed, extract and store the new version
+    assert tfu.extract_main_text_trafilatura("http://example.com/a") == "TEXT of <p>v2</p>"
+    assert calls["extract"] == 2
+    assert cache.get("http://example.com/a")["etag"] == '"v2"'
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_stale_entry_served_when_offline(monkeypatch):
+    _count_calls(monkeypatch, [(200, "<p>v1</p>", {})])
+    tfu.extract_main_text_trafilatura("http://example.com/a")
+
+    def offline(url, headers):
+        raise tfu.requests.ConnectionError("down")
+    monkeypatch.setattr(tfu, "_download", offline)
+    get_page_cache().fresh_seconds = 0
+    assert tfu.extract_main_text_trafilatura("http://example.com/a") == "TEXT of <p>v1</p>"
+    assert tfu.extract_main_text_trafilatura("http://example.com/other") is None
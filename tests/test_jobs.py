@@ -0,0 +1,78 @@
+import threading
+import time
+
+from reading_companion.core.utils import jobs as j
+
+
+def wait_for(runner, job_id, status, timeout=5):
+    end = time.time() + timeout
+    while time.time() < end:
+        snap = runner.get(job_id)
+        if snap["status"] == status:
+            return snap
+        time.sleep(0.01)
+    raise AssertionError(f"job never reached {status}: {runner.get(job_id)}")
+
+
+def test_job_reports_progress_partial_and_final_result():
+    runner = j.JobRunner(max_workers=1)
+    step = threading.Event()
+
+    def work(job, parts):
+        job.set_total(len(parts))
+        for p in parts:
+            job.add_part(p)
+            if p == "b":
+                step.wait(5)  # hold the job half done
+        return "final"
+
+    job_id = runner.submit(work, ["a", "b", "c"])
+    snap = wait_for(runner, job_id, j.RUNNING)
+    while runner.get(job_id)["completed"] < 2:
+        time.sleep(0.01)
+    snap = runner.get(job_id)
+    assert snap["total"] == 3 and snap["parts"] == ["a", "b"] and snap["result"] is None
+    assert abs(snap["progress"] - 2 / 3) < 1e-9
+
+    step.set()
+    snap = wait_for(runner, job_id, j.DONE)
+    assert snap["parts"] == ["a", "b", "c"] and snap["result"] == "final" and snap["progress"] == 1.0
+    runner.shutdown()
+
+
+def test_same_key_returns_the_same_job_until_it_fails():
+    runner = j.JobRunner(max_workers=2)
+    release = threading.Event()
+    calls = []
+
+    def work(job):
+        calls.append(1)
+        release.wait(5)
+        raise RuntimeError("API down")
+
+    first = runner.submit(work, key="doc")
+    assert runner.submit(work, key="doc") == first  # a rerun while it runs
+    release.set()
+    snap = wait_for(runner, first, j.FAILED)
+    assert snap["error"] == "API down"
+
+    retry = runner.submit(work, key="doc")  # a failed job can be started again
+    assert retry != first
+    wait_for(runner, retry, j.FAILED)
+    assert len(calls) == 2
+    runner.shutdown()
+
+
+def test_finished_jobs_expire():
+    runner = j.JobRunner(ttl_seconds=0)
+    job_id = runner.submit(lambda job: "x", key="k")
+    wait_for(runner, job_id, j.DONE)
+    time.sleep(0.01)
+    runner.submit(lambda job: "y", key="other")  # pruning happens on submit
+    assert runner.get(job_id) is None
+    assert runner.get(None) is None
+    runner.shutdown()
+
+
+def test_job_runner_is_process_wide():
+    assert j.get_job_runner() is j.get_job_runner()
@@ -0,0 +1,145 @@
+import types
+
+import reading_companion.core.nlp.llm_cache as cache_mod
+from reading_companion.core.nlp.llm_cache import CachedClient, ResponseCache, cache_key
+
+
+class DummyChoice:
+    def __init__(self, content):
+        self.message = types.SimpleNamespace(content=content)
+        self.finish_reason = "stop"
+
+class DummyResp:
+    def __init__(self, content): self.choices = [DummyChoice(content)]
+
+class CountingCompletions:
+    def __init__(self): self.calls = 0
+    def create(self, **kwargs):
+        self.calls += 1
+        return DummyResp(f"answer {self.calls}")
+
+class DummyClient:
+    def __init__(self):
+        self.chat = types.SimpleNamespace(completions=CountingCompletions())
+        self.models = "MODELS"
+
+
+def _msgs(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_cache_key_depends_on_all_params():
+    base = cache_key(model="m", messages=_msgs("a"))
+    assert base == cache_key(messages=_msgs("a"), model="m")
+    assert base != cache_key(model="m", messages=_msgs("b"))
+    assert base != cache_key(model="m2", messages=_msgs("a"))
+    assert base != cache_key(model="m", messages=_msgs("a"), temperature=0.3)
+
+
+def test_cached_client_serves_repeat_requests_from_disk():
+    inner = DummyClient()
+    client = CachedClient(inner)
+
+    first = client.chat.completions.create(model="m", messages=_msgs("same"))
+    second = client.chat.completions.create(model="m", messages=_msgs("same"))
+    other = client.chat.completions.create(model="m", messages=_msgs("different"))
+
+    assert first.choices[0].message.content == "answer 1"
+    assert second.choices[0].message.content == "answer 1"
+    assert other.choices[0].message.content == "answer 2"
+    assert inner.chat.completions.calls == 2
+    stats = cache_mod.get_response_cache().stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 2
+    # non-chat attributes are delegated
+    assert client.models == "MODELS"
+
+
+def test_bypass_switch_skips_cache(monkeypatch):
+    monkeypatch.setattr(cache_mod, "_enabled", False)
+    inner = DummyClient()
+    client = CachedClient(inner)
+    client.chat.completions.create(model="m", messages=_msgs("x"))
+    client.chat.completions.create(model="m", messages=_msgs("x"))
+    assert inner.chat.completions.calls == 2
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    store = ResponseCache(tmp_path / "c.sqlite3", ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+    store.set("k", "v")
+    assert store.get("k")["content"] == "v"
+    now[0] += 11
+    assert store.get("k") is None
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+def test_lru_eviction_by_size(tmp_path, monkeypatch):
+    store = ResponseCache(tmp_path / "c.sqlite3", max_bytes=25)
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+    for key in ("a", "b"):
+        store.set(key, "x" * 10)
+        now[0] += 1
+    store.get("a")          # "a" is now more recently used than "b"
+    now[0] += 1
+    store.set("c", "x" * 10)
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.stats()["bytes"] <= 25
+
+
+class StreamChunk:
+    def __init__(self, content, finish_reason=None):
+        self.choices = [types.SimpleNamespace(
+            delta=types.SimpleNamespace(content=content), finish_reason=finish_reason)]
+
+class StreamingCompletions(CountingCompletions):
+    def create(self, **kwargs):
+        self.calls += 1
+        if kwargs.get("stream"):
+            return iter([StreamChunk("Hel"), StreamChunk("lo"), StreamChunk(None, "stop")])
+        return DummyResp("Hello")
+
+
+def test_streamed_answer_is_cached_and_replayed():
+    inner = DummyClient()
+    inner.chat.completions = StreamingCompletions()
+    client = CachedClient(inner)
+
+    first = client.chat.completions.create(model="m", messages=_msgs("q"), stream=True)
+    assert [c.choices[0].delta.content for c in first] == ["Hel", "lo", None]
+
+    replay = list(client.chat.completions.create(model="m", messages=_msgs("q"), stream=True))
+    plain = client.chat.completions.create(model="m", messages=_msgs("q"))
+
+    assert [c.choices[0].delta.content for c in replay] == ["Hello"]
+    assert plain.choices[0].message.content == "Hello"
+    assert inner.chat.completions.calls == 1
+
+
+class UnfinishedCompletions(CountingCompletions):
+    def create(self, **kwargs):
+        self.calls += 1
+        if kwargs.get("stream"):
+            return iter([StreamChunk("Hel"), StreamChunk(None, "length")])
+        if kwargs["messages"][0]["content"] == "empty":
+            return DummyResp("")
+        resp = DummyResp("Hel")
+        resp.choices[0].finish_reason = "length"
+        return resp
+
+
+def test_truncated_and_empty_answers_are_not_cached():
+    inner = DummyClient()
+    inner.chat.completions = UnfinishedCompletions()
+    client = CachedClient(inner)
+
+    for _ in range(2):
+        client.chat.completions.create(model="m", messages=_msgs("cut"))
+        client.chat.completions.create(model="m", messages=_msgs("empty"))
+        list(client.chat.completions.create(model="m", messages=_msgs("streamed"), stream=True))
+
+    assert inner.chat.completions.calls == 6
+    assert cache_mod.get_response_cache().stats()["entries"] == 0
@@ -10,6 +10,13 @@ class _FakeEncoder:
     def encode(self, text: str):
         return text.split()
 
+def chunk_replies(fn):
+    """Fake _chunk_response answering each chunk with fn(chunk, audience)."""
+    def respond(chunk_text, audience):
+        choice = types.SimpleNamespace(message=types.SimpleNamespace(content=fn(chunk_text, audience)), finish_reason="stop")
+        return types.SimpleNamespace(choices=[choice])
+    return respond
+
 @pytest.fixture(autouse=True)
 def fake_encoder(monkeypatch):
     """
@@ -124,7 +131,7 @@ def test_simplify_chunk_calls_openai(monkeypatch):
 def test_reduce_summary_uses_simplify_text(monkeypatch):
     called = {}
 
-    def fake_simplify_text(text):
+    def fake_simplify_text(text, target_words=500):
         # Make sure it receives the concatenated chunks
         assert "## Part 1" in text or "Part" in text or "Chunk" in text or "\n\n" in text
         called["ok"] = True
@@ -141,8 +148,8 @@ def test_reduce_summary_uses_simplify_text(monkeypatch):
 
 def test_pipeline_map_reduce_flow(monkeypatch):
     # Force small chunks to ensure multiple parts
-    # Mock simplify_chunk to produce deterministic output
-    monkeypatch.setattr(lc, "simplify_chunk", lambda ch, audience="10-year-old": f"[SIMPLIFIED::{ch[:20]}...]")
+    # Mock the chunk request to produce deterministic output
+    monkeypatch.setattr(lc, "_chunk_response", chunk_replies(lambda ch, audience="10-year-old": f"[SIMPLIFIED::{ch[:20]}...]"))
     # Mock reduce_summary to return fixed overall
     monkeypatch.setattr(lc, "reduce_summary", lambda parts, target_words=500: "OVERALL SUMMARY")
 
@@ -166,7 +173,7 @@ def test_reduce_summary_functional_no_api(monkeypatch):
         "## Part 1\n" + ("word " * 800),
         "## Part 2\n" + ("word " * 800),
     ]
-    def fake_simplify_text(text):
+    def fake_simplify_text(text, target_words=500):
         # pretend “summarisation”: return first 120 words
         words = text.split()
         return " ".join(words[:120])
@@ -179,4 +186,290 @@ def test_reduce_summary_functional_no_api(monkeypatch):
 
 def test_pipeline_handles_all_empty():
     overall, combined, parts = lc.simplify_long_text_with_summary("", audience="10-year-old")
-    assert overall == "" and combined == "" and parts == []
\ No newline at end of file
+    assert overall == "" and combined == "" and parts == []
+
+def test_pipeline_concurrent_keeps_part_order(monkeypatch):
+    import time
+
+    def slow_first(ch, audience="10-year-old"):
+        # earlier chunks finish last, so ordering must not depend on completion
+        time.sleep(0.05 if ch.startswith("S1") else 0.0)
+        return f"[SIMPLIFIED::{ch[:2]}]"
+
+    monkeypatch.setattr(lc, "_chunk_response", chunk_replies(slow_first))
+    seen = {}
+    def fake_reduce(parts, target_words=500):
+        seen["parts"] = parts
+        return "OVERALL"
+    monkeypatch.setattr(lc, "reduce_summary", fake_reduce)
+
+    long_text = "S1. " * 50 + "S2. " * 50 + "S3. " * 50
+    sequential = lc.simplify_long_text_with_summary(long_text, chunk_tokens=20)
+    concurrent = lc.simplify_long_text_with_summary(long_text, chunk_tokens=20, max_workers=4)
+
+    assert concurrent == sequential
+    parts = concurrent[2]
+    assert [p.splitlines()[0] for p in parts] == [f"## Part {i}" for i in range(1, len(parts) + 1)]
+    assert seen["parts"] == parts
+
+
+def test_reduce_summary_tree_reduces_large_inputs(monkeypatch):
+    calls = []
+    def fake_simplify_text(text, target_words=500):
+        calls.append(text)
+        return "summary " * 5
+
+    monkeypatch.setattr(lc, "simplify_text", fake_simplify_text)
+
+    parts = [f"## Part {i}\n" + ("word " * 40) for i in range(1, 11)]
+    summary = lc.reduce_summary(parts, batch_tokens=100, fan_in=3, max_workers=2)
+
+    assert summary == "summary " * 5
+    # 10 parts of ~42 tokens: batches of 2 parts fit the budget -> 5 batch summaries + 1 final call
+    assert len(calls) == 6
+    assert "## Part 1" in calls[0] and "## Part 2" in calls[0]
+    assert "## Part 9" in calls[4] and "## Part 10" in calls[4]
+
+
+def test_reduce_summary_respects_fan_in_and_depth(monkeypatch):
+    calls = []
+    def echo_simplify_text(text, target_words=500):
+        # never shrinks the text, so only max_depth stops the recursion
+        calls.append(text)
+        return text
+
+    monkeypatch.setattr(lc, "simplify_text", echo_simplify_text)
+
+    parts = [f"P{i} " + ("w " * 5) for i in range(6)]
+    lc.reduce_summary(parts, batch_tokens=10, fan_in=2, max_depth=1, max_workers=1)
+
+    # one level of 6 single-part batches, then the final call
+    assert len(calls) == 7
+    assert all(c.count("P") == 1 for c in calls[:6])
+
+
+##exceeds_budget
+
+def test_exceeds_budget_matches_token_count():
+    text = " ".join(f"word{i}" for i in range(500))
+    assert lc.exceeds_budget(text, 499) is True
+    assert lc.exceeds_budget(text, 500) is False
+    assert lc.exceeds_budget("", 0) is False
+
+
+def test_exceeds_budget_stops_early(monkeypatch):
+    encoded = []
+    class CountingEncoder(_FakeEncoder):
+        def encode(self, text):
+            encoded.append(len(text))
+            return super().encode(text)
+
+    monkeypatch.setattr(lc, "enc", lambda model=None: CountingEncoder())
+    monkeypatch.setattr(lc, "BUDGET_WINDOW_CHARS", 100)
+    text = "token " * 100_000
+
+    assert lc.exceeds_budget(text, 50) is True
+    assert sum(encoded) < 1000  # only the first couple of windows were encoded
+
+
+def test_chunking_encodes_sentences_in_one_batch(monkeypatch):
+    calls = {"batch": 0}
+    class BatchEncoder(_FakeEncoder):
+        def encode(self, text):
+            raise AssertionError("chunker should not re-encode text")
+        def encode_batch(self, texts, num_threads=1):
+            calls["batch"] += 1
+            return [t.split() for t in texts]
+
+    monkeypatch.setattr(lc, "enc", lambda model=None: BatchEncoder())
+    sents = [f"Sentence {i} is here and sentence {i} is above sixty characters long with and without spaces." for i in range(12)]
+    text = " ".join(sents)
+
+    chunks = lc.chunk_by_tokens_with_sentence_bounds(text, chunk_tokens=80, overlap_sents=2)
+
+    assert calls["batch"] == 1
+    assert len(chunks) >= 2
+    assert lc.split_into_sentences(chunks[1])[:2] == lc.split_into_sentences(chunks[0])[-2:]
+
+
+def test_simplify_chunk_stream_yields_deltas(monkeypatch):
+    class Chunk:
+        def __init__(self, content):
+            self.choices = [types.SimpleNamespace(delta=types.SimpleNamespace(content=content))]
+
+    class StreamCompletions:
+        def create(self, **kwargs):
+            assert kwargs["stream"] is True
+            assert kwargs["model"] == lc.MODEL
+            return iter([Chunk("Simple "), Chunk(None), Chunk("chunk")])
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=StreamCompletions()))
+    monkeypatch.setattr(lc, "get_client", lambda: client)
+    assert "".join(lc.simplify_chunk_stream("Original text.")) == "Simple chunk"
+
+
+def test_iter_simplified_parts_yields_in_order(monkeypatch):
+    monkeypatch.setattr(lc, "_chunk_response", chunk_replies(lambda ch, audience="10-year-old": ch[:2]))
+    long_text = "S1. " * 50 + "S2. " * 50 + "S3. " * 50
+    parts = list(lc.iter_simplified_parts(long_text, chunk_tokens=20, max_workers=3))
+    assert len(parts) > 1
+    assert all(p.startswith(f"## Part {i}\n") for i, p in enumerate(parts, 1))
+
+
+##Terms and questions over the simplified parts
+def test_explain_terms_over_parts_merges_duplicate_terms(monkeypatch):
+    seen = []
+    def fake_terms(text):
+        seen.append(text)
+        return {
+            "Cells divide.": "- **Cell**: a tiny unit\n- **Mitosis**: cell division",
+            "Cells grow.": "- cell — another definition\n- **Growth**: getting bigger",
+        }[text]
+    monkeypatch.setattr(lc, "explain_terms", fake_terms)
+
+    out = lc.explain_terms_over_parts(["## Part 1\nCells divide.", "## Part 2\nCells grow."], max_workers=2)
+
+    assert sorted(seen) == ["Cells divide.", "Cells grow."]  # part headings are not sent
+    assert out.splitlines() == [
+        "- **Cell**: a tiny unit",
+        "- **Mitosis**: cell division",
+        "- **Growth**: getting bigger",
+    ]
+
+def test_question_gen_over_parts_picks_spread_questions(monkeypatch):
+    replies = {
+        "A": "1. What is a cell?\n2. Why do cells divide?\n3. How big is a cell?",
+        "B": "1. What is a cell, exactly?\n2. What is mitosis?",
+        "C": "1. What is a lesion?",
+    }
+    monkeypatch.setattr(lc, "question_gen", lambda text: replies[text])
+
+    out = lc.question_gen_over_parts(["## Part 1\nA", "## Part 2\nB", "## Part 3\nC"], n=3, max_workers=1)
+
+    # first questions of the first, last and middle parts (a near-duplicate there is skipped), then second questions
+    assert out.splitlines() == ["1. What is a cell?", "2. What is a lesion?", "3. Why do cells divide?"]
+
+def test_over_parts_skips_failed_parts_and_reports_total_failure(monkeypatch):
+    monkeypatch.setattr(lc, "question_gen", lambda text: "⚠️ Error: down" if text == "bad" else "1. Why?")
+    assert lc.question_gen_over_parts(["bad", "good"]) == "1. Why?"
+
+    monkeypatch.setattr(lc, "explain_terms", lambda text: "⚠️ Error: down")
+    assert lc.explain_terms_over_parts(["a", "b"]) == "⚠️ Error: down"
+
+def test_failed_chunk_becomes_marker_and_is_left_out_of_summary(monkeypatch):
+    def flaky(chunk, audience="10-year-old"):
+        if "bad" in chunk:
+            raise RuntimeError("API down")
+        return f"S({chunk})"
+    monkeypatch.setattr(lc, "_chunk_response", chunk_replies(flaky))
+    monkeypatch.setattr(lc, "chunk_by_tokens_with_sentence_bounds", lambda text, **kw: ["good one", "bad two", "good three"])
+    summarised = []
+    monkeypatch.setattr(lc, "simplify_text", lambda text, target_words=500: summarised.append(text) or "overall")
+
+    overall, combined, parts = lc.simplify_long_text_with_summary("whatever", max_workers=2)
+
+    assert parts[0] == "## Part 1\nS(good one)"
+    assert lc.is_failed_part(parts[1]) and "API down" in parts[1]
+    assert overall == "overall"
+    assert "could not be simplified" not in summarised[0] and "S(good three)" in summarised[0]
+
+def test_interrupted_document_resumes_from_missing_chunks(monkeypatch):
+    calls = []
+    down = {"bad"}
+    def flaky(chunk, audience="10-year-old"):
+        calls.append(chunk)
+        if chunk in down:
+            raise RuntimeError("API down")
+        return f"S({chunk})"
+    summaries = []
+    monkeypatch.setattr(lc, "_chunk_response", chunk_replies(flaky))
+    monkeypatch.setattr(lc, "chunk_by_tokens_with_sentence_bounds", lambda text, **kw: ["one", "bad", "three"])
+    monkeypatch.setattr(lc, "simplify_text", lambda text, target_words=500: summaries.append(text) or "overall")
+
+    _, _, parts = lc.simplify_long_text_with_summary("doc")
+    assert lc.is_failed_part(parts[1])
+    calls.clear()
+
+    down.clear()  # the provider is back
+    overall, _, parts = lc.simplify_long_text_with_summary("doc")
+    assert calls == ["bad"]  # only the missing chunk is sent
+    assert parts == ["## Part 1\nS(one)", "## Part 2\nS(bad)", "## Part 3\nS(three)"]
+
+    calls.clear()
+    summaries.clear()
+    again = lc.simplify_long_text_with_summary("doc")
+    assert calls == [] and summaries == []  # a finished document costs nothing
+    assert again == (overall, "\n\n".join(parts), parts)
+
+def test_checkpoints_depend_on_prompt_settings():
+    assert lc.chunk_version("10-year-old", lc.MODEL, 3000) == lc.chunk_version("10-year-old", lc.MODEL, 3000)
+    assert lc.chunk_version("10-year-old", lc.MODEL, 3000) != lc.chunk_version("14-year-old", lc.MODEL, 3000)
+    assert lc.chunk_version("10-year-old", lc.MODEL, 3000) != lc.chunk_version("10-year-old", lc.MODEL, 2000)
+
+def test_cache_hits_are_not_chunk_latency_samples(monkeypatch):
+    import time
+    from reading_companion.core.nlp.hedging import get_latency_tracker
+    from reading_companion.core.nlp.llm_cache import CachedClient
+
+    class SlowCompletions:
+        def create(self, **kwargs):
+            time.sleep(0.05)
+            choice = types.SimpleNamespace(message=types.SimpleNamespace(content="simple"), finish_reason="stop")
+            return types.SimpleNamespace(choices=[choice])
+
+    client = CachedClient(types.SimpleNamespace(chat=types.SimpleNamespace(completions=SlowCompletions())))
+    monkeypatch.setattr(lc, "get_client", lambda: client)
+    tracker = get_latency_tracker("chunk")
+    tracker.reset()
+    try:
+        for _ in range(3):
+            assert lc.simplify_chunk_hedged("Same chunk.") == "simple"
+        stats = tracker.stats()
+    finally:
+        tracker.reset()
+    # only the real call is a sample: two near-zero hits would make the median ~0
+    assert stats["calls"] == 3 and stats["p50_unhedged"] >= 0.05 and stats["p50_served"] >= 0.05
+
+def test_empty_chunk_reply_becomes_failed_part(monkeypatch):
+    monkeypatch.setattr(lc, "_chunk_response", chunk_replies(lambda ch, audience: ""))
+    assert lc.is_failed_part(lc.simplify_chunk_hedged("Some chunk."))
+
+def test_truncated_chunks_are_not_checkpointed(monkeypatch):
+    from reading_companion.core.nlp.budgets import TRUNCATION_NOTE
+
+    calls = []
+    def cut_off(chunk, audience="10-year-old"):
+        calls.append(chunk)
+        return "S(" + chunk
+    respond = chunk_replies(cut_off)
+    def truncated(chunk_text, audience):
+        resp = respond(chunk_text, audience)
+        resp.choices[0].finish_reason = "length"
+        return resp
+    monkeypatch.setattr(lc, "_chunk_response", truncated)
+    monkeypatch.setattr(lc, "chunk_by_tokens_with_sentence_bounds", lambda text, **kw: ["one", "two"])
+
+    parts = list(lc.iter_simplified_parts("doc"))
+    assert parts[0] == "## Part 1\nS(one" + TRUNCATION_NOTE
+    list(lc.iter_simplified_parts("doc"))
+    assert calls == ["one", "two", "one", "two"]  # nothing was saved, so both are sent again
+
+def test_reduce_summary_leaves_out_failed_batches(monkeypatch):
+    finals = []
+    def flaky_summary(text, target_words=500):
+        if "## Part" not in text:
+            finals.append((text, target_words))
+            return "overall"
+        return "⚠️ Error: down" if "## Part 1" in text else "batch ok"
+    monkeypatch.setattr(lc, "simplify_text", flaky_summary)
+    parts = [f"## Part {i}\n" + ("word " * 40) for i in range(1, 5)]
+
+    assert lc.reduce_summary(parts, target_words=200, batch_tokens=100, fan_in=2) == "overall"
+    assert finals == [("batch ok", 200)]  # the failed batch is not summarised as text
+
+    finals.clear()
+    lc.reduce_summary(parts, target_words=200, batch_tokens=100, fan_in=2)
+    assert finals  # an incomplete summary is not checkpointed
+
+    monkeypatch.setattr(lc, "simplify_text", lambda text, target_words=500: "⚠️ Error: down")
+    assert lc.reduce_summary(parts, batch_tokens=100, fan_in=2) == "⚠️ Error: down"
@@ -0,0 +1,44 @@
+from reading_companion.core.utils.memo import ResultMemo
+
+
+def test_session_hit_then_process_hit_across_sessions():
+    memo = ResultMemo()
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return f"OUT({text})"
+
+    session_a, session_b = {}, {}
+    assert memo.get_or_compute(session_a, "terms", "example", "src", compute) == "OUT(src)"
+    assert memo.get_or_compute(session_a, "terms", "example", "src", compute) == "OUT(src)"
+    assert memo.get_or_compute(session_b, "terms", "example", "src", compute) == "OUT(src)"
+
+    assert calls == ["src"]
+    assert memo.stats() == {"session_hits": 1, "process_hits": 1, "misses": 1, "entries": 1}
+    assert session_b  # process hit was copied into the new session
+
+
+def test_key_includes_task_section_and_text():
+    memo = ResultMemo()
+    session = {}
+    memo.store(session, "terms", "example", "src", "A")
+    assert memo.lookup(session, "questions", "example", "src") is None
+    assert memo.lookup(session, "terms", "use_now", "src") is None
+    assert memo.lookup(session, "terms", "example", "other") is None
+    assert memo.lookup(session, "terms", "example", "src") == "A"
+
+
+def test_errors_are_not_memoised():
+    memo = ResultMemo()
+    session = {}
+    memo.store(session, "terms", "s", "src", "⚠️ Error: API down")
+    assert memo.lookup(session, "terms", "s", "src") is None
+
+
+def test_process_level_is_lru_bounded():
+    memo = ResultMemo(max_entries=2)
+    for text in ("a", "b", "c"):
+        memo.store({}, "t", "s", text, text.upper())
+    assert memo.lookup({}, "t", "s", "a") is None
+    assert memo.lookup({}, "t", "s", "c") == "C"
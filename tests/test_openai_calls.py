@@ -96,4 +96,37 @@ def test_simplify_text_calls_api(monkeypatch):
 
     monkeypatch.setattr(sim_mod, "get_client", lambda: types.SimpleNamespace(chat=VerifyChat()))
     out = sim_mod.simplify_text("hello")
-    assert "Simplified" in out
\ No newline at end of file
+    assert "Simplified" in out
+# streaming variants
+
+class DummyDelta:
+    def __init__(self, content): self.delta = types.SimpleNamespace(content=content)
+class DummyChunk:
+    def __init__(self, content): self.choices = [DummyDelta(content)]
+
+def _streaming_client(pieces, seen):
+    class StreamCompletions(DummyCompletions):
+        def create(self, **k):
+            seen.update(k)
+            return iter([DummyChunk(p) for p in pieces] + [DummyChunk(None)])
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=StreamCompletions()))
+
+def test_stream_variants_yield_deltas(monkeypatch):
+    for mod, fn, prompt in [
+        (sim_mod, sim_mod.simplify_text_stream, "Simplify the following text"),
+        (et_mod, et_mod.explain_terms_stream, "Pick out all the scientific words"),
+        (qg_mod, qg_mod.question_gen_stream, "Generate 3 comprehension questions"),
+    ]:
+        seen = {}
+        monkeypatch.setattr(mod, "get_client", lambda seen=seen: _streaming_client(["Hel", "lo"], seen))
+        assert list(fn("text")) == ["Hel", "lo"]
+        assert seen["stream"] is True
+        assert prompt in seen["messages"][1]["content"]
+
+def test_stream_variant_error_is_yielded(monkeypatch):
+    class ErrorCompletions(DummyCompletions):
+        def create(self, *a, **k): raise RuntimeError("API down")
+    monkeypatch.setattr(et_mod, "get_client", lambda: types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=ErrorCompletions())))
+    out = "".join(et_mod.explain_terms_stream("x"))
+    assert "⚠️ Error:" in out
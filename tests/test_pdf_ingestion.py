@@ -0,0 +1,50 @@
+import fitz
+import pytest
+
+import reading_companion.core.ingestion.pdf as ingest
+
+
+def _pdf(n_pages):
+    doc = fitz.open()
+    for p in range(n_pages):
+        doc.new_page().insert_text((72, 72), f"PAGE-{p} body text")
+    return doc.tobytes()
+
+
+def test_parse_page_selection():
+    assert ingest.parse_page_selection(None, 3) == [0, 1, 2]
+    assert ingest.parse_page_selection("1-3, 7, 2", 10) == [0, 1, 2, 6]
+    assert ingest.parse_page_selection("9-", 10) == [8, 9]
+    assert ingest.parse_page_selection("8-20", 10) == [7, 8, 9]
+    assert ingest.parse_page_selection([5, 0, 99], 10) == [0, 5]
+    with pytest.raises(ValueError):
+        ingest.parse_page_selection("3-1", 10)
+    with pytest.raises(ValueError):
+        ingest.parse_page_selection("abc", 10)
+
+
+def test_iter_pdf_pages_in_process_and_selection():
+    data = _pdf(5)
+    assert ingest.page_count(data) == 5
+    pages = ingest.extract_pdf_pages(memoryview(data))
+    assert [p.split()[0] for p in pages] == [f"PAGE-{i}" for i in range(5)]
+    picked = ingest.extract_pdf_pages(data, pages="2, 4-5")
+    assert [p.split()[0] for p in picked] == ["PAGE-1", "PAGE-3", "PAGE-4"]
+
+
+def test_iter_pdf_pages_process_pool_keeps_order():
+    data = _pdf(12)
+    pages = ingest.extract_pdf_pages(
+        bytearray(data), max_workers=2, pages_per_task=5, parallel_min_pages=2
+    )
+    assert [p.split()[0] for p in pages] == [f"PAGE-{i}" for i in range(12)]
+
+
+def test_process_pool_is_spawned_once_and_reused():
+    data = _pdf(6)
+    for _ in range(2):
+        pages = ingest.extract_pdf_pages(data, max_workers=2, pages_per_task=2, parallel_min_pages=2)
+        assert [p.split()[0] for p in pages] == [f"PAGE-{i}" for i in range(6)]
+    pool = ingest._pools[2]
+    assert list(ingest._pools) == [2]
+    assert pool._mp_context.get_start_method() == "spawn"  # no fork from a threaded server
@@ -0,0 +1,40 @@
+import reading_companion.core.utils.pdf_text as pdf_text
+from reading_companion.core.utils.pdf_gen import data_for_pdf
+
+
+def _pdf(lines):
+    return data_for_pdf("\n".join(lines))
+
+
+def test_extract_pdf_text_reads_all_pages():
+    lines = [f"Line {i} of the document." for i in range(120)]  # spills onto several pages
+    text = pdf_text.extract_pdf_text(_pdf(lines))
+    assert "Line 0 of the document." in text
+    assert "Line 119 of the document." in text
+
+
+def test_cache_extracts_each_file_once(monkeypatch):
+    cache = pdf_text.PdfTextCache()
+    calls = []
+    real = pdf_text.extract_pdf_text
+    monkeypatch.setattr(pdf_text, "extract_pdf_text", lambda data, pages=None: (calls.append(1) or real(data, pages)))
+
+    a, b = _pdf(["first file"]), _pdf(["second file"])
+    assert "first file" in cache.get_or_extract(a)
+    assert "first file" in cache.get_or_extract(bytes(a))  # same content, new buffer
+    assert "second file" in cache.get_or_extract(b)
+
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_oldest_over_char_cap(monkeypatch):
+    monkeypatch.setattr(pdf_text, "extract_pdf_text", lambda data, pages=None: data.decode() * 10)
+    cache = pdf_text.PdfTextCache(max_chars=25)
+    cache.get_or_extract(b"a")
+    cache.get_or_extract(b"b")
+    cache.get_or_extract(b"c")
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["chars"] == 20
+    cache.get_or_extract(b"a")
+    assert cache.stats()["misses"] == 4  # "a" had been evicted
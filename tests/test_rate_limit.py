@@ -0,0 +1,207 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+from reading_companion.core.nlp import rate_limit as rl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def completion(content):
+    return {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-5-nano",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    throttle = 0         # how many of the next requests get a 429
+    retry_after = "0.05"
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        Handler.calls += 1
+        if Handler.throttle > 0:
+            Handler.throttle -= 1
+            body = json.dumps({"error": {"message": "Rate limit reached", "type": "requests"}}).encode()
+            headers = {"Retry-After": Handler.retry_after} if Handler.retry_after else {}
+            return self._send(429, body, headers)
+        self._send(200, json.dumps(completion("ok")).encode())
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/v1"
+    srv.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_handler():
+    Handler.throttle, Handler.retry_after, Handler.calls = 0, "0.05", 0
+
+
+def scheduled(base_url, scheduler):
+    return rl.ScheduledClient(openai.OpenAI(api_key="test", base_url=base_url, max_retries=0), scheduler)
+
+
+def ask(client):
+    resp = client.chat.completions.create(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}])
+    return resp.choices[0].message.content
+
+
+## Against a fake server
+
+def test_429s_are_retried_honouring_retry_after(server):
+    Handler.throttle = 2
+    sleeps = []
+    def sleep(seconds):
+        sleeps.append(seconds)
+        time.sleep(seconds)
+    scheduler = rl.RateLimitScheduler(max_concurrency=4, sleep=sleep)
+
+    assert ask(scheduled(server, scheduler)) == "ok"
+
+    assert Handler.calls == 3
+    assert sleeps[:1] == [pytest.approx(0.05)]  # Retry-After, not the backoff
+    stats = scheduler.stats()
+    assert stats["throttled"] == 2 and stats["retries"] == 2 and stats["failed"] == 0
+    assert stats["concurrency_limit"] < 4  # halved once (same cooldown), then grown a little
+    assert stats["in_flight"] == 0
+
+
+def test_retries_give_up_with_the_last_error(server):
+    Handler.throttle, Handler.retry_after = 10, ""
+    clock = FakeClock()
+    scheduler = rl.RateLimitScheduler(max_attempts=3, clock=clock, sleep=clock.sleep)
+
+    with pytest.raises(openai.RateLimitError):
+        ask(scheduled(server, scheduler))
+
+    assert Handler.calls == 3
+    assert len(clock.slept) == 2 and all(0 <= s <= rl.BACKOFF_MAX for s in clock.slept)  # jittered backoff
+    assert scheduler.stats()["failed"] == 1
+
+
+def test_concurrent_sessions_share_one_scheduler(server):
+    Handler.throttle = 3
+    rl.set_scheduler(rl.RateLimitScheduler(max_concurrency=2))
+    try:
+        clients = [scheduled(server, None) for _ in range(4)]  # like sessions: separate clients
+        results = []
+        threads = [threading.Thread(target=lambda c=c: results.append(ask(c))) for c in clients]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        assert results == ["ok"] * 4
+        stats = rl.get_scheduler().stats()
+        assert stats["requests"] == 7 and stats["throttled"] == 3 and stats["in_flight"] == 0
+    finally:
+        rl.set_scheduler(None)
+
+
+def test_async_requests_share_the_scheduler(server):
+    Handler.throttle = 2
+    scheduler = rl.RateLimitScheduler(max_concurrency=2)
+
+    async def ask_many():
+        client = rl.AsyncScheduledClient(openai.AsyncOpenAI(api_key="test", base_url=server, max_retries=0), scheduler)
+        async def one():
+            resp = await client.chat.completions.create(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}])
+            return resp.choices[0].message.content
+        return await asyncio.gather(*(one() for _ in range(3)))
+
+    assert asyncio.run(ask_many()) == ["ok"] * 3
+    stats = scheduler.stats()
+    assert stats["requests"] == 5 and stats["throttled"] == 2 and stats["in_flight"] == 0
+
+
+def test_streams_hold_their_slot_until_read():
+    class Completions:
+        def create(self, **kwargs):
+            return iter(["a", "b"])
+    scheduler = rl.RateLimitScheduler(max_concurrency=2)
+    client = rl.ScheduledClient(type("C", (), {"chat": type("Chat", (), {"completions": Completions()})()})(), scheduler)
+
+    stream = client.chat.completions.create(model="m", messages=[], stream=True)
+    assert scheduler.stats()["in_flight"] == 1
+    assert list(stream) == ["a", "b"]
+    assert scheduler.stats()["in_flight"] == 0
+
+
+## Building blocks
+
+def test_token_bucket_waits_for_refill():
+    clock = FakeClock()
+    bucket = rl.TokenBucket(60, clock=clock, sleep=clock.sleep)  # one per second
+    for _ in range(60):
+        assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert bucket.acquire(5) == pytest.approx(5.0)  # the clock moved past the previous wait
+    assert bucket.reserve(1000) > 0  # more than capacity is clamped, never blocks forever
+
+
+def test_aimd_limiter_grows_and_halves_once_per_cooldown():
+    clock = FakeClock()
+    limiter = rl.AIMDLimiter(initial=4, minimum=1, maximum=8, cooldown=1.0, clock=clock)
+    for _ in range(4):
+        limiter.on_success()
+    assert 4.9 < limiter.limit < 5.0  # about +1 per window of 4
+    limiter.on_throttle()
+    limiter.on_throttle()  # same burst
+    assert 2.4 < limiter.limit < 2.5
+    clock.now += 1.0
+    limiter.on_throttle()
+    assert 1.2 < limiter.limit < 1.25
+    clock.now += 1.0
+    limiter.on_throttle()
+    assert limiter.limit == 1.0
+
+
+def test_retry_after_headers():
+    class Exc(Exception):
+        def __init__(self, headers):
+            self.response = type("R", (), {"headers": headers})()
+    assert rl.retry_after(Exc({"retry-after-ms": "250"})) == 0.25
+    assert rl.retry_after(Exc({"retry-after": "3"})) == 3.0
+    assert rl.retry_after(Exc({"retry-after": "9999"})) == rl.MAX_RETRY_AFTER
+    assert rl.retry_after(Exc({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert rl.retry_after(Exc({})) is None
+    assert rl.retry_after(ValueError()) is None
+
+
+def test_estimate_tokens_counts_prompt_and_completion_limit():
+    kwargs = {"messages": [{"role": "user", "content": "x" * 400}], "max_completion_tokens": 300}
+    assert rl.estimate_tokens(kwargs) == 400
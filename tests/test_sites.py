@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import fitz
+import pytest
+
+import reading_companion.core.scraping.text_from_url as tfu
+from reading_companion.core.scraping import sites
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sites"
+
+
+def _pdf(text: str) -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(36, 36, 560, 800), text, fontsize=6)
+    return doc.tobytes()
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """Route sites.fetch to fixture bodies; returns the url -> body map and the list of fetched urls."""
+    routes, seen = {}, []
+
+    def fake_fetch(url, headers=None, max_bytes=None, content_types=None, **kwargs):
+        seen.append(url)
+        body = routes.get(url, b"")
+        return {"status": 200 if body else 404, "url": url, "headers": {}, "body": body,
+                "encoding": "utf-8", "truncated": False}
+
+    monkeypatch.setattr(sites, "fetch", fake_fetch)
+    return routes, seen
+
+
+def test_registry_matches_known_hosts_only():
+    assert sites.find_site_extractor("https://arxiv.org/abs/1706.03762v7")[1].group("id") == "1706.03762v7"
+    assert sites.find_site_extractor("https://arxiv.org/pdf/hep-th/9901001.pdf")[1].group("id") == "hep-th/9901001"
+    assert sites.find_site_extractor("https://pubmed.ncbi.nlm.nih.gov/38000001/")[1].group("pmid") == "38000001"
+    assert sites.find_site_extractor("https://pmc.ncbi.nlm.nih.gov/articles/PMC10000001/")[1].group("pmc") == "10000001"
+    springer = sites.find_site_extractor("https://link.springer.com/article/10.1186/s12978-024-01797-y")
+    assert springer[1].group("doi") == "10.1186/s12978-024-01797-y"
+    assert sites.find_site_extractor("https://example.com/article/10.1186/x") is None
+
+
+def test_springer_article_keeps_body_and_drops_back_matter(served):
+    routes, seen = served
+    url = "https://link.springer.com/article/10.1186/s12978-024-01797-y"
+    routes[url] = (FIXTURES / "springer_article.html").read_bytes()
+
+    text = sites.extract_site_text(url)
+    assert text.startswith("Vitamin D and reproductive disorders")
+    assert "Vitamin D and endometriosis" in text and "calcitriol" in text
+    assert "Giudice LC" not in text            # references
+    assert "Creative Commons" not in text      # rights and permissions
+    assert "cookies" not in text and "Springer Link" not in text
+    assert seen == [url]                       # full text found, no PDF download
+
+
+def test_springer_falls_back_to_citation_pdf_for_short_pages(served, monkeypatch):
+    routes, seen = served
+    monkeypatch.setattr(sites, "MIN_FULL_TEXT_CHARS", 10_000)
+    url = "https://link.springer.com/article/10.1186/s12978-024-01797-y"
+    pdf_url = "https://reproductive-health-journal.biomedcentral.com/counter/pdf/10.1186/s12978-024-01797-y"
+    routes[url] = (FIXTURES / "springer_article.html").read_bytes()
+
+    # no PDF available: the (short) page text is still returned
+    assert "calcitriol" in sites.extract_site_text(url)
+    assert seen[-1] == pdf_url
+
+
+def test_pubmed_prefers_pmc_full_text(served):
+    routes, seen = served
+    routes[sites.EUTILS_EFETCH.format(db="pubmed", id="38000001")] = (FIXTURES / "pubmed_efetch.xml").read_bytes()
+    routes[sites.EUTILS_EFETCH.format(db="pmc", id="10000001")] = (FIXTURES / "pmc_efetch.xml").read_bytes()
+
+    text = sites.extract_site_text("https://pubmed.ncbi.nlm.nih.gov/38000001/")
+    assert text.startswith("Vitamin D and reproductive disorders: a comprehensive review with a focus on endometriosis")
+    assert "Section 6" in text and "calcitriol" in text
+    assert "Clinical practice" not in text     # reference list
+
+
+def test_pubmed_abstract_without_full_text(served):
+    routes, _ = served
+    routes[sites.EUTILS_EFETCH.format(db="pubmed", id="38000001")] = (FIXTURES / "pubmed_efetch.xml").read_bytes()
+
+    text = sites.extract_site_text("https://pubmed.ncbi.nlm.nih.gov/38000001")
+    assert "Background: Vitamin D is a fat-soluble" in text
+    assert "Conclusions: Vitamin D deficiency is common in women with endometriosis" in text
+
+
+def test_arxiv_reads_pdf_then_api(served):
+    routes, _ = served
+    routes[sites.ARXIV_API.format(id="1706.03762v7")] = (FIXTURES / "arxiv_api.xml").read_bytes()
+
+    text = sites.extract_site_text("https://arxiv.org/abs/1706.03762v7")
+    assert text.startswith("Attention Is All You Need\n\nAbstract\n\nThe dominant sequence")
+
+    routes[sites.ARXIV_PDF.format(id="1706.03762v7")] = _pdf("Transformer full text. " * 150)
+    assert sites.extract_site_text("https://arxiv.org/abs/1706.03762v7").startswith("Transformer full text.")
+
+
+def test_extract_main_text_uses_site_extractor_first(served, monkeypatch):
+    routes, _ = served
+    url = "https://link.springer.com/article/10.1186/s12978-024-01797-y"
+    routes[url] = (FIXTURES / "springer_article.html").read_bytes()
+    monkeypatch.setattr(tfu, "extract_main_text_trafilatura", lambda u: pytest.fail("generic path used"))
+
+    assert "calcitriol" in tfu.extract_main_text(url)
+
+
+def test_unknown_or_failing_sites_fall_back(served, monkeypatch):
+    monkeypatch.setattr(tfu, "extract_main_text_trafilatura", lambda u: "GENERIC")
+    assert tfu.extract_main_text("https://example.com/post") == "GENERIC"
+    # registered host, but nothing usable came back
+    assert tfu.extract_main_text("https://pubmed.ncbi.nlm.nih.gov/1/") == "GENERIC"
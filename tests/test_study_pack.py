@@ -0,0 +1,73 @@
+import json
+import types
+
+import reading_companion.core.nlp.study_pack as sp_mod
+from reading_companion.core.nlp.budgets import truncation_stats
+
+PACK = {
+    "simplified": "Plants make food from light.",
+    "glossary": [{"term": "Photosynthesis", "definition": "How plants make food from light."}],
+    "questions": [
+        {"question": "What do plants need?", "answer": "Light."},
+        {"question": "What do plants make?", "answer": "Food."},
+    ],
+}
+
+
+def fake_client(content, finish_reason="stop", calls=None):
+    class Completions:
+        def create(self, **kwargs):
+            if calls is not None:
+                calls.append(kwargs)
+            choice = types.SimpleNamespace(message=types.SimpleNamespace(content=content), finish_reason=finish_reason)
+            return types.SimpleNamespace(choices=[choice])
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=Completions()))
+
+
+def test_study_pack_single_strict_call(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sp_mod, "get_client", lambda: fake_client(json.dumps(PACK), calls=calls))
+    pack = sp_mod.study_pack("Photosynthesis text.")
+
+    assert isinstance(pack, sp_mod.StudyPack)
+    assert pack.simplified == PACK["simplified"]
+    assert len(calls) == 1
+    fmt = calls[0]["response_format"]
+    assert fmt["type"] == "json_schema" and fmt["json_schema"]["strict"] is True
+    assert fmt["json_schema"]["schema"]["additionalProperties"] is False
+    assert calls[0]["max_completion_tokens"] > 0
+    assert "Photosynthesis text." in calls[0]["messages"][1]["content"]
+
+
+def test_study_pack_markdown_panels():
+    pack = sp_mod.StudyPack.model_validate(PACK)
+    assert pack.glossary_markdown() == "- **Photosynthesis**: How plants make food from light."
+    assert pack.questions_markdown() == "1. What do plants need?\n2. What do plants make?"
+    assert pack.answers_markdown() == "1. Light.\n2. Food."
+
+
+def test_study_pack_schema_mismatch_is_an_error(monkeypatch):
+    bad = dict(PACK, extra="field")
+    monkeypatch.setattr(sp_mod, "get_client", lambda: fake_client(json.dumps(bad)))
+    out = sp_mod.study_pack("x")
+    assert isinstance(out, str) and out.startswith("⚠️ Error:")
+
+    monkeypatch.setattr(sp_mod, "get_client", lambda: fake_client("not json"))
+    assert sp_mod.study_pack("x").startswith("⚠️ Error:")
+
+
+def test_study_pack_truncation_is_an_error(monkeypatch):
+    monkeypatch.setattr(sp_mod, "get_client", lambda: fake_client('{"simplified": "Pla', finish_reason="length"))
+    before = truncation_stats().get("study_pack", 0)
+    out = sp_mod.study_pack("x")
+    assert out.startswith("⚠️ Error:") and "length limit" in out
+    assert truncation_stats()["study_pack"] == before + 1
+
+
+def test_study_pack_api_error_is_caught(monkeypatch):
+    class Boom:
+        @property
+        def chat(self):
+            raise RuntimeError("API down")
+    monkeypatch.setattr(sp_mod, "get_client", lambda: Boom())
+    assert sp_mod.study_pack("x") == "⚠️ Error: API down"
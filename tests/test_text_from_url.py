@@ -1,5 +1,16 @@
+import pytest
+from lxml import html as lxml_html
+
 import reading_companion.core.scraping.text_from_url as tfu
 
+
+@pytest.fixture(autouse=True)
+def fresh_driver_pools():
+    # pooled drivers must not leak between tests
+    tfu.shutdown_driver_pools()
+    yield
+    tfu.shutdown_driver_pools()
+
 ## _clean_text
 
 def test_clean_text_collapses_blanks():
@@ -11,7 +22,7 @@ def test_clean_text_collapses_blanks():
 
 def test_extract_main_text_trafilatura_success(monkeypatch):
     # Fake trafilatura responses
-    monkeypatch.setattr(tfu.trafilatura, "fetch_url", lambda url: "<html>ok</html>")
+    monkeypatch.setattr(tfu, "_download", lambda url, headers: (200, "<html>ok</html>", {}))
     def fake_extract(downloaded, **kwargs):
         assert kwargs.get("favor_recall") is True
         return "Title\n\nBody text."
@@ -21,11 +32,20 @@ def test_extract_main_text_trafilatura_success(monkeypatch):
     assert text == "Title\n\nBody text."
 
 def test_extract_main_text_trafilatura_none(monkeypatch):
-    monkeypatch.setattr(tfu.trafilatura, "fetch_url", lambda url: None)
+    monkeypatch.setattr(tfu, "_download", lambda url, headers: (404, None, {}))
     assert tfu.extract_main_text_trafilatura("http://nope") is None
 
 ## selenium path 
 
+def fake_document(summary_html):
+    # Stand-in for readability.Document: summary() leaves the article tree on .html
+    class FakeDoc:
+        def __init__(self, html): self.html = html
+        def summary(self, html_partial=True):
+            self.html = lxml_html.fragment_fromstring(summary_html)
+            return summary_html
+    return FakeDoc
+
 class FakeElement:
     def click(self): pass
     def is_displayed(self):  # used by visibility_of_element_located
@@ -62,8 +82,18 @@ class FakeDriver:
     def execute_script(self, script):
         # Your extractor scrolls to trigger lazy loads; we just record it
         self._scrolled = True
+        if "readyState" in script:
+            return "complete"
+        if script.startswith("return document.body.scrollHeight"):
+            return 1000
         return None
 
+    def delete_all_cookies(self):
+        pass
+
+    def set_page_load_timeout(self, seconds):
+        self._page_load_timeout = seconds
+
     def quit(self):
         self._quit_called = True
     
@@ -89,14 +119,12 @@ def test_extract_main_text_selenium_happy_path(monkeypatch):
     monkeypatch.setattr(tfu.webdriver, "Chrome", fake_chrome)
 
     # Patch readability.Document to return just the article part
-    class FakeDoc:
-        def __init__(self, html): self.html = html
-        def summary(self, html_partial=True):
-            return "<article><h1>H1</h1><p>A</p><p>B</p><noscript>x</noscript></article>"
-    monkeypatch.setattr(tfu, "Document", FakeDoc)
+    monkeypatch.setattr(tfu, "Document", fake_document("<article><h1>H1</h1><p>A</p><p>B</p><noscript>x</noscript></article>"))
 
     out = tfu.extract_main_text_selenium("http://example.com", headless=True, wait=0.0)
-    # Driver must be quit
+    # Driver goes back to the pool warm, and is quit when the pool shuts down
+    assert created["driver"]._quit_called is False
+    tfu.shutdown_driver_pools()
     assert created["driver"]._quit_called is True
     # Text should be cleaned and contain article content, without script/noscript
     assert "H1" in out and "A" in out and "B" in out
@@ -111,11 +139,7 @@ def test_extract_main_text_selenium_no_cookie_button(monkeypatch):
 
     monkeypatch.setattr(tfu.webdriver, "Chrome", fake_chrome)
 
-    class FakeDoc:
-        def __init__(self, html): self.html = html
-        def summary(self, html_partial=True):
-            return "<article><p>Body only.</p></article>"
-    monkeypatch.setattr(tfu, "Document", FakeDoc)
+    monkeypatch.setattr(tfu, "Document", fake_document("<article><p>Body only.</p></article>"))
 
     out = tfu.extract_main_text_selenium("http://example.com", wait=0.0)
     assert out == "Body only."
@@ -125,11 +149,7 @@ def test_extract_main_text_selenium_returns_none_on_empty(monkeypatch):
         return FakeDriver("<html><body></body></html>")
     monkeypatch.setattr(tfu.webdriver, "Chrome", fake_chrome)
 
-    class FakeDoc:
-        def __init__(self, html): self.html = html
-        def summary(self, html_partial=True):
-            return "<div></div>"
-    monkeypatch.setattr(tfu, "Document", FakeDoc)
+    monkeypatch.setattr(tfu, "Document", fake_document("<div></div>"))
 
     out = tfu.extract_main_text_selenium("http://example.com", wait=0.0)
     assert out is None
@@ -155,8 +175,111 @@ def test_extract_main_text_falls_back_to_selenium(monkeypatch):
     out = tfu.extract_main_text("http://example.com")
     assert out == "SEL TEXT"
 
+def test_extract_main_text_bot_check_on_fast_path_falls_back(monkeypatch):
+    monkeypatch.setattr(tfu, "extract_main_text_trafilatura", lambda url: "Just a moment... checking your browser")
+    monkeypatch.setattr(tfu, "extract_main_text_selenium", lambda url: "SEL TEXT")
+    recorded = []
+    memory = tfu.get_domain_memory()
+    monkeypatch.setattr(memory, "record", lambda domain, strategy, outcome, seconds: recorded.append((strategy, outcome)))
+    assert tfu.extract_main_text("http://example.com") == "SEL TEXT"
+    assert recorded == [(tfu.FAST, "blocked"), (tfu.BROWSER, "ok")]
+
+def test_bot_check_page_is_not_cached(monkeypatch):
+    monkeypatch.setattr(tfu, "_download", lambda url, headers: (200, b"<html>wall</html>", {}))
+    monkeypatch.setattr(tfu.trafilatura, "extract", lambda downloaded, **kw: "Verifying you are a human")
+    assert tfu.extract_main_text_trafilatura("http://walled.example") == "Verifying you are a human"
+    assert tfu.get_page_cache().get("http://walled.example") is None
+
 def test_extract_main_text_both_fail_returns_message(monkeypatch):
     monkeypatch.setattr(tfu, "extract_main_text_trafilatura", lambda url: None)
     monkeypatch.setattr(tfu, "extract_main_text_selenium", lambda url: None)
     out = tfu.extract_main_text("http://example.com")
-    assert "text could not be extracted" in out.lower()      
\ No newline at end of file
+    assert "text could not be extracted" in out.lower()      
+
+def test_extract_main_text_selenium_reuses_pooled_driver(monkeypatch):
+    created = []
+    def fake_chrome(service=None, options=None):
+        drv = FakeDriver("<html><body><p>x</p></body></html>")
+        created.append(drv)
+        return drv
+    monkeypatch.setattr(tfu.webdriver, "Chrome", fake_chrome)
+
+    monkeypatch.setattr(tfu, "Document", fake_document("<article><p>Body only.</p></article>"))
+
+    for _ in range(3):
+        assert tfu.extract_main_text_selenium("http://example.com", wait=0.0) == "Body only."
+    assert len(created) == 1
+    assert created[0]._url == "about:blank"  # state reset between pages
+
+
+## text-only profile
+
+def test_chrome_options_text_only_profile():
+    opts = tfu._chrome_options(headless=True, text_only=True)
+    assert opts.page_load_strategy == "eager"
+    assert opts.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+    assert "--blink-settings=imagesEnabled=false" in opts.arguments
+
+    full = tfu._chrome_options(headless=True, text_only=False)
+    assert full.page_load_strategy == "normal"
+    assert "prefs" not in full.experimental_options
+
+class CdpDriver(FakeDriver):
+    def __init__(self, html):
+        super().__init__(html)
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+def test_new_driver_blocks_heavy_requests(monkeypatch):
+    drv = CdpDriver("<html></html>")
+    monkeypatch.setattr(tfu.webdriver, "Chrome", lambda service=None, options=None: drv)
+
+    assert tfu._new_driver(text_only=True) is drv
+    assert drv._page_load_timeout == tfu.PAGE_TIME_BUDGET
+    blocked = dict(drv.cdp)["Network.setBlockedURLs"]["urls"]
+    assert "*.woff2" in blocked and "*google-analytics.com*" in blocked
+
+    plain = CdpDriver("<html></html>")
+    monkeypatch.setattr(tfu.webdriver, "Chrome", lambda service=None, options=None: plain)
+    tfu._new_driver(text_only=False)
+    assert plain.cdp == []
+
+def test_render_html_stops_page_that_exceeds_budget():
+    class SlowDriver(FakeDriver):
+        stopped = False
+        def get(self, url):
+            raise tfu.TimeoutException("page load timed out")
+        def execute_script(self, script):
+            if "window.stop" in script:
+                self.stopped = True
+            return super().execute_script(script)
+
+    drv = SlowDriver("<html><body><p>partial</p></body></html>")
+    html = tfu._render_html(drv, "http://slow.example", wait=0.0, time_budget=0.0)
+    assert drv.stopped is True
+    assert "partial" in html
+    assert drv._cookie_calls == 0  # budget spent, consent step skipped
+
+## readability text
+
+def _text_via_bs4(html):
+    # previous implementation: serialize, re-parse with html.parser, get_text
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(tfu.Document(html).summary(html_partial=True), "html.parser")
+    for tag in soup(list(tfu.NON_TEXT_TAGS)):
+        tag.decompose()
+    return tfu._clean_text(soup.get_text(separator="\n")) or None
+
+def test_readable_text_matches_previous_output():
+    from pathlib import Path
+    tricky = (
+        "<html><body><div><p>Intro &nbsp; text<script>x()</script>tail<!-- c -->after</p>"
+        "<noscript><svg><text>in</text></svg>ns</noscript>post<pre>\n  code\n</pre><p>a<br>b &amp; c</p>"
+        + "<p>filler sentence, with commas, here.</p>" * 20
+        + "</div></body></html>"
+    )
+    springer = (Path(__file__).parent / "fixtures" / "sites" / "springer_article.html").read_text()
+    for html in (tricky, springer):
+        assert tfu._readable_text(html) == _text_via_bs4(html)